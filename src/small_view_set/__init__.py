@@ -1,5 +1,7 @@
+from typing import TYPE_CHECKING
+
 from .small_view_set import SmallViewSet
-from .config import SmallViewSetConfig
+from .config import SmallViewSetConfig, get_config
 from .decorators import (
     endpoint,
     endpoint_disabled,
@@ -7,26 +9,127 @@ from .decorators import (
 from.helpers import (
     default_exception_handler,
     default_options_and_head_handler,
+    make_options_and_head_handler,
+    register_exception_response,
 )
+from .responses import SmallJsonResponse, StreamingJsonArrayResponse
 from .exceptions import (
     BadRequest,
     EndpointDisabledException,
+    GatewayTimeout,
     MethodNotAllowed,
+    ServiceUnavailable,
+    Throttled,
     Unauthorized,
 )
 
+# Optional features are imported on first access, so `import small_view_set`
+# does not pay for the ones a project never uses.
+_LAZY_EXPORTS = {
+    'KillSwitch': 'kill_switch',
+    'EndpointTiming': 'instrumentation',
+    'enable_queue_logging': 'log_queue',
+    'CacheThrottleBackend': 'throttling',
+    'LocalThrottleBackend': 'throttling',
+    'Throttle': 'throttling',
+    'EndpointCache': 'caching',
+    'Compression': 'compression',
+    'BatchResult': 'batch',
+    'batch_endpoint': 'batch',
+    'KeysetPaginator': 'pagination',
+    'Page': 'pagination',
+    'FieldSet': 'projection',
+    'Projection': 'projection',
+    'SmallViewSetRouter': 'router',
+    'lazy_path': 'lazy',
+    'Deadline': 'deadline',
+    'current_deadline': 'deadline',
+    'ExecutorGroup': 'execution',
+    'executor_group': 'execution',
+    'executor_group_stats': 'execution',
+    'run_sync': 'execution',
+}
+
+if TYPE_CHECKING:
+    from .kill_switch import KillSwitch
+    from .instrumentation import EndpointTiming
+    from .log_queue import enable_queue_logging
+    from .throttling import CacheThrottleBackend, LocalThrottleBackend, Throttle
+    from .caching import EndpointCache
+    from .compression import Compression
+    from .batch import BatchResult, batch_endpoint
+    from .pagination import KeysetPaginator, Page
+    from .projection import FieldSet, Projection
+    from .router import SmallViewSetRouter
+    from .lazy import lazy_path
+    from .deadline import Deadline, current_deadline
+    from .execution import ExecutorGroup, executor_group, executor_group_stats, run_sync
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
 __all__ = [
     "SmallViewSet",
     "SmallViewSetConfig",
+    "get_config",
+    "SmallViewSetRouter",
+    "lazy_path",
 
     "endpoint",
     "endpoint_disabled",
+    "KillSwitch",
+    "batch_endpoint",
+    "BatchResult",
 
     "default_exception_handler",
     "default_options_and_head_handler",
+    "make_options_and_head_handler",
+    "register_exception_response",
+
+    "enable_queue_logging",
+    "EndpointTiming",
+
+    "SmallJsonResponse",
+    "StreamingJsonArrayResponse",
 
     "BadRequest",
     "EndpointDisabledException",
+    "GatewayTimeout",
     "MethodNotAllowed",
+    "ServiceUnavailable",
+    "Throttled",
     "Unauthorized",
+
+    "Throttle",
+    "LocalThrottleBackend",
+    "CacheThrottleBackend",
+
+    "EndpointCache",
+    "Compression",
+
+    "ExecutorGroup",
+    "executor_group",
+    "executor_group_stats",
+    "run_sync",
+
+    "Deadline",
+    "current_deadline",
+
+    "KeysetPaginator",
+    "Page",
+
+    "FieldSet",
+    "Projection",
 ]
\ No newline at end of file
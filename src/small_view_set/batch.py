@@ -0,0 +1,158 @@
+import asyncio
+import functools
+import inspect
+from typing import Any
+
+from .config import get_config
+from .decorators import endpoint
+from .exceptions import BadRequest
+from .responses import SmallJsonResponse
+
+
+class BatchResult:
+    """
+    The outcome of one item in a batch, encoded as `{"status": ..., "data": ...}`.
+
+    Batch handlers may return plain data for an item (a 200), a `BatchResult` to
+    pick another status, or an exception instance, which is turned into a result
+    by the configured exception handler.
+    """
+    __slots__ = ('status', 'data')
+
+    def __init__(self, status: int = 200, data: Any = None):
+        self.status = status
+        self.data = data
+
+    def as_dict(self) -> dict:
+        return {'status': self.status, 'data': self.data}
+
+    def __repr__(self):
+        return f"<BatchResult {self.status}>"
+
+
+def batch_endpoint(
+        protect: str | None = None,
+        max_items: int = 100,
+        per_item: bool = False,
+        max_concurrency: int | None = None,
+        allowed_methods: list[str] | None = None):
+    """
+    Turns a viewset method into an endpoint that handles many operations from one
+    JSON array body and answers `{"results": [{"status": ..., "data": ...}, ...]}`,
+    one result per item, in order.
+
+    Args:
+        protect (str | None): Action whose `protect_<action>` (or `aprotect_<action>`
+            for async handlers) runs once for the whole batch, e.g. 'retrieve'. It
+            runs before the body is read, as `@endpoint(protect=...)` does.
+        max_items (int): Larger batches are rejected with a 400.
+        per_item (bool): False calls the handler once as `handler(self, request, items)`
+            so it can use `in_bulk` or `bulk_create`; it returns one result per item.
+            True calls `handler(self, request, item)` for every item; async handlers
+            then run the items concurrently.
+        max_concurrency (int | None): Limit on items running at once for async
+            `per_item` handlers.
+        allowed_methods (list[str] | None): Passed on to `@endpoint`, ['POST'] by default.
+
+    An exception raised for one item only fails that item when `per_item` is True.
+    Otherwise it fails the whole batch, like any endpoint.
+
+    Usage:
+        ```python
+        class BarViewSet(AppViewSet):
+            def urlpatterns(self):
+                return [
+                    path('api/bar/batch/', self.batch_retrieve, name='bar_batch'),
+                ]
+
+            @batch_endpoint(protect='retrieve', max_items=500)
+            def batch_retrieve(self, request: Request, items: list):
+                bars = Bar.objects.in_bulk(items)
+                return [BarSerializer(bars[pk]).data if pk in bars else Http404() for pk in items]
+        ```
+    """
+    if allowed_methods is None:
+        allowed_methods = ['POST']
+
+    def decorator(func):
+        is_async = inspect.iscoroutinefunction(func)
+        name = func.__name__
+
+        def parse_items(viewset, request) -> list:
+            items = viewset.parse_json_body(request)
+            if not isinstance(items, list):
+                raise BadRequest('Expected a JSON array of items')
+            if len(items) > max_items:
+                raise BadRequest(f'Too many items, the maximum is {max_items}')
+            return items
+
+        if not is_async:
+            @functools.wraps(func)
+            def batch_view(viewset, request):
+                items = parse_items(viewset, request)
+                if per_item:
+                    results = []
+                    for item in items:
+                        try:
+                            results.append(func(viewset, request, item))
+                        except Exception as e:
+                            results.append(e)
+                else:
+                    results = _check_length(func(viewset, request, items), items)
+                return _batch_response(request, name, results)
+
+            return endpoint(allowed_methods=allowed_methods, protect=protect)(batch_view)
+
+        @functools.wraps(func)
+        async def async_batch_view(viewset, request):
+            items = parse_items(viewset, request)
+            if per_item:
+                call = func
+                if max_concurrency is not None:
+                    semaphore = asyncio.Semaphore(max_concurrency)
+
+                    async def call(viewset, request, item):
+                        async with semaphore:
+                            return await func(viewset, request, item)
+
+                results = await asyncio.gather(
+                    *(call(viewset, request, item) for item in items),
+                    return_exceptions=True)
+            else:
+                results = _check_length(await func(viewset, request, items), items)
+            return _batch_response(request, name, results)
+
+        return endpoint(allowed_methods=allowed_methods, protect=protect)(async_batch_view)
+
+    return decorator
+
+
+def _check_length(results: list, items: list) -> list:
+    if len(results) != len(items):
+        raise RuntimeError(f'Batch handler returned {len(results)} results for {len(items)} items')
+    return results
+
+
+def _batch_response(request, endpoint_name: str, results: list) -> SmallJsonResponse:
+    config = get_config()
+    encoded = []
+    for result in results:
+        if isinstance(result, BatchResult):
+            encoded.append(result.as_dict())
+        elif isinstance(result, Exception):
+            encoded.append(_error_result(config, request, endpoint_name, result))
+        elif isinstance(result, BaseException):
+            # Cancellation and the like are not per-item failures.
+            raise result
+        else:
+            encoded.append({'status': 200, 'data': result})
+    return SmallJsonResponse({'results': encoded})
+
+
+def _error_result(config, request, endpoint_name: str, exception: Exception) -> dict:
+    response = config.exception_handler(request, endpoint_name, exception)
+    content = response.content
+    return {
+        'status': response.status_code,
+        'data': config.json_loads(content) if content else None,
+    }
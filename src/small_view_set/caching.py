@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, TYPE_CHECKING
+
+from django.http import HttpResponse
+
+from .coalescing import Singleflight
+from .throttling import _auser_key, _ip_key, _user_key
+
+if TYPE_CHECKING:
+    from urllib.request import Request
+
+
+# Sync and async key functions; None where the sync one is safe on the event loop.
+_VARY_FUNCS = {
+    'user': (_user_key, _auser_key),
+    'ip': (_ip_key, None),
+}
+
+
+class CachedResponse:
+    """
+    The encoded parts of a cached response. Every hit builds a fresh
+    `HttpResponse` from them, so callers never share a response object.
+
+    `encodings` keeps the body compressed per content coding, filled by
+    `Compression` on the first hit that asks for each coding.
+    """
+    __slots__ = ('status', 'headers', 'content', 'expires', 'size', 'encodings')
+
+    def __init__(self, status: int, headers: tuple, content: bytes, expires: float):
+        self.status = status
+        self.headers = headers
+        self.content = content
+        self.expires = expires
+        self.size = len(content) + sum(len(name) + len(value) for name, value in headers)
+        self.encodings: dict[str, bytes] = {}
+
+    def to_response(self) -> HttpResponse:
+        response = HttpResponse(self.content, status=self.status, headers=dict(self.headers))
+        response._small_view_set_cached = self
+        return response
+
+
+class EndpointCache:
+    """
+    Caches the encoded 200 responses of a GET endpoint, passed as
+    `@endpoint(..., cache=EndpointCache(...))`.
+
+    Hits skip the endpoint body entirely, including its `protect_*` calls, so
+    entries are kept per user (per IP for anonymous clients) unless the endpoint
+    is declared `public` or given another `vary`. Concurrent misses for the same
+    key are coalesced: one request runs the endpoint while the others wait for its
+    result, and run it themselves if that result could not be cached or, on sync
+    endpoints, did not arrive within `wait_timeout`.
+
+    Args:
+        ttl (float): Seconds an entry stays fresh.
+        max_entries (int): Maximum number of entries kept in process.
+        max_bytes (int): Maximum total size of the entries kept in process; the least
+            recently used entries are evicted first.
+        query_params (list[str] | None): Query parameters that are part of the key.
+            None uses the whole query string; an empty list ignores it.
+        vary (str | Callable[[Request], str] | None): 'user' or 'ip' to keep a
+            separate entry per user (or per IP for anonymous users) / per IP, or a
+            callable returning an extra key part for the request; `async def`
+            callables are awaited on async endpoints. None means 'user', unless
+            `public` is set.
+        public (bool): The responses are the same for everyone, so with no `vary`
+            every client shares one entry.
+        backend (str | None): Alias of a Django cache in `settings.CACHES` to store
+            entries in instead of the process, so nodes share them.
+        key_prefix (str): Prefix for the keys.
+        wait_timeout (float | None): Seconds a request on a sync endpoint waits for a
+            concurrent miss on the same key before running the endpoint itself, so a
+            stuck request does not hold up the others. None waits for as long as it takes.
+    """
+    def __init__(
+            self,
+            ttl: float = 60,
+            max_entries: int = 1000,
+            max_bytes: int = 10 * 1024 * 1024,
+            query_params: list[str] | None = None,
+            vary: str | Callable[[Request], str] | None = None,
+            public: bool = False,
+            backend: str | None = None,
+            key_prefix: str = 'svs-cache',
+            wait_timeout: float | None = 10):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.query_params = tuple(query_params) if query_params is not None else None
+        self.public = public
+        if vary is None and not public:
+            vary = 'user'
+        if vary is None:
+            self.vary = self.avary = None
+        elif callable(vary):
+            self.vary = vary
+            self.avary = vary if inspect.iscoroutinefunction(vary) else None
+        elif vary in _VARY_FUNCS:
+            self.vary, self.avary = _VARY_FUNCS[vary]
+        else:
+            raise ValueError(f"Unknown cache vary {vary!r}, expected 'user', 'ip' or a callable")
+        self.backend = backend
+        self.key_prefix = key_prefix
+        self.wait_timeout = wait_timeout
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._singleflight = Singleflight()
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.backend]
+
+    def make_key(self, scope: str, request: Request) -> str:
+        vary = self.vary(request) if self.vary is not None else ''
+        return self._key(scope, request, vary)
+
+    async def amake_key(self, scope: str, request: Request) -> str:
+        """Like `make_key`, but resolves `vary` without blocking the event loop."""
+        if self.avary is not None:
+            vary = await self.avary(request)
+        else:
+            vary = self.vary(request) if self.vary is not None else ''
+        return self._key(scope, request, vary)
+
+    def _key(self, scope: str, request: Request, vary: str) -> str:
+        if self.query_params is None:
+            query = sorted(request.GET.lists())
+        else:
+            query = [(name, request.GET.getlist(name)) for name in self.query_params]
+        raw = f'{scope}|{request.path_info}|{query!r}|{vary}'
+        return f'{self.key_prefix}:{hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()}'
+
+    def entry_for(self, response) -> CachedResponse | None:
+        """
+        Returns the entry to store for `response`, or None when it must not be
+        cached: anything but a 200, streaming responses, responses that set
+        cookies, and `Cache-Control: no-store`.
+        """
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return None
+        if 'no-store' in response.get('Cache-Control', ''):
+            return None
+        return CachedResponse(
+            response.status_code,
+            tuple(response.items()),
+            response.content,
+            time.monotonic() + self.ttl)
+
+    def get(self, key: str) -> CachedResponse | None:
+        if self.backend is not None:
+            return self._from_backend(self.cache.get(key))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        if self.backend is not None:
+            self.cache.set(key, (entry.status, entry.headers, entry.content), timeout=self.ttl)
+            return
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    async def aget(self, key: str) -> CachedResponse | None:
+        if self.backend is not None:
+            return self._from_backend(await self.cache.aget(key))
+        return self.get(key)
+
+    async def aset(self, key: str, entry: CachedResponse):
+        if self.backend is not None:
+            await self.cache.aset(key, (entry.status, entry.headers, entry.content), timeout=self.ttl)
+            return
+        self.set(key, entry)
+
+    def clear(self):
+        """Drops every entry kept in process. Entries in a Django cache backend expire on their own."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def _from_backend(self, value) -> CachedResponse | None:
+        if value is None:
+            return None
+        status, headers, content = value
+        return CachedResponse(status, headers, content, 0)
+
+    def _join(self, key: str) -> tuple[_Flight, bool]:
+        """Returns the flight computing `key`, and whether the caller leads it."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def _land(self, key: str, flight: _Flight, entry: CachedResponse | None):
+        flight.entry = entry
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+
+
+class _Flight:
+    """One sync request computing a key; others wait on `done` for its `entry`."""
+    __slots__ = ('done', 'entry')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: CachedResponse | None = None
+
+
+def build_cache_layer(handler: Callable, is_async: bool, cache: EndpointCache, scope: str) -> Callable:
+    """
+    Wraps an endpoint handler so GET responses are served from `cache`.
+    """
+    if is_async:
+        return _build_async_layer(handler, cache, scope)
+
+    def cached_handler(viewset, request, *args, **kwargs):
+        if request.method != 'GET':
+            return handler(viewset, request=request, *args, **kwargs)
+        key = cache.make_key(scope, request)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry.to_response()
+        flight, leader = cache._join(key)
+        if not leader:
+            if flight.done.wait(cache.wait_timeout) and flight.entry is not None:
+                return flight.entry.to_response()
+            # The leader's response could not be cached, or is taking too long;
+            # compute our own, concurrently.
+            return handler(viewset, request=request, *args, **kwargs)
+        entry = None
+        try:
+            # Another thread may have filled the entry just before this one joined.
+            entry = cache.get(key)
+            if entry is not None:
+                return entry.to_response()
+            response = handler(viewset, request=request, *args, **kwargs)
+            entry = cache.entry_for(response)
+            if entry is not None:
+                cache.set(key, entry)
+            return response
+        finally:
+            cache._land(key, flight, entry)
+
+    return cached_handler
+
+
+def _build_async_layer(handler, cache, scope):
+    async def cached_handler(viewset, request, *args, **kwargs):
+        if request.method != 'GET':
+            return await handler(viewset, request=request, *args, **kwargs)
+        key = await cache.amake_key(scope, request)
+        entry = await cache.aget(key)
+        if entry is not None:
+            return entry.to_response()
+
+        async def fill():
+            response = await handler(viewset, request=request, *args, **kwargs)
+            entry = cache.entry_for(response)
+            if entry is not None:
+                await cache.aset(key, entry)
+            return response, entry
+
+        (response, entry), shared = await cache._singleflight.do(key, fill)
+        if not shared:
+            return response
+        if entry is not None:
+            return entry.to_response()
+        # The first request's response could not be cached; compute our own.
+        return await handler(viewset, request=request, *args, **kwargs)
+
+    return cached_handler
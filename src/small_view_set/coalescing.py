@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import Awaitable, Callable, Hashable, TYPE_CHECKING
+
+from django.http import HttpResponse
+
+from .throttling import _auser_key
+
+if TYPE_CHECKING:
+    from urllib.request import Request
+
+
+class Singleflight:
+    """
+    Runs one call per key at a time; callers arriving while it is in flight await
+    the same outcome instead of starting their own.
+
+    The call runs in its own task, so a caller being cancelled (e.g. a client
+    disconnecting) does not cancel it for everyone else. Calls are tracked per
+    event loop.
+    """
+    def __init__(self):
+        self._calls: dict[tuple, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]) -> tuple[object, bool]:
+        """
+        Returns `(result, shared)`, where `shared` is True for callers that joined a
+        call already in flight. An exception raised by the call is raised in every
+        caller.
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        task = self._calls.get(call_key)
+        if task is not None:
+            return await asyncio.shield(task), True
+
+        task = loop.create_task(func())
+        self._calls[call_key] = task
+        task.add_done_callback(lambda done: self._forget(call_key, done))
+        return await asyncio.shield(task), False
+
+    def _forget(self, call_key: tuple, task: asyncio.Task):
+        if self._calls.get(call_key) is task:
+            del self._calls[call_key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller was cancelled.
+            task.exception()
+
+    def __len__(self):
+        return len(self._calls)
+
+
+def shareable(response) -> bool:
+    """
+    Whether a copy of `response` can be handed to other callers: streaming
+    responses can only be consumed once, cookies belong to one client, and
+    304/412 answers depend on the first caller's conditional headers.
+    """
+    return not response.streaming and not response.cookies and response.status_code not in (304, 412)
+
+
+def copy_response(response) -> HttpResponse:
+    return HttpResponse(response.content, status=response.status_code, headers=dict(response.items()))
+
+
+# Headers that may carry credentials checked by `protect_*` methods, which a request
+# joining another's run skips.
+_CREDENTIAL_HEADERS = ('HTTP_AUTHORIZATION', 'HTTP_COOKIE')
+
+
+async def _default_key(request: Request) -> tuple:
+    # Loading the user from the session is blocking, so it goes through auser().
+    credentials = tuple(request.META.get(header, '') for header in _CREDENTIAL_HEADERS)
+    return (request.get_full_path(), await _auser_key(request), *credentials)
+
+
+def build_coalescing_layer(
+        handler: Callable,
+        coalesce: bool | Callable[[Request], str],
+        scope: str) -> Callable:
+    """
+    Wraps an async endpoint handler so concurrent GETs with the same key share one
+    run of the handler. Every caller gets its own copy of the response, and an
+    exception is raised in every caller so each goes through the exception handler.
+    """
+    key_func = coalesce if callable(coalesce) else _default_key
+    singleflight = Singleflight()
+
+    async def coalescing_handler(viewset, request, *args, **kwargs):
+        if request.method != 'GET':
+            return await handler(viewset, request=request, *args, **kwargs)
+
+        async def call():
+            response = await handler(viewset, request=request, *args, **kwargs)
+            # Snapshot before the first caller's middleware gets to modify it.
+            return response, copy_response(response) if shareable(response) else None
+
+        key = key_func(request)
+        if inspect.isawaitable(key):
+            key = await key
+        (response, snapshot), shared = await singleflight.do((scope, key), call)
+        if not shared:
+            return response
+        if snapshot is not None:
+            return copy_response(snapshot)
+        return await handler(viewset, request=request, *args, **kwargs)
+
+    coalescing_handler.singleflight = singleflight
+    return coalescing_handler
@@ -0,0 +1,233 @@
+import gzip
+import zlib
+from typing import Callable
+
+
+COMPRESSION_ALGORITHMS = ('br', 'zstd', 'gzip', 'deflate')
+
+_DEFAULT_LEVELS = {
+    'br': 4,
+    'zstd': 3,
+    'gzip': 6,
+    'deflate': 6,
+}
+
+
+class _ZlibStream:
+    def __init__(self, level: int, wbits: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, chunk: bytes) -> bytes:
+        # Sync-flush every chunk so clients receive streamed data as it is produced.
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _gzip_codec():
+    return (
+        lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+        lambda level: _ZlibStream(level, 16 + zlib.MAX_WBITS))
+
+
+def _deflate_codec():
+    # HTTP 'deflate' is the zlib format, not raw deflate.
+    return (
+        lambda data, level: zlib.compress(data, level),
+        lambda level: _ZlibStream(level, zlib.MAX_WBITS))
+
+
+def _brotli_codec():
+    import brotli
+
+    class BrotliStream:
+        def __init__(self, level: int):
+            self._compressor = brotli.Compressor(quality=level)
+
+        def compress(self, chunk: bytes) -> bytes:
+            return self._compressor.process(chunk) + self._compressor.flush()
+
+        def finish(self) -> bytes:
+            return self._compressor.finish()
+
+    return (lambda data, level: brotli.compress(data, quality=level), BrotliStream)
+
+
+def _zstd_codec():
+    import zstandard
+
+    class ZstdStream:
+        def __init__(self, level: int):
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+        def compress(self, chunk: bytes) -> bytes:
+            return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+        def finish(self) -> bytes:
+            return self._compressor.flush()
+
+    return (lambda data, level: zstandard.ZstdCompressor(level=level).compress(data), ZstdStream)
+
+
+_CODEC_FACTORIES = {
+    'br': _brotli_codec,
+    'zstd': _zstd_codec,
+    'gzip': _gzip_codec,
+    'deflate': _deflate_codec,
+}
+
+
+class Compression:
+    """
+    Compresses the responses of an endpoint, passed as
+    `@endpoint(..., compress=Compression(...))`.
+
+    The coding is negotiated from `Accept-Encoding`, preferring the client's highest
+    q-value and then the order of `algorithms`. Responses that are too small, not
+    of a compressible content type, or already encoded are sent as they are, and
+    error responses from the exception handler are never compressed.
+
+    Args:
+        algorithms (list[str]): Codings to offer, in order of preference. 'br' needs
+            the `brotli` package and 'zstd' the `zstandard` package; codings whose
+            package is not installed are skipped.
+        min_size (int): Smallest body in bytes worth compressing.
+        level (int | dict[str, int] | None): Compression level for every coding, or
+            per coding, e.g. `{'gzip': 5, 'br': 5}`. Codings left out use a level
+            suited to dynamic responses.
+        content_types (list[str]): Content type prefixes to compress.
+        stream (bool): Also compress streaming responses, chunk by chunk.
+    """
+    def __init__(
+            self,
+            algorithms: list[str] = COMPRESSION_ALGORITHMS,
+            min_size: int = 512,
+            level: int | dict[str, int] | None = None,
+            content_types: list[str] = ('application/json', 'text/'),
+            stream: bool = True):
+        unknown = [name for name in algorithms if name not in _CODEC_FACTORIES]
+        if unknown:
+            raise ValueError(f"Unknown compression algorithms {unknown}, expected any of {COMPRESSION_ALGORITHMS}")
+        self.codecs: dict[str, tuple[Callable, Callable, int]] = {}
+        for name in algorithms:
+            try:
+                compress, stream_factory = _CODEC_FACTORIES[name]()
+            except ImportError:
+                continue
+            if isinstance(level, dict):
+                codec_level = level.get(name, _DEFAULT_LEVELS[name])
+            else:
+                codec_level = _DEFAULT_LEVELS[name] if level is None else level
+            self.codecs[name] = (compress, stream_factory, codec_level)
+        self.algorithms = tuple(self.codecs)
+        self.min_size = min_size
+        self.content_types = tuple(content_types)
+        self.stream = stream
+
+    def negotiate(self, accept_encoding: str) -> str | None:
+        """Returns the coding to use for an `Accept-Encoding` header value, or None."""
+        if not accept_encoding:
+            return None
+        weights = {}
+        for part in accept_encoding.split(','):
+            name, _, params = part.partition(';')
+            name = name.strip().lower()
+            weight = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    weight = float(params[2:])
+                except ValueError:
+                    weight = 0.0
+            weights[name] = weight
+        wildcard = weights.get('*', 0.0)
+        best, best_weight = None, 0.0
+        for name in self.algorithms:
+            weight = weights.get(name, wildcard)
+            if weight > best_weight:
+                best, best_weight = name, weight
+        return best
+
+    def compressible(self, response) -> bool:
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if response.has_header('Content-Encoding'):
+            return False
+        if response.streaming:
+            if not self.stream:
+                return False
+        elif len(response.content) < self.min_size:
+            return False
+        return response.get('Content-Type', '').startswith(self.content_types)
+
+    def compress_response(self, request, response):
+        """
+        Returns `response` with its body compressed for the request's `Accept-Encoding`.
+        Cached responses reuse the body compressed for an earlier hit.
+        """
+        if not self.compressible(response):
+            return response
+        from django.utils.cache import patch_vary_headers
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = self.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding is None:
+            return response
+        compress, stream_factory, level = self.codecs[coding]
+        if response.streaming:
+            stream = stream_factory(level)
+            if response.is_async:
+                response.streaming_content = _compress_async(response.streaming_content, stream)
+            else:
+                response.streaming_content = _compress_sync(response.streaming_content, stream)
+            del response.headers['Content-Length']
+        else:
+            entry = getattr(response, '_small_view_set_cached', None)
+            body = entry.encodings.get(coding) if entry is not None else None
+            if body is None:
+                body = compress(response.content, level)
+                if entry is not None:
+                    entry.encodings[coding] = body
+            if len(body) >= len(response.content):
+                return response
+            response.content = body
+            response.headers['Content-Length'] = str(len(body))
+        etag = response.get('ETag')
+        if etag and not etag.startswith('W/'):
+            # The compressed bytes differ from the ones the strong ETag was made for.
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = coding
+        return response
+
+
+def _compress_sync(content, stream):
+    for chunk in content:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def _compress_async(content, stream):
+    async for chunk in content:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+def build_compression_layer(handler: Callable, is_async: bool, compression: Compression) -> Callable:
+    """
+    Wraps an endpoint handler so its responses are compressed with `compression`.
+    """
+    if is_async:
+        async def compressed_handler(viewset, request, *args, **kwargs):
+            response = await handler(viewset, request=request, *args, **kwargs)
+            return compression.compress_response(request, response)
+        return compressed_handler
+
+    def compressed_handler(viewset, request, *args, **kwargs):
+        response = handler(viewset, request=request, *args, **kwargs)
+        return compression.compress_response(request, response)
+
+    return compressed_handler
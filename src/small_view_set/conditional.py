@@ -0,0 +1,119 @@
+import inspect
+from calendar import timegm
+from datetime import datetime
+from typing import Callable
+
+from django.http import HttpResponse
+from django.utils.http import http_date, quote_etag
+
+
+def _etag_header(value) -> str | None:
+    if value is None:
+        return None
+    return quote_etag(str(value))
+
+
+def _timestamp(value) -> int | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        # Naive datetimes are taken as UTC, like Django's `condition` decorator.
+        return timegm(value.utctimetuple())
+    return int(value)
+
+
+def _precondition_response(request, etag: str | None, last_modified: int | None) -> HttpResponse | None:
+    """
+    Returns a body-less 304 (or 412 for a failed `If-Match`) when the client's
+    copy is current, otherwise None.
+    """
+    if etag is None and last_modified is None:
+        return None
+    from django.utils.cache import get_conditional_response
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        return None
+    if response.status_code == 304:
+        if etag is not None:
+            response.headers['ETag'] = etag
+        if last_modified is not None:
+            response.headers['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def _finish_response(request, response, etag: str | None, last_modified: int | None, auto_etag: bool):
+    if response.status_code != 200 or response.streaming:
+        return response
+    if etag is not None:
+        response.setdefault('ETag', etag)
+    if last_modified is not None:
+        response.setdefault('Last-Modified', http_date(last_modified))
+    if auto_etag and etag is None and not response.has_header('ETag'):
+        from django.utils.cache import get_conditional_response, set_response_etag
+        set_response_etag(response)
+        if response.has_header('ETag'):
+            return get_conditional_response(
+                request,
+                etag=response.headers['ETag'],
+                last_modified=last_modified,
+                response=response)
+    return response
+
+
+def build_conditional_layer(
+        handler: Callable,
+        is_async: bool,
+        etag: Callable | None = None,
+        last_modified: Callable | None = None,
+        auto_etag: bool = False) -> Callable:
+    """
+    Wraps an endpoint handler so GET requests are answered with a 304 when the
+    client's `If-None-Match` / `If-Modified-Since` headers are still current.
+
+    `etag` and `last_modified` are called with the endpoint's arguments before the
+    handler runs; returning None skips that validator. With `auto_etag`, responses
+    without an ETag get a strong one hashed from the encoded body.
+    """
+    if is_async:
+        return _build_async_layer(handler, etag, last_modified, auto_etag)
+
+    def conditional_handler(viewset, request, *args, **kwargs):
+        if request.method != 'GET':
+            return handler(viewset, request=request, *args, **kwargs)
+        etag_value = _etag_header(etag(viewset, request, *args, **kwargs)) if etag else None
+        last_modified_value = _timestamp(last_modified(viewset, request, *args, **kwargs)) if last_modified else None
+        response = _precondition_response(request, etag_value, last_modified_value)
+        if response is not None:
+            return response
+        response = handler(viewset, request=request, *args, **kwargs)
+        return _finish_response(request, response, etag_value, last_modified_value, auto_etag)
+
+    return conditional_handler
+
+
+def _build_async_layer(handler, etag, last_modified, auto_etag):
+    etag_is_async = inspect.iscoroutinefunction(etag)
+    last_modified_is_async = inspect.iscoroutinefunction(last_modified)
+
+    async def conditional_handler(viewset, request, *args, **kwargs):
+        if request.method != 'GET':
+            return await handler(viewset, request=request, *args, **kwargs)
+        etag_value = None
+        if etag:
+            etag_value = etag(viewset, request, *args, **kwargs)
+            if etag_is_async:
+                etag_value = await etag_value
+            etag_value = _etag_header(etag_value)
+        last_modified_value = None
+        if last_modified:
+            last_modified_value = last_modified(viewset, request, *args, **kwargs)
+            if last_modified_is_async:
+                last_modified_value = await last_modified_value
+            last_modified_value = _timestamp(last_modified_value)
+        response = _precondition_response(request, etag_value, last_modified_value)
+        if response is not None:
+            return response
+        response = await handler(viewset, request=request, *args, **kwargs)
+        return _finish_response(request, response, etag_value, last_modified_value, auto_etag)
+
+    return conditional_handler
@@ -1,6 +1,18 @@
-from typing import Callable
-from urllib.request import Request
+from __future__ import annotations
+
+from typing import Any, Callable, TYPE_CHECKING
+
+from django.conf import settings
+from django.core.signals import setting_changed
+
 from .helpers import default_exception_handler, default_options_and_head_handler
+from .instrumentation import configure_timing
+from .serialization import resolve_json_dumps, resolve_json_loads
+
+if TYPE_CHECKING:
+    from urllib.request import Request
+
+    from .kill_switch import KillSwitch
 
 
 class SmallViewSetConfig:
@@ -19,12 +31,95 @@ class SmallViewSetConfig:
             for handling OPTIONS and HEAD requests. The function takes two parameters:
             1. The Django Request object.
             2. A list of allowed HTTP methods for the endpoint (e.g., ['PUT', 'PATCH']).
+        json_decoder (str | Callable[[bytes], Any]): Decoder used by
+            `SmallViewSet.parse_json_body`. One of 'json' (standard library), 'orjson',
+            'msgspec', 'auto' (fastest installed), or a callable taking the raw body.
+            Backends that are not installed fall back to the standard library.
+        max_json_body_size (int | None): Largest body in bytes `parse_json_body` will
+            decode. Larger bodies are rejected with `BadRequest` before decoding.
+        json_encoder (str | Callable[[Any], bytes]): Encoder used by `SmallJsonResponse`
+            and the library's own responses. Accepts the same names as `json_decoder`
+            or a callable returning bytes. The default 'json' matches `JsonResponse`.
+        instrumentation_hooks (list[Callable[[EndpointTiming], None]]): Callbacks run
+            after every endpoint call with an `EndpointTiming` holding the endpoint name,
+            method, status and per-phase durations. With no hooks, endpoints skip
+            all timing calls.
+        respect_disabled_endpoints (bool): Whether endpoints marked `@endpoint_disabled`
+            answer with a 405. Read on every request.
+        kill_switch (KillSwitch | None): Flags for disabling endpoints at runtime,
+            polled from a shared cache. None skips the check entirely.
+        default_timeout (float | None): Seconds async endpoints may run before they are
+            cancelled and answered with a 504, unless they set their own `timeout`.
+            None lets them run as long as they need.
+        cancel_on_disconnect (bool): Whether async endpoints are cancelled when an ASGI
+            client disconnects, as Django does since 5.0, unless they set their own
+            `cancel_on_disconnect`. False lets them finish, within their timeout.
     """
     def __init__(
             self,
             exception_handler: Callable[[str, Exception], None] = default_exception_handler,
             options_and_head_handler: Callable[[Request, list[str]], None] = default_options_and_head_handler,
-            respect_disabled_endpoints=True):
+            respect_disabled_endpoints=True,
+            json_decoder: str | Callable[[bytes], Any] = 'json',
+            max_json_body_size: int | None = None,
+            json_encoder: str | Callable[[Any], bytes] = 'json',
+            instrumentation_hooks: list[Callable] | None = None,
+            kill_switch: KillSwitch | None = None,
+            default_timeout: float | None = None,
+            cancel_on_disconnect: bool = True):
         self.exception_handler = exception_handler
         self.options_and_head_handler = options_and_head_handler
-        self.respect_disabled_endpoints = respect_disabled_endpoints
\ No newline at end of file
+        self.respect_disabled_endpoints = respect_disabled_endpoints
+        self.json_loads = resolve_json_loads(json_decoder)
+        self.max_json_body_size = max_json_body_size
+        self.json_dumps = resolve_json_dumps(json_encoder)
+        self.instrumentation_hooks = tuple(instrumentation_hooks or ())
+        self.kill_switch = kill_switch
+        self.default_timeout = default_timeout
+        self.cancel_on_disconnect = cancel_on_disconnect
+
+
+_resolved_config: SmallViewSetConfig | None = None
+
+
+def get_config() -> SmallViewSetConfig:
+    """
+    Returns the active `SmallViewSetConfig`.
+
+    `settings.SMALL_VIEW_SET_CONFIG` is resolved on first use and cached, falling
+    back to a default `SmallViewSetConfig()` when the setting is absent. Endpoints
+    call this on every request, so after the first call it is a single global read.
+
+    The cache is dropped whenever Django sends `setting_changed` for
+    `SMALL_VIEW_SET_CONFIG`, so `override_settings` in tests keeps working.
+    """
+    config = _resolved_config
+    if config is None:
+        config = _resolve_config()
+    return config
+
+
+def _resolve_config() -> SmallViewSetConfig:
+    global _resolved_config
+    config = getattr(settings, 'SMALL_VIEW_SET_CONFIG', None)
+    if config is None:
+        config = SmallViewSetConfig()
+    configure_timing(config)
+    _resolved_config = config
+    return config
+
+
+def reset_config(**kwargs):
+    """
+    Drops the cached config so the next request re-reads Django settings.
+    """
+    global _resolved_config
+    _resolved_config = None
+
+
+def _on_setting_changed(setting, **kwargs):
+    if setting == 'SMALL_VIEW_SET_CONFIG':
+        reset_config()
+
+
+setting_changed.connect(_on_setting_changed, dispatch_uid='small_view_set.config.reset_config')
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from contextvars import ContextVar
+from time import monotonic
+
+from .exceptions import GatewayTimeout
+
+
+_logger = logging.getLogger('django-small-view-set.deadline')
+
+_current_deadline: ContextVar['Deadline | None'] = ContextVar('small_view_set_deadline', default=None)
+
+
+class Deadline:
+    """
+    When the endpoint handling the current request runs out of time, returned by
+    `current_deadline()` so handlers can pass what is left to database and HTTP
+    calls instead of outliving the request.
+
+    Attributes:
+        timeout (float): The endpoint's timeout in seconds.
+        expires_at (float): `time.monotonic()` value at which the endpoint is cancelled.
+    """
+    __slots__ = ('timeout', 'expires_at')
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = monotonic() + timeout
+
+    def remaining(self) -> float:
+        """Seconds left before the endpoint is cancelled, never negative."""
+        return max(0.0, self.expires_at - monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() >= self.expires_at
+
+    def __repr__(self):
+        return f'<Deadline {self.remaining():.3f}s of {self.timeout}s left>'
+
+
+def current_deadline() -> Deadline | None:
+    """
+    Returns the `Deadline` of the endpoint running in the current context, or None
+    when it has no timeout. Also set inside sync endpoints run with `execution='pool'`.
+
+    Usage:
+        ```python
+        @endpoint(allowed_methods=['GET'], timeout=2)
+        async def report(self, request: Request):
+            deadline = current_deadline()
+            async with httpx.AsyncClient(timeout=deadline.remaining()) as client:
+                . . .
+        ```
+    """
+    return _current_deadline.get()
+
+
+def deadline_policy(config, timeout, cancel_on_disconnect) -> tuple[float | None, bool]:
+    """
+    Returns `(timeout, shield)` for an endpoint's `timeout` and `cancel_on_disconnect`
+    options, falling back to the config's defaults where they are None.
+    """
+    if timeout is None:
+        timeout = config.default_timeout
+    if cancel_on_disconnect is None:
+        cancel_on_disconnect = config.cancel_on_disconnect
+    return timeout or None, not cancel_on_disconnect
+
+
+async def run_with_deadline(coroutine, timeout: float | None, shield: bool):
+    """
+    Runs an endpoint's `coroutine` as a task, cancelling it after `timeout` seconds
+    and raising `GatewayTimeout` instead. A deadline already running in this context,
+    e.g. of an endpoint calling another, is never extended.
+
+    With `shield`, cancelling the caller, as Django does when an ASGI client
+    disconnects, leaves the task running until it finishes or its deadline passes.
+    """
+    outer = _current_deadline.get()
+    if timeout is not None and outer is not None:
+        timeout = min(timeout, outer.remaining())
+    deadline = Deadline(timeout) if timeout is not None else outer
+    token = _current_deadline.set(deadline)
+    try:
+        # The task copies the context now, so the handler sees its deadline.
+        task = asyncio.ensure_future(coroutine)
+    finally:
+        _current_deadline.reset(token)
+    awaitable = asyncio.shield(task) if shield else task
+    try:
+        if timeout is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        if task.done() and not task.cancelled():
+            # The handler raised a TimeoutError of its own.
+            raise
+        task.cancel()
+        raise GatewayTimeout(deadline.timeout) from None
+    except asyncio.CancelledError:
+        if shield and not task.done():
+            task.add_done_callback(_log_abandoned)
+            if deadline is not None:
+                asyncio.get_running_loop().call_later(deadline.remaining(), task.cancel)
+        raise
+
+
+def _log_abandoned(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        _logger.error("Endpoint failed after its client disconnected", exc_info=task.exception())
+
@@ -1,60 +1,329 @@
+from __future__ import annotations
+
+import functools
 import inspect
-from django.conf import settings
+from time import perf_counter
+from typing import Callable, TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
 
-from .config import SmallViewSetConfig
+from .deadline import deadline_policy, run_with_deadline
+from .config import SmallViewSetConfig, get_config
 from .exceptions import EndpointDisabledException
+from .instrumentation import finish_timing, start_timing, track_timing
+from .plan import DEFAULT_GROUP, INLINE, EndpointPlan
+
+if TYPE_CHECKING:
+    from urllib.request import Request
+
+    from .caching import EndpointCache
+    from .compression import Compression
+
+_MISSING = object()
 
 def endpoint(
-        allowed_methods: list[str]):
+        allowed_methods: list[str],
+        etag: Callable | None = None,
+        last_modified: Callable | None = None,
+        auto_etag: bool = False,
+        cache: EndpointCache | None = None,
+        coalesce: bool | Callable[[Request], str] = False,
+        execution: str = INLINE,
+        executor_group: str = DEFAULT_GROUP,
+        compress: bool | Compression = False,
+        protect: str | None = None,
+        timeout: float | bool | None = None,
+        cancel_on_disconnect: bool | None = None):
+    """
+    Turns a viewset method into an endpoint that answers OPTIONS/HEAD, rejects
+    methods not in `allowed_methods`, and routes exceptions to the configured
+    exception handler.
+
+    The method set, `Allow` header and kwargs handling are compiled into an
+    `EndpointPlan` when the function is decorated, so the per-request path only
+    runs those precomputed steps. The plan is available as `wrapper.endpoint_plan`.
+
+    Args:
+        allowed_methods (list[str]): HTTP methods the endpoint accepts.
+        etag (Callable | None): Called as `etag(self, request, *args, **kwargs)` before
+            a GET runs and returns a version string, or None. A matching
+            `If-None-Match` is answered with a 304 without running the endpoint.
+        last_modified (Callable | None): Like `etag`, but returns a datetime that is
+            compared against `If-Modified-Since`.
+        auto_etag (bool): Hash a strong ETag from the encoded body of 200 responses
+            that have none, and answer a matching `If-None-Match` with a 304.
+        cache (EndpointCache | None): Serve GET responses from this cache. Conditional
+            GET checks run in front of it.
+        coalesce (bool | Callable[[Request], str]): Async endpoints only. Concurrent GETs
+            with the same key share one run of the endpoint, and each gets its own copy
+            of the response. The default key is the full path, the user (or IP for
+            anonymous users) and the `Authorization` and `Cookie` headers; pass a callable, or an `async def`, to compute your own.
+        execution (str): Sync endpoints only. 'inline' runs the function as Django
+            would. 'pool' serves it from an async wrapper that runs the function on
+            the bounded `ExecutorGroup` named by `executor_group`, answering 503 when
+            the group is full. 'thread_sensitive' runs it through
+            `sync_to_async(thread_sensitive=True)`.
+        executor_group (str): Name of the group used by `execution='pool'`.
+        compress (bool | Compression): Compress responses for clients that send a
+            matching `Accept-Encoding`. True uses `Compression()`'s defaults. Cached
+            responses reuse the body compressed for an earlier hit.
+        protect (str | None): Action whose `protect_<action>` (or `aprotect_<action>` for
+            async endpoints) runs before the `etag`/`last_modified` validators, cache
+            hits and coalescing, e.g. 'retrieve'. Without it, a 304 or a cache hit is
+            served without running the endpoint body's protect call. Checks declared
+            in `protections` are memoized per request, so the body may call it again.
+        timeout (float | bool | None): Async endpoints only. Seconds the endpoint may run
+            before it is cancelled and `GatewayTimeout` goes to the exception handler,
+            a 504 by default. The time left is available from `current_deadline()`.
+            None uses `SmallViewSetConfig.default_timeout`; False never times out.
+        cancel_on_disconnect (bool | None): Async endpoints only. Whether the endpoint is
+            cancelled when the ASGI client disconnects. False lets it finish, e.g. for
+            writes that must complete. None uses `SmallViewSetConfig.cancel_on_disconnect`.
+    """
     def decorator(func):
-        func_name = func.__name__
-        def sync_wrapper(viewset, *args, **kwargs):
-            request = args[0]
-            args = args[1:]
+        plan = EndpointPlan(
+            func,
+            allowed_methods,
+            etag=etag,
+            last_modified=last_modified,
+            auto_etag=auto_etag,
+            cache=cache,
+            coalesce=coalesce,
+            execution=execution,
+            executor_group=executor_group,
+            compress=compress,
+            protect=protect,
+            timeout=timeout,
+            cancel_on_disconnect=cancel_on_disconnect)
+        track_timing(plan)
+        if plan.wrapper_is_async:
+            wrapper = _build_async_wrapper(plan)
+        else:
+            wrapper = _build_sync_wrapper(plan)
+        wrapper.endpoint_plan = plan
+        return wrapper
+
+    return decorator
+
+
+def _build_handler(plan: EndpointPlan) -> Callable:
+    """
+    Returns `plan.func` wrapped in the optional layers the plan asks for. Without
+    options this is `plan.func` itself, so plain endpoints pay nothing extra. Each
+    layer's module is imported when an endpoint first asks for it.
+    """
+    handler = plan.func
+    scope = plan.key
+    if plan.cache is not None:
+        from .caching import build_cache_layer
+        handler = build_cache_layer(handler, plan.is_async, plan.cache, scope)
+    if plan.conditional and not plan.is_async:
+        # Sync validators run next to the sync code they call, on the worker thread when pooled.
+        handler = _conditional_layer(handler, plan)
+    if plan.protect is not None and not plan.is_async and not plan.coalesce:
+        # Outside validators and cache hits, so neither answers an unprotected request.
+        handler = _protect_layer(handler, plan, in_async=False)
+    if plan.execution != INLINE:
+        from .execution import build_execution_layer
+        handler = build_execution_layer(handler, plan.execution, plan.executor_group)
+    if plan.coalesce:
+        from .coalescing import build_coalescing_layer
+        handler = build_coalescing_layer(handler, plan.coalesce, scope)
+    if plan.conditional and plan.is_async:
+        handler = _conditional_layer(handler, plan)
+    if plan.protect is not None and (plan.is_async or plan.coalesce):
+        # Per caller, so coalesced callers are each protected.
+        handler = _protect_layer(handler, plan, in_async=True)
+    if plan.compression is not None:
+        # Outermost, so coalesced callers each get their own negotiated coding.
+        from .compression import build_compression_layer
+        handler = build_compression_layer(handler, plan.wrapper_is_async, plan.compression)
+    return handler
+
+
+def _protect_layer(handler: Callable, plan: EndpointPlan, in_async: bool) -> Callable:
+    if in_async and plan.is_async:
+        method_name = f'aprotect_{plan.protect}'
+
+        async def protected_handler(viewset, request, *args, **kwargs):
+            await getattr(viewset, method_name)(request)
+            return await handler(viewset, request=request, *args, **kwargs)
+        return protected_handler
+
+    method_name = f'protect_{plan.protect}'
+    if in_async:
+        # A sync endpoint's protect method, run in front of coalescing.
+        async def protected_handler(viewset, request, *args, **kwargs):
+            await sync_to_async(getattr(viewset, method_name), thread_sensitive=True)(request)
+            return await handler(viewset, request=request, *args, **kwargs)
+        return protected_handler
+
+    def protected_handler(viewset, request, *args, **kwargs):
+        getattr(viewset, method_name)(request)
+        return handler(viewset, request=request, *args, **kwargs)
+    return protected_handler
+
+
+def _conditional_layer(handler: Callable, plan: EndpointPlan) -> Callable:
+    from .conditional import build_conditional_layer
+    return build_conditional_layer(
+        handler,
+        plan.is_async,
+        etag=plan.etag,
+        last_modified=plan.last_modified,
+        auto_etag=plan.auto_etag)
+
+
+def _build_sync_wrapper(plan: EndpointPlan):
+    func = _build_handler(plan)
+    func_name = plan.func_name
+    allowed_methods = plan.allowed_methods
+    strips_none_pk = plan.strips_none_pk
+    key = plan.key
+    disabled = plan.disabled
+
+    def sync_wrapper(viewset, request, *args, **kwargs):
+        config: SmallViewSetConfig = get_config()
+        if plan.timed:
+            return timed_sync_wrapper(config, viewset, request, args, kwargs)
+        try:
+            pre_response = config.options_and_head_handler(request, allowed_methods)
+            if pre_response:
+                return pre_response
+            if (disabled and config.respect_disabled_endpoints) or (
+                    config.kill_switch is not None and config.kill_switch.is_disabled(key)):
+                return config.exception_handler(request, func_name, EndpointDisabledException())
+            if strips_none_pk and kwargs.get('pk', _MISSING) is None:
+                del kwargs['pk']
+            return func(viewset, request=request, *args, **kwargs)
+        except Exception as e:
+            return config.exception_handler(request, func_name, e)
+
+    def timed_sync_wrapper(config: SmallViewSetConfig, viewset, request, args, kwargs):
+        timing, token = start_timing(viewset, func_name, request)
+        start = perf_counter()
+        mark = start
+        in_body = False
+        try:
             try:
-                config: SmallViewSetConfig = getattr(settings, 'SMALL_VIEW_SET_CONFIG', SmallViewSetConfig())
                 pre_response = config.options_and_head_handler(request, allowed_methods)
+                timing.pre_handler = perf_counter() - start
                 if pre_response:
-                    return pre_response
-                pk = kwargs.pop('pk', None)
-                if pk is None:
-                    return func(viewset, request=request, *args, **kwargs)
+                    response = pre_response
+                elif (disabled and config.respect_disabled_endpoints) or (
+                        config.kill_switch is not None and config.kill_switch.is_disabled(key)):
+                    response = config.exception_handler(request, func_name, EndpointDisabledException())
                 else:
-                    return func(viewset, request=request, pk=pk, *args, **kwargs)
+                    if strips_none_pk and kwargs.get('pk', _MISSING) is None:
+                        del kwargs['pk']
+                    mark = perf_counter()
+                    in_body = True
+                    response = func(viewset, request=request, *args, **kwargs)
+                    timing.body = perf_counter() - mark - timing.protect
             except Exception as e:
-                return config.exception_handler(request, func_name, e)
+                handler_start = perf_counter()
+                if in_body:
+                    timing.body = handler_start - mark - timing.protect
+                else:
+                    timing.pre_handler = handler_start - start
+                response = config.exception_handler(request, func_name, e)
+                timing.exception_handler = perf_counter() - handler_start
+            timing.total = perf_counter() - start
+            timing.status = response.status_code
+        finally:
+            finish_timing(timing, token, config.instrumentation_hooks)
+        return response
+
+    return sync_wrapper
+
 
-        async def async_wrapper(viewset, *args, **kwargs):
-            request = args[0]
-            args = args[1:]
+def _build_async_wrapper(plan: EndpointPlan):
+    func = _build_handler(plan)
+    func_name = plan.func_name
+    allowed_methods = plan.allowed_methods
+    strips_none_pk = plan.strips_none_pk
+    key = plan.key
+    disabled = plan.disabled
+
+    timeout = plan.timeout
+    cancel_on_disconnect = plan.cancel_on_disconnect
+
+    async def async_wrapper(viewset, request, *args, **kwargs):
+        config: SmallViewSetConfig = get_config()
+        if plan.timed:
+            return await timed_async_wrapper(config, viewset, request, args, kwargs)
+        try:
+            pre_response = config.options_and_head_handler(request, allowed_methods)
+            if pre_response:
+                return pre_response
+            if (disabled and config.respect_disabled_endpoints) or (
+                    config.kill_switch is not None and await config.kill_switch.ais_disabled(key)):
+                return config.exception_handler(request, func_name, EndpointDisabledException())
+            if strips_none_pk and kwargs.get('pk', _MISSING) is None:
+                del kwargs['pk']
+            seconds, shield = deadline_policy(config, timeout, cancel_on_disconnect)
+            if seconds is None and not shield:
+                return await func(viewset, request=request, *args, **kwargs)
+            return await run_with_deadline(func(viewset, request=request, *args, **kwargs), seconds, shield)
+        except Exception as e:
+            return config.exception_handler(request, func_name, e)
+
+    async def timed_async_wrapper(config: SmallViewSetConfig, viewset, request, args, kwargs):
+        timing, token = start_timing(viewset, func_name, request)
+        start = perf_counter()
+        mark = start
+        in_body = False
+        try:
             try:
-                config: SmallViewSetConfig = getattr(settings, 'SMALL_VIEW_SET_CONFIG', SmallViewSetConfig())
                 pre_response = config.options_and_head_handler(request, allowed_methods)
+                timing.pre_handler = perf_counter() - start
                 if pre_response:
-                    return pre_response
-                pk = kwargs.pop('pk', None)
-                if pk is None:
-                    return await func(viewset, request=request, *args, **kwargs)
+                    response = pre_response
+                elif (disabled and config.respect_disabled_endpoints) or (
+                        config.kill_switch is not None and await config.kill_switch.ais_disabled(key)):
+                    response = config.exception_handler(request, func_name, EndpointDisabledException())
                 else:
-                    return await func(viewset, request=request, pk=pk, *args, **kwargs)
+                    if strips_none_pk and kwargs.get('pk', _MISSING) is None:
+                        del kwargs['pk']
+                    mark = perf_counter()
+                    in_body = True
+                    seconds, shield = deadline_policy(config, timeout, cancel_on_disconnect)
+                    if seconds is None and not shield:
+                        response = await func(viewset, request=request, *args, **kwargs)
+                    else:
+                        response = await run_with_deadline(
+                            func(viewset, request=request, *args, **kwargs), seconds, shield)
+                    timing.body = perf_counter() - mark - timing.protect
             except Exception as e:
-                return config.exception_handler(request, func_name, e)
-
-        if inspect.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+                handler_start = perf_counter()
+                if in_body:
+                    timing.body = handler_start - mark - timing.protect
+                else:
+                    timing.pre_handler = handler_start - start
+                response = config.exception_handler(request, func_name, e)
+                timing.exception_handler = perf_counter() - handler_start
+            timing.total = perf_counter() - start
+            timing.status = response.status_code
+        finally:
+            finish_timing(timing, token, config.instrumentation_hooks)
+        return response
 
-    return decorator
+    return async_wrapper
 
 
 def endpoint_disabled(func):
     """
-    Temporarily disables an API endpoint based on the SMALL_VIEWSET_RESPECT_DISABLED_ENDPOINTS setting.
+    Disables an API endpoint while `SMALL_VIEW_SET_CONFIG.respect_disabled_endpoints`
+    is True, answering it with a 405. When False, the endpoint stays active, which
+    is useful for testing environments. The setting is read on every request, so
+    it can be changed at runtime.
+
+    Placed directly below `@endpoint`, the check is folded into the endpoint's own
+    wrapper, so it adds no call frame and nothing is raised. Placed on a method the
+    endpoint calls, it raises `EndpointDisabledException` from that method.
 
-    When `SMALL_VIEWSET_RESPECT_DISABLED_ENDPOINTS` in Django settings is set to `True`, this decorator
-    will raise an `EndpointDisabledException`, resulting in a 404 response. When set to `False`,
-    the endpoint will remain active, which is useful for testing environments.
+    Endpoints can also be disabled at runtime without this decorator through
+    `SmallViewSetConfig(kill_switch=KillSwitch(...))`.
 
     Usage:
         - Apply this decorator directly to a view method or action.
@@ -70,20 +339,30 @@ def endpoint_disabled(func):
                 . . .
         ```
     """
-    config: SmallViewSetConfig = getattr(settings, 'SMALL_VIEW_SET_CONFIG', SmallViewSetConfig())
-    def sync_wrapper(*args, **kwargs):
-        if config.respect_disabled_endpoints:
-            raise EndpointDisabledException()
-        return func(*args, **kwargs)
+    key = f'{func.__module__}.{func.__qualname__}'
 
-    async def async_wrapper(*args, **kwargs):
-        if config.respect_disabled_endpoints:
+    def check():
+        config: SmallViewSetConfig = get_config()
+        if config.respect_disabled_endpoints or (
+                config.kill_switch is not None and config.kill_switch.is_disabled(key)):
             raise EndpointDisabledException()
-        return await func(*args, **kwargs)
 
+    async def acheck():
+        config: SmallViewSetConfig = get_config()
+        if config.respect_disabled_endpoints or (
+                config.kill_switch is not None and await config.kill_switch.ais_disabled(key)):
+            raise EndpointDisabledException()
 
     if inspect.iscoroutinefunction(func):
-        return async_wrapper
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            await acheck()
+            return await func(*args, **kwargs)
     else:
-        return sync_wrapper
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            check()
+            return func(*args, **kwargs)
 
+    wrapper._small_view_set_disabled = func
+    return wrapper
@@ -27,4 +27,42 @@ class MethodNotAllowed(Exception):
     def __init__(self, method: str):
         self.method = method
         self.message = f'Method {method} not allowed'
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class Throttled(Exception):
+    status_code = 429
+    message = "Too many requests"
+    error_code = "throttled"
+    def __init__(self, retry_after: float | None = None):
+        """
+        Args:
+            retry_after (float | None): Seconds until the client may retry, sent as
+                the `Retry-After` header.
+        """
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+class ServiceUnavailable(Exception):
+    status_code = 503
+    message = "Service unavailable"
+    error_code = "service_unavailable"
+    def __init__(self, retry_after: float | None = None):
+        """
+        Args:
+            retry_after (float | None): Seconds until the client may retry, sent as
+                the `Retry-After` header.
+        """
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+class GatewayTimeout(Exception):
+    status_code = 504
+    message = "Gateway timeout"
+    error_code = "gateway_timeout"
+    def __init__(self, timeout: float | None = None):
+        """
+        Args:
+            timeout (float | None): The deadline in seconds the endpoint exceeded.
+        """
+        self.timeout = timeout
+        super().__init__(self.message)
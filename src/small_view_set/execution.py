@@ -0,0 +1,183 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from .exceptions import ServiceUnavailable
+from .plan import DEFAULT_GROUP, THREAD_SENSITIVE
+
+
+class ExecutorGroup:
+    """
+    A bounded thread pool shared by the endpoints that name it in
+    `@endpoint(execution='pool', executor_group=...)`.
+
+    At most `max_workers` calls run at once and at most `max_queue` wait for a
+    thread; calls beyond that are rejected with `ServiceUnavailable` (503)
+    instead of piling up, so one slow group cannot starve the others.
+
+    Attributes:
+        queued (int): Calls waiting for a thread.
+        active (int): Calls running now.
+        completed (int): Calls finished since startup, including ones that raised.
+        rejected (int): Calls refused because the group was full.
+    """
+    def __init__(self, name: str, max_workers: int = 8, max_queue: int = 64):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=f'small-view-set-{name}')
+
+    @property
+    def saturation(self) -> float:
+        """Calls in the group per worker thread; above 1.0 means calls are queuing."""
+        return (self.active + self.queued) / self.max_workers
+
+    def stats(self) -> dict:
+        return {
+            'queued': self.queued,
+            'active': self.active,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'saturation': self.saturation,
+        }
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Runs `func` on the pool in a copy of the current context. Raises
+        `ServiceUnavailable` when the group is full.
+        """
+        with self._lock:
+            if self.active + self.queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ServiceUnavailable()
+            self.queued += 1
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(self._run, context, func, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self.queued -= 1
+            raise
+        # A call cancelled while queued, e.g. by a deadline or a client disconnecting,
+        # never reaches `_run`, so it leaves the queue here instead.
+        future.add_done_callback(self._dequeue_cancelled)
+        return future
+
+    async def run(self, func: Callable, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _dequeue_cancelled(self, future: Future):
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def _run(self, context: contextvars.Context, func: Callable, args: tuple, kwargs: dict):
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return context.run(func, *args, **kwargs)
+        finally:
+            # Pool threads never see request_finished, so clean up their connections here.
+            close_old_connections()
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def __repr__(self):
+        return f"<ExecutorGroup {self.name} workers={self.max_workers} queue={self.max_queue}>"
+
+
+_groups_lock = threading.Lock()
+_groups: dict[str, ExecutorGroup] = {}
+
+
+def executor_group(name: str = DEFAULT_GROUP, max_workers: int | None = None, max_queue: int | None = None) -> ExecutorGroup:
+    """
+    Returns the executor group called `name`, creating it on first use.
+
+    Call it at startup, e.g. in `AppConfig.ready()`, to size a group before any
+    endpoint uses it; groups created implicitly get the `ExecutorGroup` defaults.
+    Sizing an existing group differently raises `ValueError`.
+    """
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            sizes = {}
+            if max_workers is not None:
+                sizes['max_workers'] = max_workers
+            if max_queue is not None:
+                sizes['max_queue'] = max_queue
+            group = _groups[name] = ExecutorGroup(name, **sizes)
+        elif (max_workers is not None and max_workers != group.max_workers) or \
+                (max_queue is not None and max_queue != group.max_queue):
+            raise ValueError(f"Executor group {name!r} already exists with different sizes")
+        return group
+
+
+def executor_group_stats() -> dict[str, dict]:
+    """Returns `ExecutorGroup.stats()` for every group, keyed by name, for exporting as metrics."""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
+
+
+async def run_sync(func: Callable, *args, executor_group: str | None = None, **kwargs):
+    """
+    Calls a sync function from async code without blocking the event loop.
+
+    Runs on the named executor group when `executor_group` is given, otherwise
+    thread-sensitively like Django's own `sync_to_async` (the right choice for
+    most ORM calls).
+
+    Usage:
+        ```python
+        @endpoint(allowed_methods=['GET', 'PATCH'])
+        async def detail(self, request: Request, pk: int):
+            if request.method == 'PATCH':
+                return await run_sync(self.patch, request, pk, executor_group='writes')
+        ```
+    """
+    if executor_group is None:
+        return await sync_to_async(func, thread_sensitive=True)(*args, **kwargs)
+    return await _lookup_group(executor_group).run(func, *args, **kwargs)
+
+
+def _lookup_group(name: str) -> ExecutorGroup:
+    group = _groups.get(name)
+    if group is None:
+        group = executor_group(name)
+    return group
+
+
+def build_execution_layer(handler: Callable, execution: str, group_name: str) -> Callable:
+    """
+    Turns a sync endpoint handler into an async one that runs on `group_name`'s
+    pool, or on Django's thread-sensitive executor.
+    """
+    if execution == THREAD_SENSITIVE:
+        run_thread_sensitive = sync_to_async(handler, thread_sensitive=True)
+
+        async def thread_sensitive_handler(viewset, request, *args, **kwargs):
+            return await run_thread_sensitive(viewset, request=request, *args, **kwargs)
+
+        return thread_sensitive_handler
+
+    async def pool_handler(viewset, request, *args, **kwargs):
+        group = _lookup_group(group_name)
+        return await group.run(handler, viewset, request=request, *args, **kwargs)
+
+    return pool_handler
@@ -1,133 +1,333 @@
+from __future__ import annotations
+
 import json
 import logging
+import math
+from typing import Callable, TYPE_CHECKING
 
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, SuspiciousOperation, PermissionDenied
-from django.http import Http404, JsonResponse
-from urllib.request import Request
+from django.http import Http404, HttpResponse
+
+from . import config as _config
+from .exceptions import (
+    EndpointDisabledException,
+    GatewayTimeout,
+    MethodNotAllowed,
+    ServiceUnavailable,
+    Throttled,
+    Unauthorized,
+)
+from .plan import AllowedMethods
+from .responses import ResponseTemplate, SmallJsonResponse
+from .serialization import stdlib_json_dumps
 
-from .exceptions import EndpointDisabledException, MethodNotAllowed, Unauthorized
+if TYPE_CHECKING:
+    from urllib.request import Request
 
 
 _logger = logging.getLogger('django-small-view-set.default_handle_endpoint_exceptions')
-if not _logger.hasHandlers():
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
-    handler.setFormatter(formatter)
-    _logger.addHandler(handler)
-    _logger.setLevel(logging.INFO)
+_logger_configured = False
+
+
+def _configure_logger():
+    """
+    Gives the exception logger a stream handler when logging has no handler for it.
+
+    Runs on first use rather than at import, so it sees the project's `LOGGING`
+    setting and importing the package does not touch logging at all.
+    """
+    global _logger_configured
+    if not _logger.hasHandlers():
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+        handler.setFormatter(formatter)
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+    _logger_configured = True
+
+
+def make_options_and_head_handler(
+        access_control_max_age: int | None = None,
+        cors_headers: dict[str, str] | None = None):
+    """
+    Builds an `options_and_head_handler` that answers OPTIONS and HEAD requests
+    from prebuilt response templates, one per `Allow` header.
+
+    Args:
+        access_control_max_age (int | None): When set, OPTIONS responses carry
+            `Access-Control-Allow-Methods` and `Access-Control-Max-Age` so browsers
+            can cache the CORS preflight for that many seconds.
+        cors_headers (dict[str, str] | None): Extra static headers added to OPTIONS
+            responses, e.g. `{'Access-Control-Allow-Origin': 'https://example.com'}`.
+            `Access-Control-Allow-Methods` is added whenever this is set.
+
+    Usage:
+        ```python
+        SMALL_VIEW_SET_CONFIG = SmallViewSetConfig(
+            options_and_head_handler=make_options_and_head_handler(
+                access_control_max_age=600,
+                cors_headers={'Access-Control-Allow-Origin': '*'}))
+        ```
+    """
+    is_cors = access_control_max_age is not None or bool(cors_headers)
+    templates: dict[tuple[str, str], ResponseTemplate] = {}
+
+    def build_template(method: str, allowed_methods: AllowedMethods) -> ResponseTemplate:
+        headers = {'Allow': allowed_methods.header}
+        if method == 'OPTIONS' and is_cors:
+            headers['Access-Control-Allow-Methods'] = allowed_methods.header
+            if access_control_max_age is not None:
+                headers['Access-Control-Max-Age'] = str(access_control_max_age)
+            headers.update(cors_headers or {})
+        return ResponseTemplate(b'null', status=200, headers=headers)
+
+    def options_and_head_handler(request: Request, allowed_methods: list[str]):
+        method = request.method
+        if method == 'OPTIONS' or method == 'HEAD':
+            if not isinstance(allowed_methods, AllowedMethods):
+                allowed_methods = AllowedMethods(allowed_methods)
+            # By the header rather than the set of methods, so each endpoint keeps its declared order.
+            key = (method, allowed_methods.header)
+            template = templates.get(key)
+            if template is None:
+                template = templates[key] = build_template(method, allowed_methods)
+            return template.clone()
+
+        if method not in allowed_methods:
+            raise MethodNotAllowed(method=method)
+
+    return options_and_head_handler
+
+
+_default_options_and_head_handler = make_options_and_head_handler()
 
 
 def default_options_and_head_handler(request: Request, allowed_methods: list[str]):
-    if request.method == 'OPTIONS':
-            response = JsonResponse(
-                data=None,
-                safe=False,
-                status=200,
-                content_type='application/json')
-            response['Allow'] = ', '.join(allowed_methods)
-            return response
-
-    if request.method == 'HEAD':
-        response = JsonResponse(
-            data=None,
-            safe=False,
-            status=200,
-            content_type='application/json')
-        response['Allow'] = ', '.join(allowed_methods)
-        return response
-
-    if request.method not in allowed_methods:
-        raise MethodNotAllowed(method=request.method)
+    """
+    Answers OPTIONS and HEAD with an empty JSON body and an `Allow` header, and
+    raises `MethodNotAllowed` for any other method not in `allowed_methods`.
+
+    Responses are cloned from templates cached per `Allow` header. Use
+    `make_options_and_head_handler` to add CORS preflight headers.
+    """
+    return _default_options_and_head_handler(request, allowed_methods)
+
+
+_EXCEPTION_RESPONSES: dict[type, Callable] = {}
+_resolved_exception_responses: dict[type, Callable] = {}
+
+_CLIENT_ERROR_MESSAGES = {
+    400: 'Bad request',
+    401: 'Unauthorized',
+    403: 'Forbidden',
+    404: 'Not found',
+    405: 'Method not allowed',
+    429: 'Too many requests',
+}
+
+
+def register_exception_response(*exception_types: type):
+    """
+    Registers a response factory used by `default_exception_handler` for the given
+    exception types and their subclasses.
+
+    The factory takes `(request, endpoint_name, exception)` and returns a response.
+    The most specific registered class in the exception's `__mro__` wins.
+
+    Usage:
+        ```python
+        @register_exception_response(CustomException)
+        def custom_exception_response(request, endpoint_name, exception):
+            return JsonResponse({'errors': exception.message}, status=400)
+        ```
+    """
+    def decorator(factory: Callable):
+        for exception_type in exception_types:
+            _EXCEPTION_RESPONSES[exception_type] = factory
+        _resolved_exception_responses.clear()
+        return factory
+    return decorator
+
+
+def _resolve_exception_response(exception_type: type) -> Callable:
+    for klass in exception_type.__mro__:
+        factory = _EXCEPTION_RESPONSES.get(klass)
+        if factory is not None:
+            break
+    _resolved_exception_responses[exception_type] = factory
+    return factory
 
 
 def default_exception_handler(request: Request, endpoint_name: str, exception):
-    try:
-        raise exception
-
-    except json.JSONDecodeError:
-        return JsonResponse(data={"errors": "Invalid JSON"}, status=400)
-
-    except (TypeError, ValueError) as exception:
-        if hasattr(exception, 'detail'):
-            return JsonResponse(data={'errors': exception.detail}, status=400)
-        if hasattr(exception, 'message'):
-            return JsonResponse(data={'errors': exception.message}, status=400)
-        return JsonResponse(data=None, safe=False, status=400)
-
-    except Unauthorized:
-        return JsonResponse(data=None, safe=False, status=401)
-
-    except (PermissionDenied, SuspiciousOperation):
-        return JsonResponse(data=None, safe=False, status=403)
-
-    except (Http404, ObjectDoesNotExist):
-        return JsonResponse(data=None, safe=False, status=404)
-    
-    except EndpointDisabledException:
-        return JsonResponse(data=None, safe=False, status=405)
-
-    except MethodNotAllowed as exception:
-        return JsonResponse(
-            data={'errors': f"Method {exception.method} is not allowed"},
-            status=405)
-
-    except Exception as exception:
-        # Catch-all exception handler for API endpoints.
-        # 
-        # - Always defaults to HTTP 500 with "Internal server error" unless the exception provides a more specific status code and error details.
-        # - Duck types to extract error information from `detail` or `message` attributes, if available.
-        # - Never exposes internal exception contents to end users for 5xx server errors unless settings.DEBUG is True.
-        # - Allows structured error payloads (string, list, or dict) without assumptions about the error format.
-        # - Logs exceptions fully for server-side diagnostics, distinguishing handled vs unhandled cases.
-        # 
-        # This design prioritizes API security, developer debugging, and future portability across projects.
-
-        status_code = getattr(exception, 'status_code', 500)
-        error_contents = None
-
-        if hasattr(exception, 'detail'):
-            error_contents = exception.detail
-        elif hasattr(exception, 'message') and isinstance(exception.message, str):
-            error_contents = exception.message
-
-        if 400 <= status_code <= 499:
-            if status_code == 400:
-                message = 'Bad request'
-            elif status_code == 401:
-                message = 'Unauthorized'
-            elif status_code == 403:
-                message = 'Forbidden'
-            elif status_code == 404:
-                message = 'Not found'
-            elif status_code == 405:
-                message = 'Method not allowed'
-            elif status_code == 429:
-                message = 'Too many requests'
-            elif error_contents:
-                message = error_contents
-            else:
-                message = 'An error occurred'
-
-            if settings.DEBUG and error_contents:
-                message = error_contents
-        else:
-            status_code = 500
-            message = 'Internal server error'
-            if settings.DEBUG:
-                message = error_contents if error_contents else str(exception)
+    """
+    Maps an exception raised by an endpoint to a `JsonResponse`.
+
+    The response factory is looked up by walking `type(exception).__mro__` against
+    the registry filled by `register_exception_response`, and the result is
+    memoized per exception class, so no re-raise happens per request.
+    """
+    exception_type = type(exception)
+    factory = _resolved_exception_responses.get(exception_type)
+    if factory is None:
+        factory = _resolve_exception_response(exception_type)
+    return factory(request, endpoint_name, exception)
+
+
+def _build_static_error_responses(json_dumps: Callable) -> dict[tuple[int, str | None], ResponseTemplate]:
+    """
+    Pre-encodes the error responses whose body never changes, keyed by
+    `(status_code, message)`, where a `None` message is a `null` body.
+    """
+    keys = [(status, None) for status in (400, 401, 403, 404, 405)]
+    keys.append((400, 'Invalid JSON'))
+    keys.append((500, 'Internal server error'))
+    keys.append((503, ServiceUnavailable.message))
+    keys.extend(_CLIENT_ERROR_MESSAGES.items())
+    keys.extend((405, f"Method {method} is not allowed") for method in _STANDARD_METHODS)
+    return {
+        (status, message): ResponseTemplate(
+            json_dumps(None if message is None else {'errors': message}),
+            status=status)
+        for status, message in keys
+    }
+
+
+_STANDARD_METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'TRACE', 'CONNECT')
+# Pre-encoded bodies, one table per JSON encoder in use. The standard library
+# table is built at import time; other encoders get theirs on first use.
+_static_error_responses: dict[Callable, dict[tuple[int, str | None], ResponseTemplate]] = {
+    stdlib_json_dumps: _build_static_error_responses(stdlib_json_dumps),
+}
 
+
+def _static_error_responses_for(json_dumps: Callable) -> dict[tuple[int, str | None], ResponseTemplate]:
+    templates = _static_error_responses.get(json_dumps)
+    if templates is None:
+        templates = _static_error_responses[json_dumps] = _build_static_error_responses(json_dumps)
+    return templates
+
+
+def error_response(status_code: int, message=None) -> HttpResponse:
+    """
+    Returns a `{'errors': message}` JSON response, or a `null` body when `message`
+    is None, cloned from a pre-encoded body when the pair is a known constant.
+    """
+    if message is None or isinstance(message, str):
+        templates = _static_error_responses_for(_config.get_config().json_dumps)
+        template = templates.get((status_code, message))
+        if template is not None:
+            return template.clone()
+    if message is None:
+        return SmallJsonResponse(data=None, safe=False, status=status_code)
+    return SmallJsonResponse(data={'errors': message}, status=status_code)
+
+
+@register_exception_response(json.JSONDecodeError)
+def _invalid_json_response(request: Request, endpoint_name: str, exception):
+    return error_response(400, 'Invalid JSON')
+
+
+@register_exception_response(TypeError, ValueError)
+def _bad_value_response(request: Request, endpoint_name: str, exception):
+    if hasattr(exception, 'detail'):
+        return error_response(400, exception.detail)
+    if hasattr(exception, 'message'):
+        return error_response(400, exception.message)
+    return error_response(400)
+
+
+@register_exception_response(Unauthorized)
+def _unauthorized_response(request: Request, endpoint_name: str, exception):
+    return error_response(401)
+
+
+@register_exception_response(PermissionDenied, SuspiciousOperation)
+def _forbidden_response(request: Request, endpoint_name: str, exception):
+    return error_response(403)
+
+
+@register_exception_response(Http404, ObjectDoesNotExist)
+def _not_found_response(request: Request, endpoint_name: str, exception):
+    return error_response(404)
+
+
+@register_exception_response(EndpointDisabledException)
+def _endpoint_disabled_response(request: Request, endpoint_name: str, exception):
+    return error_response(405)
+
+
+@register_exception_response(MethodNotAllowed)
+def _method_not_allowed_response(request: Request, endpoint_name: str, exception):
+    return error_response(405, f"Method {exception.method} is not allowed")
+
+
+@register_exception_response(Throttled)
+def _throttled_response(request: Request, endpoint_name: str, exception):
+    # Not logged: throttling is expected under load and would flood the logs.
+    response = error_response(429, _CLIENT_ERROR_MESSAGES[429])
+    if exception.retry_after is not None:
+        response['Retry-After'] = str(max(1, math.ceil(exception.retry_after)))
+    return response
+
+
+@register_exception_response(ServiceUnavailable)
+def _service_unavailable_response(request: Request, endpoint_name: str, exception):
+    # Not logged: this is load shedding, counted by whatever raised it.
+    response = error_response(503, ServiceUnavailable.message)
+    if exception.retry_after is not None:
+        response['Retry-After'] = str(max(1, math.ceil(exception.retry_after)))
+    return response
+
+
+@register_exception_response(GatewayTimeout)
+def _gateway_timeout_response(request: Request, endpoint_name: str, exception):
+    if not _logger_configured:
+        _configure_logger()
+    _logger.warning("Endpoint %s exceeded its %ss deadline", endpoint_name, exception.timeout)
+    return error_response(504, GatewayTimeout.message)
+
+
+@register_exception_response(Exception)
+def _generic_exception_response(request: Request, endpoint_name: str, exception):
+    # Catch-all exception handler for API endpoints.
+    # 
+    # - Always defaults to HTTP 500 with "Internal server error" unless the exception provides a more specific status code and error details.
+    # - Duck types to extract error information from `detail` or `message` attributes, if available.
+    # - Never exposes internal exception contents to end users for 5xx server errors unless settings.DEBUG is True.
+    # - Allows structured error payloads (string, list, or dict) without assumptions about the error format.
+    # - Logs exceptions fully for server-side diagnostics, distinguishing handled vs unhandled cases.
+    # 
+    # This design prioritizes API security, developer debugging, and future portability across projects.
+
+    status_code = getattr(exception, 'status_code', 500)
+    error_contents = None
+
+    if hasattr(exception, 'detail'):
+        error_contents = exception.detail
+    elif hasattr(exception, 'message') and isinstance(exception.message, str):
+        error_contents = exception.message
+
+    if 400 <= status_code <= 499:
+        message = _CLIENT_ERROR_MESSAGES.get(status_code)
+        if message is None:
+            message = error_contents if error_contents else 'An error occurred'
+
+        if settings.DEBUG and error_contents:
+            message = error_contents
+    else:
+        status_code = 500
+        message = 'Internal server error'
+        if settings.DEBUG:
+            message = error_contents if error_contents else str(exception)
+
+    if not _logger_configured:
+        _configure_logger()
+    if _logger.isEnabledFor(logging.ERROR):
         e_name = type(exception).__name__
         if error_contents:
-            msg = f"Handled API exception in {endpoint_name}: {e_name}: {error_contents}"
-            _logger.error(msg)
-                
+            _logger.error("Handled API exception in %s: %s: %s", endpoint_name, e_name, error_contents)
         else:
-            msg = f"Unhandled exception in {endpoint_name}: {e_name}: {exception}"
-            _logger.error(msg)
-
-        return JsonResponse(
-            data={'errors': message},
-            safe=False,
-            status=status_code,
-            content_type='application/json')
\ No newline at end of file
+            _logger.error("Unhandled exception in %s: %s: %s", endpoint_name, e_name, exception)
+
+    return error_response(status_code, message)
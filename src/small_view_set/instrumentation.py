@@ -0,0 +1,207 @@
+import functools
+import inspect
+import logging
+import threading
+import weakref
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable
+
+
+_logger = logging.getLogger('django-small-view-set.instrumentation')
+
+_current_timing: ContextVar['EndpointTiming | None'] = ContextVar('small_view_set_timing', default=None)
+
+PROTECT_METHODS = (
+    'protect_create',
+    'protect_list',
+    'protect_retrieve',
+    'protect_update',
+    'protect_delete',
+    'aprotect_create',
+    'aprotect_list',
+    'aprotect_retrieve',
+    'aprotect_update',
+    'aprotect_delete',
+)
+
+_MISSING = object()
+
+# Per instrumented class, the `protect_*` entries of its own `__dict__` before
+# wrapping (`_MISSING` where the method was inherited), so they can be put back.
+_instrumented_classes: dict[type, dict[str, object]] = {}
+_instrument_lock = threading.Lock()
+
+# Endpoint plans whose `timed` flag follows the resolved config.
+_plans: 'weakref.WeakSet' = weakref.WeakSet()
+_timing_enabled = False
+
+
+class EndpointTiming:
+    """
+    Timings for one request through an `@endpoint`, passed to every hook in
+    `SmallViewSetConfig(instrumentation_hooks=[...])` once the response is ready.
+
+    All durations are in seconds, measured with `time.perf_counter()`.
+
+    Attributes:
+        viewset (str): Class name of the viewset, e.g. 'BarViewSet'.
+        endpoint (str): Name of the endpoint function, e.g. 'detail'.
+        method (str): HTTP method of the request.
+        status (int | None): Status code of the response.
+        pre_handler (float): Time spent in `options_and_head_handler`.
+        protect (float): Time spent inside `protect_*` methods.
+        body (float): Time spent in the endpoint itself, excluding `protect`.
+        exception_handler (float): Time spent in `exception_handler`, 0 if nothing raised.
+        total (float): Wall time for the whole wrapper.
+    """
+    __slots__ = (
+        'viewset',
+        'endpoint',
+        'method',
+        'status',
+        'pre_handler',
+        'protect',
+        'body',
+        'exception_handler',
+        'total',
+        '_protect_depth',
+    )
+
+    def __init__(self, viewset: str, endpoint: str, method: str):
+        self.viewset = viewset
+        self.endpoint = endpoint
+        self.method = method
+        self.status = None
+        self.pre_handler = 0.0
+        self.protect = 0.0
+        self.body = 0.0
+        self.exception_handler = 0.0
+        self.total = 0.0
+        self._protect_depth = 0
+
+    def __repr__(self):
+        return (
+            f"<EndpointTiming {self.viewset}.{self.endpoint} {self.method} {self.status} "
+            f"total={self.total * 1000:.3f}ms>")
+
+
+def start_timing(viewset, endpoint_name: str, request) -> tuple[EndpointTiming, object]:
+    cls = type(viewset)
+    if cls not in _instrumented_classes:
+        instrument_protect_methods(cls)
+    timing = EndpointTiming(type(viewset).__name__, endpoint_name, request.method)
+    return timing, _current_timing.set(timing)
+
+
+def finish_timing(timing: EndpointTiming, token, hooks: tuple[Callable, ...]):
+    _current_timing.reset(token)
+    for hook in hooks:
+        try:
+            hook(timing)
+        except Exception:
+            _logger.exception("Instrumentation hook %r failed", hook)
+
+
+def track_timing(plan):
+    """
+    Registers an endpoint plan so `configure_timing` keeps its `timed` flag in
+    step with the config, and sets the flag for the config resolved so far.
+    """
+    plan.timed = _timing_enabled
+    _plans.add(plan)
+
+
+def configure_timing(config):
+    """
+    Points every endpoint plan at the timed or the plain code path for `config`.
+
+    Called whenever the config is resolved. Once no hooks are registered, the
+    `protect_*` wrappers added by `instrument_protect_methods` are removed again.
+    """
+    global _timing_enabled
+    _timing_enabled = bool(config.instrumentation_hooks)
+    for plan in list(_plans):
+        plan.timed = _timing_enabled
+    if not _timing_enabled:
+        uninstrument_protect_methods()
+
+
+def instrument_protect_methods(cls: type):
+    """
+    Wraps the `protect_*` methods of `cls` with `timed_protect`, setting the
+    wrappers on `cls` itself so its bases and sibling classes are left alone.
+
+    Runs for a viewset class the first time one of its endpoints is timed, so
+    classes are left untouched, and protect calls cost nothing extra, unless
+    instrumentation hooks are configured. `uninstrument_protect_methods` undoes it.
+    """
+    with _instrument_lock:
+        if cls in _instrumented_classes:
+            return
+        originals = {}
+        for name in PROTECT_METHODS:
+            method = getattr(cls, name, None)
+            if callable(method) and not getattr(method, '_small_view_set_timed', False):
+                originals[name] = cls.__dict__.get(name, _MISSING)
+                setattr(cls, name, timed_protect(method))
+        _instrumented_classes[cls] = originals
+
+
+def uninstrument_protect_methods():
+    """
+    Puts back the `protect_*` methods of every class `instrument_protect_methods` wrapped.
+    """
+    with _instrument_lock:
+        for cls, originals in _instrumented_classes.items():
+            for name, original in originals.items():
+                if original is _MISSING:
+                    delattr(cls, name)
+                else:
+                    setattr(cls, name, original)
+        _instrumented_classes.clear()
+
+
+def timed_protect(method: Callable) -> Callable:
+    """
+    Wraps a `protect_*` method so its duration is added to the current request's
+    `EndpointTiming.protect`. Nested calls, such as `super().protect_create(request)`,
+    are only counted once. Without an active timing this is a single context
+    variable read.
+    """
+    if inspect.iscoroutinefunction(method):
+        return _timed_async_protect(method)
+
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        timing = _current_timing.get()
+        if timing is None or timing._protect_depth:
+            return method(self, request, *args, **kwargs)
+        timing._protect_depth = 1
+        start = perf_counter()
+        try:
+            return method(self, request, *args, **kwargs)
+        finally:
+            timing.protect += perf_counter() - start
+            timing._protect_depth = 0
+
+    wrapper._small_view_set_timed = True
+    return wrapper
+
+
+def _timed_async_protect(method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self, request, *args, **kwargs):
+        timing = _current_timing.get()
+        if timing is None or timing._protect_depth:
+            return await method(self, request, *args, **kwargs)
+        timing._protect_depth = 1
+        start = perf_counter()
+        try:
+            return await method(self, request, *args, **kwargs)
+        finally:
+            timing.protect += perf_counter() - start
+            timing._protect_depth = 0
+
+    wrapper._small_view_set_timed = True
+    return wrapper
@@ -0,0 +1,132 @@
+import logging
+import math
+import threading
+import time
+
+
+logger = logging.getLogger('django-small-view-set.kill_switch')
+
+
+def endpoint_key(endpoint) -> str:
+    """
+    Returns the name a `KillSwitch` knows an endpoint by, e.g.
+    'api.views.bar.BarViewSet.export'. `endpoint` may already be that name, or the
+    endpoint method itself.
+    """
+    if isinstance(endpoint, str):
+        return endpoint
+    plan = getattr(endpoint, 'endpoint_plan', None)
+    if plan is not None:
+        return plan.key
+    func = getattr(endpoint, '__func__', endpoint)
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+class KillSwitch:
+    """
+    Endpoints disabled at runtime, without a redeploy, e.g. to shed an expensive
+    endpoint during an incident. Disabled endpoints answer like `@endpoint_disabled`
+    ones, with a 405 from the exception handler, and nothing is raised.
+
+    The flags live in a Django cache so every process and node sees them. Each
+    process polls the cache at most once per `ttl` seconds and checks its local
+    copy in between, so a toggle takes up to `ttl` seconds to reach every process.
+    Async endpoints poll with the cache's `aget`, so the event loop is not blocked.
+    If the cache cannot be read, the last known flags are kept.
+
+    Args:
+        backend (str | None): Alias of the Django cache in `settings.CACHES` holding
+            the flags. None keeps them in this process only.
+        ttl (float): Seconds between polls of the cache.
+        key (str): Cache key holding the disabled endpoints.
+
+    Usage:
+        ```python
+        kill_switch = KillSwitch(backend='default', ttl=5)
+        SMALL_VIEW_SET_CONFIG = SmallViewSetConfig(kill_switch=kill_switch)
+
+        # From a shell, an admin view or a management command:
+        kill_switch.disable('api.views.bar.BarViewSet.export')
+        kill_switch.enable(BarViewSet.export)
+        ```
+    """
+    def __init__(self, backend: str | None = 'default', ttl: float = 5.0, key: str = 'svs-disabled-endpoints'):
+        self.backend = backend
+        self.ttl = ttl
+        self.key = key
+        self._disabled: frozenset[str] = frozenset()
+        # Without a backend there is nothing to poll.
+        self._expires = 0.0 if backend is not None else math.inf
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.backend]
+
+    def is_disabled(self, key: str) -> bool:
+        """Whether the endpoint named `key` is disabled. Reads the cache at most once per `ttl`."""
+        if self._expires <= time.monotonic():
+            self.refresh()
+        return key in self._disabled
+
+    async def ais_disabled(self, key: str) -> bool:
+        """Like `is_disabled`, for async code."""
+        if self._expires <= time.monotonic():
+            await self.arefresh()
+        return key in self._disabled
+
+    def refresh(self):
+        """Re-reads the flags from the cache now."""
+        if self.backend is None:
+            return
+        # Push the next poll out first so concurrent requests don't all read the cache.
+        self._expires = time.monotonic() + self.ttl
+        try:
+            disabled = self.cache.get(self.key)
+        except Exception:
+            logger.exception("Could not read disabled endpoints from cache %r, keeping the last known ones", self.backend)
+            return
+        self._disabled = frozenset(disabled or ())
+
+    async def arefresh(self):
+        """Like `refresh`, reading the cache with `aget`."""
+        if self.backend is None:
+            return
+        self._expires = time.monotonic() + self.ttl
+        try:
+            disabled = await self.cache.aget(self.key)
+        except Exception:
+            logger.exception("Could not read disabled endpoints from cache %r, keeping the last known ones", self.backend)
+            return
+        self._disabled = frozenset(disabled or ())
+
+    def disabled(self) -> list[str]:
+        """The endpoints currently disabled, read from the cache."""
+        self.refresh()
+        return sorted(self._disabled)
+
+    def disable(self, *endpoints):
+        """Disables `endpoints`, given as names or endpoint methods."""
+        keys = frozenset(map(endpoint_key, endpoints))
+        with self._lock:
+            self._store(self._read() | keys)
+
+    def enable(self, *endpoints):
+        """Re-enables `endpoints`, given as names or endpoint methods."""
+        keys = frozenset(map(endpoint_key, endpoints))
+        with self._lock:
+            self._store(self._read() - keys)
+
+    def _read(self) -> frozenset[str]:
+        if self.backend is None:
+            return self._disabled
+        return frozenset(self.cache.get(self.key) or ())
+
+    def _store(self, disabled: frozenset[str]):
+        # A read-modify-write: toggles made at the same moment from two processes may
+        # overwrite each other, which is acceptable for an operator's switch.
+        if self.backend is not None:
+            self.cache.set(self.key, sorted(disabled), timeout=None)
+            self._expires = time.monotonic() + self.ttl
+        self._disabled = disabled
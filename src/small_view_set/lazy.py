@@ -0,0 +1,93 @@
+import threading
+
+from django.urls import URLPattern
+from django.urls.resolvers import ResolverMatch, RoutePattern
+from django.utils.module_loading import import_string
+
+
+_viewsets: dict[str, object] = {}
+_lock = threading.Lock()
+
+
+class LazyView:
+    """
+    Stands in for a viewset endpoint named by an import string, such as
+    'api.views.bar.BarViewSet.detail', until a request first needs it.
+
+    The viewset class is imported and instantiated on first use, once per class,
+    and every lazy route of that class shares the instance.
+    """
+    def __init__(self, import_path: str):
+        viewset_path, _, method_name = import_path.rpartition('.')
+        if not viewset_path:
+            raise ValueError(f"Expected 'module.ViewSet.method', got {import_path!r}")
+        self.import_path = import_path
+        self.viewset_path = viewset_path
+        self.method_name = method_name
+        self._view = None
+
+    def load(self):
+        view = self._view
+        if view is None:
+            with _lock:
+                viewset = _viewsets.get(self.viewset_path)
+                if viewset is None:
+                    viewset = _viewsets[self.viewset_path] = import_string(self.viewset_path)()
+            view = self._view = getattr(viewset, self.method_name)
+        return view
+
+    @property
+    def loaded(self) -> bool:
+        return self._view is not None
+
+    def __call__(self, request, *args, **kwargs):
+        return self.load()(request, *args, **kwargs)
+
+    def __repr__(self):
+        return f'<LazyView {self.import_path}>'
+
+
+class LazyURLPattern(URLPattern):
+    """
+    A `URLPattern` whose view is a `LazyView`. Resolving the route hands Django
+    the real endpoint, so sync and async endpoints are served as usual, while
+    `reverse()` and the URL checks work without importing the viewset.
+    """
+    def resolve(self, path):
+        match = self.pattern.match(path)
+        if match:
+            new_path, args, captured_kwargs = match
+            kwargs = {**captured_kwargs, **self.default_args}
+            return ResolverMatch(
+                self.callback.load(),
+                args,
+                kwargs,
+                self.pattern.name,
+                route=str(self.pattern),
+                captured_kwargs=captured_kwargs,
+                extra_kwargs=self.default_args)
+
+    @property
+    def lookup_str(self):
+        return self.callback.import_path
+
+
+def lazy_path(route: str, view: str, kwargs: dict | None = None, name: str | None = None) -> LazyURLPattern:
+    """
+    Like `django.urls.path`, but `view` is the import string of a viewset endpoint,
+    so the viewset's module is only imported when a request first resolves to it.
+
+    Usage:
+        ```python
+        urlpatterns = [
+            lazy_path('api/bars/',          'api.views.bar.BarViewSet.collection', name='bars_collection'),
+            lazy_path('api/bars/<int:pk>/', 'api.views.bar.BarViewSet.detail',     name='bars_detail'),
+        ]
+        ```
+    """
+    return LazyURLPattern(RoutePattern(route, name=name, is_endpoint=True), LazyView(view), kwargs or {}, name)
+
+
+def loaded_viewsets() -> list[str]:
+    """Import paths of the viewsets lazy routes have loaded so far."""
+    return list(_viewsets)
@@ -0,0 +1,173 @@
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from .helpers import _logger, _configure_logger
+
+
+DROP_NEWEST = 'drop_newest'
+DROP_OLDEST = 'drop_oldest'
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    A `QueueHandler` that never blocks the caller.
+
+    Records are put on a bounded queue without being formatted; formatting and
+    emission happen on the listener thread. When the queue is full the record is
+    dropped according to `drop_policy` and counted in `dropped`.
+    """
+    def __init__(self, log_queue: queue.Queue, drop_policy: str = DROP_NEWEST):
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"drop_policy must be '{DROP_NEWEST}' or '{DROP_OLDEST}'")
+        super().__init__(log_queue)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in the same process, so the record can cross the queue
+        # as-is and be formatted by the real handlers on the listener thread.
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.drop_policy == DROP_OLDEST:
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+                self.queue.put_nowait(record)
+                return
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+
+class _DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # Block instead of raising when the queue is full; the listener thread is
+        # still draining, so there will be room for the sentinel.
+        self.queue.put(self._sentinel)
+
+
+class QueueLogging:
+    """
+    Handle returned by `enable_queue_logging`.
+
+    Attributes:
+        handler (BoundedQueueHandler): The handler now attached to the logger.
+        listener (QueueListener): Emits queued records on a background thread.
+    """
+    def __init__(
+            self,
+            logger: logging.Logger,
+            handler: BoundedQueueHandler,
+            listener: QueueListener,
+            own_handlers: list[logging.Handler],
+            propagate: bool):
+        self.logger = logger
+        self.handler = handler
+        self.listener = listener
+        self._own_handlers = own_handlers
+        self._propagate = propagate
+        self._stopped = False
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped because the queue was full."""
+        return self.handler.dropped
+
+    @property
+    def pending(self) -> int:
+        """Approximate number of records waiting to be emitted."""
+        return self.handler.queue.qsize()
+
+    def stop(self):
+        """
+        Flushes every queued record, stops the listener thread, and puts the
+        logger's original handlers and `propagate` back. Registered with `atexit`.
+        """
+        with _lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self.listener.stop()
+            self.logger.removeHandler(self.handler)
+            for handler in self._own_handlers:
+                self.logger.addHandler(handler)
+            self.logger.propagate = self._propagate
+            if _active.get(self.logger.name) is self:
+                del _active[self.logger.name]
+
+
+_lock = threading.Lock()
+_active: dict[str, QueueLogging] = {}
+
+
+def enable_queue_logging(
+        maxsize: int = 10000,
+        drop_policy: str = DROP_NEWEST,
+        logger: logging.Logger | None = None) -> QueueLogging:
+    """
+    Moves the library's exception logging off the request path.
+
+    Every handler a record from the logger would reach, its own and those of the
+    ancestors it propagates to (usually the root handlers configured in `LOGGING`),
+    is attached to a `QueueListener` thread. The logger itself gets a
+    `BoundedQueueHandler` and stops propagating, so `default_exception_handler`
+    never blocks an event loop or worker on stream I/O. Ancestor loggers keep their
+    handlers for everything else. Call it once at startup, e.g. in an `AppConfig.ready()`.
+
+    Args:
+        maxsize (int): Maximum number of records buffered before dropping.
+        drop_policy (str): 'drop_newest' discards the incoming record when full,
+            'drop_oldest' discards the oldest queued record to make room.
+        logger (logging.Logger | None): Logger to convert. Defaults to the logger
+            used by `default_exception_handler`.
+
+    Returns:
+        QueueLogging: exposes `dropped`, `pending` and `stop()`. Calling this again
+        for the same logger returns the handle already in place.
+    """
+    if logger is None:
+        _configure_logger()
+        logger = _logger
+
+    with _lock:
+        existing = _active.get(logger.name)
+        if existing is not None:
+            return existing
+
+        own_handlers = list(logger.handlers)
+        handler = BoundedQueueHandler(queue.Queue(maxsize), drop_policy=drop_policy)
+        listener = _DrainingQueueListener(handler.queue, *_effective_handlers(logger), respect_handler_level=True)
+        for original in own_handlers:
+            logger.removeHandler(original)
+        propagate = logger.propagate
+        logger.addHandler(handler)
+        logger.propagate = False
+        listener.start()
+
+        queue_logging = QueueLogging(logger, handler, listener, own_handlers, propagate)
+        _active[logger.name] = queue_logging
+
+    atexit.register(queue_logging.stop)
+    return queue_logging
+
+
+def _effective_handlers(logger: logging.Logger) -> list[logging.Handler]:
+    # The handlers `Logger.callHandlers` would call, walking up while records propagate.
+    handlers = []
+    current = logger
+    while current is not None:
+        handlers.extend(handler for handler in current.handlers if handler not in handlers)
+        if not current.propagate:
+            break
+        current = current.parent
+    return handlers
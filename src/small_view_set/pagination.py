@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import datetime
+import json
+from functools import reduce
+from typing import Any, Callable, TYPE_CHECKING
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from .exceptions import BadRequest
+from .responses import StreamingJsonArrayResponse
+
+if TYPE_CHECKING:
+    from urllib.request import Request
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder truncates to milliseconds, which would skip or repeat rows.
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class _CursorSerializer:
+    # signing's default JSONSerializer cannot encode datetimes, Decimals or UUIDs.
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), cls=_CursorEncoder).encode('latin-1')
+
+    def loads(self, data: bytes):
+        return json.loads(data.decode('latin-1'))
+
+
+class Page:
+    """
+    One page of a keyset-paginated queryset.
+
+    Attributes:
+        items (list): The rows on this page.
+        next_cursor (str | None): Cursor for the following page, None on the last page.
+        page_size (int): The page size that was applied.
+    """
+    __slots__ = ('items', 'next_cursor', 'page_size')
+
+    def __init__(self, items: list, next_cursor: str | None, page_size: int):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.page_size = page_size
+
+    def as_dict(self, serialize: Callable[[Any], Any] | None = None, envelope: str = 'results') -> dict:
+        """Returns `{'next': cursor, envelope: [...]}`, passing each row through `serialize` when given."""
+        items = self.items if serialize is None else [serialize(item) for item in self.items]
+        return {'next': self.next_cursor, envelope: items}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by the values of its ordering columns instead of by
+    OFFSET, so deep pages cost the same as the first one and no `COUNT(*)` is run.
+
+    The client gets an opaque, signed `next` cursor holding the last row's ordering
+    values and sends it back as `?cursor=` for the following page. Tampered
+    cursors, or cursors from a different ordering, are rejected with a 400.
+
+    Args:
+        ordering (list[str]): Columns to order by, e.g. ['-created', 'id']; directions
+            may be mixed. The columns must not be nullable, and the combination must be
+            unique: 'pk' is appended as a tiebreaker unless 'pk' or 'id' is already last.
+        page_size (int): Rows per page when the client does not ask for a size.
+        max_page_size (int): Upper bound for `?page_size=`.
+        cursor_param (str): Query parameter carrying the cursor.
+        page_size_param (str): Query parameter carrying the page size.
+        salt (str): Salt for signing cursors; give paginators of unrelated endpoints
+            different salts so their cursors cannot be swapped.
+
+    Usage:
+        ```python
+        class BarViewSet(AppViewSet):
+            paginator = KeysetPaginator(ordering=['-created', 'id'], max_page_size=200)
+
+            @endpoint(allowed_methods=['GET'])
+            def default(self, request: Request):
+                self.protect_list(request)
+                page = self.paginator.paginate(request, Bar.objects.values('id', 'name', 'created'))
+                return SmallJsonResponse(page.as_dict())
+        ```
+    """
+    def __init__(
+            self,
+            ordering: list[str],
+            page_size: int = 50,
+            max_page_size: int = 200,
+            cursor_param: str = 'cursor',
+            page_size_param: str = 'page_size',
+            salt: str = 'small_view_set.pagination'):
+        ordering = list(ordering)
+        if not ordering:
+            raise ValueError("KeysetPaginator needs at least one ordering column")
+        if ordering[-1].lstrip('-') not in ('pk', 'id'):
+            ordering.append('-pk' if ordering[-1].startswith('-') else 'pk')
+        self.ordering = tuple(ordering)
+        self.fields = tuple(column.lstrip('-') for column in ordering)
+        self.descending = tuple(column.startswith('-') for column in ordering)
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.cursor_param = cursor_param
+        self.page_size_param = page_size_param
+        self.salt = salt
+
+    def get_page_size(self, request: Request) -> int:
+        value = request.GET.get(self.page_size_param)
+        if value is None:
+            return min(self.page_size, self.max_page_size)
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise BadRequest(f'Invalid {self.page_size_param}') from None
+        if page_size < 1:
+            raise BadRequest(f'Invalid {self.page_size_param}')
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, values: list) -> str:
+        return signing.dumps([self.ordering, values], salt=self.salt, serializer=_CursorSerializer, compress=True)
+
+    def decode_cursor(self, cursor: str) -> list:
+        try:
+            ordering, values = signing.loads(cursor, salt=self.salt, serializer=_CursorSerializer)
+        except (signing.BadSignature, ValueError, TypeError):
+            raise BadRequest('Invalid cursor') from None
+        if tuple(ordering) != self.ordering or len(values) != len(self.fields):
+            raise BadRequest('Invalid cursor')
+        return values
+
+    def page_queryset(self, request: Request, queryset, page_size: int):
+        """
+        Returns `queryset` ordered, filtered to the rows after the request's cursor,
+        and sliced to `page_size + 1` rows; the extra row tells whether another page exists.
+        """
+        return self._after_cursor(request, queryset)[:page_size + 1]
+
+    def _after_cursor(self, request: Request, queryset):
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.GET.get(self.cursor_param)
+        if cursor:
+            queryset = queryset.filter(self._after(self.decode_cursor(cursor)))
+        return queryset
+
+    def _streamed_rows(self, request: Request, queryset, keys: list[tuple], page_size: int):
+        # The rows are read by a second query, so bound it by the keys the cursor came
+        # from: rows inserted or deleted in between neither push a row past the cursor
+        # nor repeat one on the next page.
+        if not keys:
+            return queryset.none()
+        last = keys[min(len(keys), page_size) - 1]
+        return self._after_cursor(request, queryset).exclude(self._after(list(last)))
+
+    def paginate(self, request: Request, queryset) -> Page:
+        page_size = self.get_page_size(request)
+        rows = list(self.page_queryset(request, queryset, page_size))
+        return self._page(rows, page_size, queryset.model._meta.pk.attname)
+
+    async def apaginate(self, request: Request, queryset) -> Page:
+        page_size = self.get_page_size(request)
+        rows = [row async for row in self.page_queryset(request, queryset, page_size)]
+        return self._page(rows, page_size, queryset.model._meta.pk.attname)
+
+    def stream(
+            self,
+            request: Request,
+            queryset,
+            endpoint_name: str,
+            serialize: Callable[[Any], Any] | None = None,
+            envelope: str = 'results',
+            chunk_size: int = 500) -> StreamingJsonArrayResponse:
+        """
+        Streams the page as `{"next": cursor, envelope: [...]}` without holding every
+        row in memory. The cursor is written first, so it comes from a keys-only
+        query; the rows up to that cursor are then read with `QuerySet.iterator()`.
+        A row inserted in between is streamed on this page, which may then hold a
+        few more than `page_size` rows.
+        """
+        page_size = self.get_page_size(request)
+        keys = list(self.page_queryset(request, queryset, page_size).values_list(*self.fields))
+        rows = self._streamed_rows(request, queryset, keys, page_size).iterator(chunk_size=chunk_size)
+        if serialize is not None:
+            rows = map(serialize, rows)
+        return StreamingJsonArrayResponse(
+            request,
+            rows,
+            endpoint_name,
+            envelope=envelope,
+            extra={'next': self._next_cursor(keys, page_size)},
+            chunk_size=chunk_size)
+
+    async def astream(
+            self,
+            request: Request,
+            queryset,
+            endpoint_name: str,
+            serialize: Callable[[Any], Any] | None = None,
+            envelope: str = 'results',
+            chunk_size: int = 500) -> StreamingJsonArrayResponse:
+        """Async variant of `stream` for async endpoints, reading rows with `QuerySet.aiterator()`."""
+        page_size = self.get_page_size(request)
+        keys = [key async for key in self.page_queryset(request, queryset, page_size).values_list(*self.fields)]
+        page_rows = self._streamed_rows(request, queryset, keys, page_size)
+
+        async def rows():
+            async for row in page_rows.aiterator(chunk_size=chunk_size):
+                yield row if serialize is None else serialize(row)
+
+        return StreamingJsonArrayResponse(
+            request,
+            rows(),
+            endpoint_name,
+            envelope=envelope,
+            extra={'next': self._next_cursor(keys, page_size)},
+            chunk_size=chunk_size)
+
+    def _page(self, rows: list, page_size: int, pk_name: str) -> Page:
+        if len(rows) <= page_size:
+            return Page(rows, None, page_size)
+        rows = rows[:page_size]
+        return Page(rows, self.encode_cursor(self._values(rows[-1], pk_name)), page_size)
+
+    def _next_cursor(self, keys: list[tuple], page_size: int) -> str | None:
+        if len(keys) <= page_size:
+            return None
+        return self.encode_cursor(list(keys[page_size - 1]))
+
+    def _values(self, row, pk_name: str) -> list:
+        if isinstance(row, dict):
+            # `.values()` rows must include the ordering columns; 'pk' is under its real name.
+            return [row[pk_name if field == 'pk' else field] for field in self.fields]
+        return [_attribute(row, field) for field in self.fields]
+
+    def _after(self, values: list) -> Q:
+        # (a, b, c) after (x, y, z) is: a > x, or a = x and b > y, or a = x and b = y and c > z,
+        # with < instead of > for descending columns.
+        conditions = []
+        for i, (field, descending) in enumerate(zip(self.fields, self.descending)):
+            lookup = f'{field}__lt' if descending else f'{field}__gt'
+            equal = {self.fields[j]: values[j] for j in range(i)}
+            conditions.append(Q(**equal, **{lookup: values[i]}))
+        return reduce(lambda left, right: left | right, conditions)
+
+
+def _attribute(row, field: str):
+    if field == 'pk':
+        return row.pk
+    for part in field.split('__'):
+        row = getattr(row, part)
+    return row
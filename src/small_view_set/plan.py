@@ -0,0 +1,167 @@
+import inspect
+
+
+# Execution policies, kept here rather than in `execution` so building a plan does
+# not import the thread pool machinery.
+INLINE = 'inline'
+POOL = 'pool'
+THREAD_SENSITIVE = 'thread_sensitive'
+EXECUTION_POLICIES = (INLINE, POOL, THREAD_SENSITIVE)
+
+DEFAULT_GROUP = 'default'
+
+
+class AllowedMethods(tuple):
+    """
+    The HTTP methods an endpoint accepts, in the order they were declared.
+
+    Behaves like the `allowed_methods` list passed to `@endpoint` so custom
+    `options_and_head_handler` callbacks keep working, but membership checks use
+    a frozenset and the `Allow` header value is joined once up front.
+
+    Attributes:
+        methods (frozenset[str]): The same methods, for O(1) membership checks.
+        header (str): The pre-joined `Allow` header value, e.g. 'GET, POST'.
+    """
+    def __new__(cls, methods):
+        instance = super().__new__(cls, methods)
+        instance.methods = frozenset(instance)
+        instance.header = ', '.join(instance)
+        return instance
+
+    def __contains__(self, method):
+        return method in self.methods
+
+
+class EndpointPlan:
+    """
+    Everything `@endpoint` needs to dispatch a request, computed once when the
+    function is decorated instead of on every request.
+
+    Attributes:
+        func: The decorated viewset method.
+        func_name (str): Name passed to the exception handler.
+        key (str): Qualified name, e.g. 'api.views.bar.BarViewSet.export', that caches
+            and the `KillSwitch` know the endpoint by.
+        disabled (bool): Whether `func` was marked with `@endpoint_disabled`.
+        allowed_methods (AllowedMethods): Declared methods with a pre-joined `Allow` header.
+        is_async (bool): Whether `func` is a coroutine function.
+        strips_none_pk (bool): Whether a `pk=None` kwarg must be dropped before calling
+            `func`. Only needed when `func` cannot accept a `pk` keyword at all.
+        etag: Callable returning the current ETag for conditional GETs, or None.
+        last_modified: Callable returning the last-modified time for conditional GETs, or None.
+        auto_etag (bool): Whether to hash an ETag from the response body when none was given.
+        cache (EndpointCache | None): Cache for GET responses, or None.
+        coalesce (bool | Callable): Whether concurrent identical GETs share one run, or
+            the function computing their key.
+        execution (str): Where a sync `func` runs: 'inline', 'pool' or 'thread_sensitive'.
+        executor_group (str): Name of the `ExecutorGroup` used by the 'pool' policy.
+        compression (Compression | None): How responses are compressed, or None.
+        protect (str | None): Action whose `protect_<action>`/`aprotect_<action>` runs
+            before validators and cache hits, or None.
+        timeout (float | bool | None): Seconds the endpoint may run, False for no
+            limit, or None for the config's `default_timeout`.
+        cancel_on_disconnect (bool | None): Whether a client disconnect cancels the
+            endpoint, or None for the config's default.
+        timed (bool): Whether requests take the instrumented code path. Kept in step
+            with `SmallViewSetConfig.instrumentation_hooks` each time the config is resolved.
+    """
+    __slots__ = (
+        'func',
+        'func_name',
+        'key',
+        'disabled',
+        'allowed_methods',
+        'is_async',
+        'strips_none_pk',
+        'etag',
+        'last_modified',
+        'auto_etag',
+        'cache',
+        'coalesce',
+        'execution',
+        'executor_group',
+        'compression',
+        'protect',
+        'timeout',
+        'cancel_on_disconnect',
+        'timed',
+        '__weakref__',
+    )
+
+    def __init__(
+            self,
+            func,
+            allowed_methods,
+            etag=None,
+            last_modified=None,
+            auto_etag=False,
+            cache=None,
+            coalesce=False,
+            execution=INLINE,
+            executor_group=DEFAULT_GROUP,
+            compress=False,
+            protect=None,
+            timeout=None,
+            cancel_on_disconnect=None):
+        # `@endpoint_disabled` below `@endpoint` is folded into the plan instead of
+        # adding its own call frame.
+        disabled_func = getattr(func, '_small_view_set_disabled', None)
+        if disabled_func is not None:
+            func = disabled_func
+        self.func = func
+        self.func_name = func.__name__
+        self.key = f'{func.__module__}.{func.__qualname__}'
+        self.disabled = disabled_func is not None
+        self.allowed_methods = AllowedMethods(allowed_methods)
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.strips_none_pk = not _accepts_keyword(func, 'pk')
+        self.etag = etag
+        self.last_modified = last_modified
+        self.auto_etag = auto_etag
+        self.cache = cache
+        self.coalesce = coalesce
+        if execution not in EXECUTION_POLICIES:
+            raise ValueError(f"Unknown execution policy {execution!r}, expected one of {EXECUTION_POLICIES}")
+        if execution != INLINE and self.is_async:
+            raise ValueError(
+                f"execution={execution!r} only applies to sync endpoints, {self.func_name} is async; "
+                "use run_sync() for the sync calls inside it")
+        self.execution = execution
+        self.executor_group = executor_group
+        if compress is True:
+            from .compression import Compression
+            compress = Compression()
+        self.compression = compress or None
+        self.protect = protect
+        if coalesce and not self.wrapper_is_async:
+            raise ValueError(f"coalesce is only supported on async endpoints, {self.func_name} is sync")
+        if timeout and not self.wrapper_is_async:
+            raise ValueError(f"timeout is only supported on async endpoints, {self.func_name} is sync")
+        if timeout is not None and timeout is not False and timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {timeout!r}")
+        self.timeout = timeout
+        self.cancel_on_disconnect = cancel_on_disconnect
+        self.timed = False
+
+    @property
+    def wrapper_is_async(self) -> bool:
+        """Whether the endpoint is served by an async wrapper: async functions, and sync ones run off-thread."""
+        return self.is_async or self.execution != INLINE
+
+    @property
+    def conditional(self) -> bool:
+        return bool(self.etag or self.last_modified or self.auto_etag)
+
+
+def _accepts_keyword(func, name: str) -> bool:
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    for parameter in parameters:
+        if parameter.kind == inspect.Parameter.VAR_KEYWORD:
+            return True
+        if parameter.name == name and parameter.kind != inspect.Parameter.POSITIONAL_ONLY:
+            return True
+    return False
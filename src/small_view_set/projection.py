@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .exceptions import BadRequest
+
+if TYPE_CHECKING:
+    from urllib.request import Request
+
+
+class Projection:
+    """
+    The fields a request asked for, parsed by `FieldSet.parse`.
+
+    Attributes:
+        fields (tuple[str, ...]): Selected fields, in the order the `FieldSet` declares them.
+        includes (dict[str, Projection]): Projections of the included relations.
+    """
+    __slots__ = ('fields', 'includes')
+
+    def __init__(self, fields: tuple[str, ...], includes: dict[str, 'Projection']):
+        self.fields = fields
+        self.includes = includes
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.fields or name in self.includes
+
+    def paths(self, prefix: str = '') -> list[str]:
+        """Field lookups for `.only()`/`.values()`, e.g. ['id', 'name', 'owner__name']."""
+        paths = [prefix + field for field in self.fields]
+        for relation, projection in self.includes.items():
+            paths.extend(projection.paths(f'{prefix}{relation}__'))
+        return paths
+
+    def relations(self, prefix: str = '') -> list[str]:
+        """Lookups of the included relations for `.select_related()`, e.g. ['owner', 'owner__team']."""
+        relations = []
+        for relation, projection in self.includes.items():
+            relations.append(prefix + relation)
+            relations.extend(projection.relations(f'{prefix}{relation}__'))
+        return relations
+
+    def apply(self, queryset, *required: str):
+        """
+        Returns `queryset` loading only the selected columns, joined to the included
+        relations. `required` names extra columns the handler needs without sending
+        them, e.g. a paginator's ordering columns.
+        """
+        relations = self.relations()
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*self.paths(), *required)
+
+    def values(self, queryset, *required: str):
+        """Like `apply`, but returns `.values()` rows keyed by lookup, e.g. 'owner__name'."""
+        return queryset.values(*self.paths(), *required)
+
+    def project(self, row, prefix: str = '') -> dict | None:
+        """
+        Returns the selected keys of `row`, with included relations nested under their
+        name. `row` may be a model instance, a `.values()` row or an already serialized
+        dict. A null relation on a model instance is None.
+        """
+        if row is None:
+            return None
+        if isinstance(row, dict):
+            data = {field: row[prefix + field] for field in self.fields}
+            for relation, projection in self.includes.items():
+                nested = row.get(prefix + relation)
+                if isinstance(nested, dict):
+                    data[relation] = projection.project(nested)
+                else:
+                    data[relation] = projection.project(row, f'{prefix}{relation}__')
+            return data
+        data = {field: getattr(row, field) for field in self.fields}
+        for relation, projection in self.includes.items():
+            data[relation] = projection.project(getattr(row, relation))
+        return data
+
+
+class FieldSet:
+    """
+    The fields and relations clients may select with `?fields=` and `?include=`,
+    declared on a viewset so handlers can load and send only what was asked for.
+
+    `?fields=id,name` selects top-level fields; a dotted name like `owner.name`
+    selects a field of a relation and includes that relation. `?include=owner`
+    includes a relation with its default fields, and `owner.team` includes a
+    nested one. Names outside the allowlist are rejected with a 400.
+
+    Args:
+        fields (list[str]): Model fields clients may select.
+        default (list[str] | None): Fields sent when the request does not select
+            any. None sends every field in `fields`.
+        relations (dict[str, FieldSet] | None): Forward foreign key or one-to-one
+            relations clients may include, each with its own `FieldSet`.
+        fields_param (str): Query parameter carrying the fields.
+        include_param (str): Query parameter carrying the relations.
+
+    Usage:
+        ```python
+        class BarViewSet(AppViewSet):
+            fieldset = FieldSet(
+                fields=['id', 'name', 'created', 'description'],
+                default=['id', 'name'],
+                relations={'owner': FieldSet(fields=['id', 'username'])})
+
+            @endpoint(allowed_methods=['GET'])
+            def default(self, request: Request):
+                self.protect_list(request)
+                projection = self.fieldset.parse(request)
+                bars = projection.apply(Bar.objects.all())
+                return SmallJsonResponse({'results': [projection.project(bar) for bar in bars]})
+        ```
+    """
+    def __init__(
+            self,
+            fields: list[str],
+            default: list[str] | None = None,
+            relations: dict[str, 'FieldSet'] | None = None,
+            fields_param: str = 'fields',
+            include_param: str = 'include'):
+        self.fields = tuple(fields)
+        self.relations = dict(relations or {})
+        self.fields_param = fields_param
+        self.include_param = include_param
+        unknown = [field for field in (default or ()) if field not in self.fields]
+        if unknown:
+            raise ValueError(f"FieldSet default has fields that are not allowed: {unknown}")
+        self.default = self.fields if default is None else tuple(field for field in self.fields if field in default)
+        clashes = [name for name in self.relations if name in self.fields]
+        if clashes:
+            raise ValueError(f"FieldSet names are both fields and relations: {clashes}")
+        self._default_projection = self._build({}, set(), '')
+
+    def parse(self, request: Request) -> Projection:
+        """
+        Returns the `Projection` for the request's `?fields=` and `?include=`.
+
+        The result is memoized on the request, so calling this again, e.g. from a
+        serializer helper, does not parse the query string twice.
+        """
+        projections = getattr(request, '_small_view_set_projections', None)
+        if projections is None:
+            projections = request._small_view_set_projections = {}
+        projection = projections.get(self)
+        if projection is None:
+            projection = projections[self] = self.parse_params(
+                _split(request.GET.getlist(self.fields_param)),
+                _split(request.GET.getlist(self.include_param)))
+        return projection
+
+    def parse_params(self, fields: list[str], includes: list[str]) -> Projection:
+        """
+        Returns the `Projection` for already split `fields` and `includes` names,
+        raising `BadRequest` for names outside the allowlist.
+        """
+        if not fields and not includes:
+            return self._default_projection
+        selected: dict[str, list[str]] = {}
+        included: set[str] = set()
+        for name in fields:
+            path, _, field = name.rpartition('.')
+            fieldset = self._relation(path)
+            if fieldset is not None and field in fieldset.relations:
+                _include(included, name)
+            elif fieldset is not None and field in fieldset.fields:
+                selected.setdefault(path, []).append(field)
+                _include(included, path)
+            else:
+                raise BadRequest(f"Unknown field '{name}'")
+        for path in includes:
+            if not path or self._relation(path) is None:
+                raise BadRequest(f"Unknown include '{path}'")
+            _include(included, path)
+        return self._build(selected, included, '')
+
+    def _relation(self, path: str) -> 'FieldSet | None':
+        fieldset = self
+        for name in path.split('.') if path else ():
+            fieldset = fieldset.relations.get(name)
+            if fieldset is None:
+                return None
+        return fieldset
+
+    def _build(self, selected: dict[str, list[str]], included: set[str], path: str) -> Projection:
+        requested = selected.get(path)
+        if requested:
+            fields = tuple(field for field in self.fields if field in requested)
+        else:
+            fields = self.default
+        includes = {}
+        for name, fieldset in self.relations.items():
+            relation_path = f'{path}.{name}' if path else name
+            if relation_path in included:
+                includes[name] = fieldset._build(selected, included, relation_path)
+        return Projection(fields, includes)
+
+
+def _include(included: set[str], path: str):
+    # Including 'owner.team' includes 'owner' too.
+    while path:
+        included.add(path)
+        path = path.rpartition('.')[0]
+
+
+def _split(values: list[str]) -> list[str]:
+    return [name.strip() for value in values for name in value.split(',') if name.strip()]
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+
+from . import config as _config
+
+if TYPE_CHECKING:
+    from urllib.request import Request
+
+
+def _is_asgi(request) -> bool:
+    # Importing the ASGI handler costs more than the rest of the package; if it was
+    # never imported, no request came through it.
+    asgi = sys.modules.get('django.core.handlers.asgi')
+    return asgi is not None and isinstance(request, asgi.ASGIRequest)
+
+
+class ResponseTemplate:
+    """
+    A prebuilt response that is cheap to copy.
+
+    The body is already encoded and the headers already validated, so `clone()`
+    only allocates a new `HttpResponse`; no JSON encoding happens per request.
+    Each clone is a separate object, so middleware may modify it freely.
+    """
+    __slots__ = ('content', 'status', 'headers')
+
+    def __init__(self, content: bytes, status: int = 200, headers: dict | None = None):
+        self.content = content
+        self.status = status
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+
+    def clone(self) -> HttpResponse:
+        return HttpResponse(self.content, status=self.status, headers=self.headers)
+
+
+class SmallJsonResponse(HttpResponse):
+    """
+    A drop-in replacement for `JsonResponse` whose body is encoded with the encoder
+    selected by `SmallViewSetConfig(json_encoder=...)`.
+
+    Args:
+        data: Data to encode. Must be a dict unless `safe` is False.
+        safe (bool): Mirrors `JsonResponse`; guards against encoding non-dict data
+            by accident.
+        **kwargs: Passed on to `HttpResponse`, e.g. `status`.
+    """
+    def __init__(self, data, safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False.")
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=_config.get_config().json_dumps(data), **kwargs)
+
+
+class StreamingJsonArrayResponse(StreamingHttpResponse):
+    """
+    Streams a JSON array item by item instead of building the whole payload in
+    memory, e.g. for export endpoints over large querysets.
+
+    `items` may be a sync iterable (such as `QuerySet.iterator()`) or an async
+    iterable (such as an async generator or `QuerySet.aiterator()`). Items are
+    encoded with the configured JSON encoder and sent `chunk_size` items at a time.
+    Under ASGI a sync source is pulled through `sync_to_async` one chunk at a time,
+    and under WSGI an async source is driven by a private event loop one chunk at
+    a time, so memory stays constant either way.
+
+    The status line has already been sent by the time an item fails, so an
+    exception raised mid-stream is passed to `config.exception_handler` (which
+    logs it) and the stream ends without the closing bracket. Clients see
+    invalid JSON rather than a silently truncated array.
+
+    Args:
+        request (Request): The current request.
+        items: Sync or async iterable of JSON-serializable items.
+        endpoint_name (str): Name passed to the exception handler, e.g. 'list'.
+        envelope (str | None): When set, the array is wrapped in an object under this
+            key, e.g. 'results' gives `{"results": [...]}`.
+        extra (dict | None): Additional keys written before the array when `envelope`
+            is set, e.g. `{'count': 10}`.
+        chunk_size (int): Number of items encoded per chunk.
+        **kwargs: Passed on to `StreamingHttpResponse`, e.g. `status`.
+
+    Usage:
+        ```python
+        def list(self, request: Request):
+            self.protect_list(request)
+            rows = Bar.objects.values('id', 'name').iterator(chunk_size=2000)
+            return StreamingJsonArrayResponse(request, rows, 'list', envelope='results')
+        ```
+    """
+    def __init__(
+            self,
+            request: Request,
+            items,
+            endpoint_name: str,
+            envelope: str | None = None,
+            extra: dict | None = None,
+            chunk_size: int = 500,
+            **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        self.request = request
+        self.endpoint_name = endpoint_name
+        self.chunk_size = chunk_size
+        self._json_dumps = _config.get_config().json_dumps
+        self._head, self._tail = self._envelope_bytes(envelope, extra)
+
+        is_async_source = hasattr(items, '__aiter__')
+        if _is_asgi(request):
+            source = items if is_async_source else _sync_chunks_to_async(items, chunk_size)
+            content = self._stream_async(source, chunked=not is_async_source)
+        else:
+            source = _async_chunks_to_sync(items, chunk_size) if is_async_source else items
+            content = self._stream_sync(source, chunked=is_async_source)
+        super().__init__(content, **kwargs)
+
+    def _envelope_bytes(self, envelope: str | None, extra: dict | None) -> tuple[bytes, bytes]:
+        if envelope is None:
+            return b'[', b']'
+        head = b'{'
+        if extra:
+            head += self._json_dumps(extra)[1:-1] + b','
+        return head + self._json_dumps(envelope) + b':[', b']}'
+
+    def _on_error(self, exception: Exception):
+        _config.get_config().exception_handler(self.request, self.endpoint_name, exception)
+
+    # `chunked` sources yield lists of items, as produced by the sync/async bridges below.
+    def _stream_sync(self, source, chunked: bool):
+        dumps = self._json_dumps
+        separator = b''
+        yield self._head
+        try:
+            if chunked:
+                for chunk in source:
+                    yield separator + b','.join(map(dumps, chunk))
+                    separator = b','
+            else:
+                buffer = []
+                for item in source:
+                    buffer.append(dumps(item))
+                    if len(buffer) >= self.chunk_size:
+                        yield separator + b','.join(buffer)
+                        separator = b','
+                        buffer = []
+                if buffer:
+                    yield separator + b','.join(buffer)
+        except Exception as e:
+            self._on_error(e)
+            return
+        yield self._tail
+
+    async def _stream_async(self, source, chunked: bool):
+        dumps = self._json_dumps
+        separator = b''
+        yield self._head
+        try:
+            if chunked:
+                async for chunk in source:
+                    yield separator + b','.join(map(dumps, chunk))
+                    separator = b','
+            else:
+                buffer = []
+                async for item in source:
+                    buffer.append(dumps(item))
+                    if len(buffer) >= self.chunk_size:
+                        yield separator + b','.join(buffer)
+                        separator = b','
+                        buffer = []
+                if buffer:
+                    yield separator + b','.join(buffer)
+        except Exception as e:
+            self._on_error(e)
+            return
+        yield self._tail
+
+
+def _next_chunk(iterator, chunk_size: int) -> list:
+    chunk = []
+    for item in iterator:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            break
+    return chunk
+
+
+async def _sync_chunks_to_async(items, chunk_size: int):
+    # thread_sensitive keeps database cursors on the thread Django uses for sync code.
+    next_chunk = sync_to_async(_next_chunk, thread_sensitive=True)
+    iterator = await sync_to_async(iter, thread_sensitive=True)(items)
+    while True:
+        chunk = await next_chunk(iterator, chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _async_chunks_to_sync(items, chunk_size: int):
+    # A single private event loop drives the async source for the whole response.
+    # async_to_sync would run each chunk in a fresh loop whose shutdown closes
+    # the async generator after the first chunk.
+    iterator = items.__aiter__()
+    loop = asyncio.new_event_loop()
+
+    async def next_chunk():
+        chunk = []
+        while len(chunk) < chunk_size:
+            try:
+                chunk.append(await iterator.__anext__())
+            except StopAsyncIteration:
+                break
+        return chunk
+
+    try:
+        while True:
+            chunk = loop.run_until_complete(next_chunk())
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
@@ -0,0 +1,148 @@
+from django.urls import URLPattern, URLResolver
+from django.urls.exceptions import Resolver404
+from django.urls.resolvers import ResolverMatch, RoutePattern
+
+
+class _Node:
+    __slots__ = ('children', 'patterns')
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.patterns: list[tuple[int, object]] = []
+
+
+class RouteIndex:
+    """
+    Finds the URL patterns that could match a path without trying every one.
+
+    Routes without converters, like 'api/bars/', go in a hash table keyed by the
+    full route. Other `path()` routes go in a trie keyed by the literal segments
+    before their first converter, so 'api/bars/<int:pk>/' is only tried for paths
+    starting with 'api/bars/'. `re_path()` entries and nested resolvers are kept
+    at the root and tried for every path. Candidates come back in declaration
+    order, so the first match is the one Django's linear scan would pick.
+    """
+    def __init__(self, patterns: list):
+        self.static: dict[str, list[tuple[int, object]]] = {}
+        self.root = _Node()
+        for order, pattern in enumerate(patterns):
+            route = _route(pattern)
+            if route is None:
+                self.root.patterns.append((order, pattern))
+            elif '<' not in route:
+                self.static.setdefault(route, []).append((order, pattern))
+            else:
+                node = self.root
+                for segment in route[:route.index('<')].split('/')[:-1]:
+                    node = node.children.setdefault(segment, _Node())
+                node.patterns.append((order, pattern))
+
+    def candidates(self, path: str) -> list:
+        found = list(self.static.get(path, ()))
+        node = self.root
+        found.extend(node.patterns)
+        for segment in path.split('/')[:-1]:
+            node = node.children.get(segment)
+            if node is None:
+                break
+            found.extend(node.patterns)
+        found.sort(key=_order)
+        return [pattern for _, pattern in found]
+
+
+def _order(item: tuple[int, object]) -> int:
+    return item[0]
+
+
+def _route(pattern) -> str | None:
+    """Returns the route of a `path()` endpoint, or None when it must be tried for every path."""
+    if isinstance(pattern, URLPattern) and isinstance(pattern.pattern, RoutePattern):
+        return str(pattern.pattern)
+    return None
+
+
+class CompiledURLResolver(URLResolver):
+    """
+    A `URLResolver` for a flat list of URL patterns that resolves through a
+    `RouteIndex` instead of a linear scan. Reversing is left to Django, so
+    `reverse()` gives the same URLs as it would for the plain list.
+    """
+    def __init__(self, patterns: list, route: str = ''):
+        super().__init__(RoutePattern(route, is_endpoint=False), list(patterns))
+        self.index = RouteIndex(self.url_patterns)
+
+    def resolve(self, path):
+        path = str(path)  # path may be a reverse_lazy object
+        match = self.pattern.match(path)
+        if not match:
+            raise Resolver404({'path': path})
+        new_path, args, kwargs = match
+        tried = []
+        for pattern in self.index.candidates(new_path):
+            try:
+                sub_match = pattern.resolve(new_path)
+            except Resolver404 as e:
+                self._extend_tried(tried, pattern, e.args[0].get('tried'))
+                continue
+            if not sub_match:
+                tried.append([pattern])
+                continue
+            sub_match_dict = {**kwargs, **self.default_kwargs, **sub_match.kwargs}
+            sub_match_args = sub_match.args if sub_match_dict else args + sub_match.args
+            current_route = '' if isinstance(pattern, URLPattern) else str(pattern.pattern)
+            self._extend_tried(tried, pattern, sub_match.tried)
+            return ResolverMatch(
+                sub_match.func,
+                sub_match_args,
+                sub_match_dict,
+                sub_match.url_name,
+                [self.app_name] + sub_match.app_names,
+                [self.namespace] + sub_match.namespaces,
+                self._join_route(current_route, sub_match.route),
+                tried,
+                captured_kwargs=sub_match.captured_kwargs,
+                extra_kwargs={**self.default_kwargs, **sub_match.extra_kwargs})
+        raise Resolver404({'tried': tried, 'path': new_path})
+
+
+class SmallViewSetRouter:
+    """
+    Collects the `urlpatterns()` of every registered viewset into one
+    `CompiledURLResolver`, so resolving a request costs a hash lookup and a short
+    trie walk however many viewsets there are.
+
+    Usage:
+        ```python
+        router = SmallViewSetRouter()
+        router.register(BarViewSet)
+        router.register(FooViewSet())
+
+        urlpatterns = [
+            path('admin/', admin.site.urls),
+            *router.urls,
+        ]
+        ```
+    """
+    def __init__(self):
+        self.patterns: list = []
+        self._urls: list | None = None
+
+    def register(self, viewset):
+        """Adds the `urlpatterns()` of `viewset`, a `SmallViewSet` class or instance."""
+        if isinstance(viewset, type):
+            viewset = viewset()
+        self.extend(viewset.urlpatterns())
+        return viewset
+
+    def extend(self, patterns: list):
+        """Adds plain `path()`/`re_path()` entries, e.g. views that are not viewsets."""
+        if self._urls is not None:
+            raise RuntimeError("Routes cannot be added after SmallViewSetRouter.urls was built")
+        self.patterns.extend(patterns)
+
+    @property
+    def urls(self) -> list:
+        """The entries to splice into `urlpatterns`, built once on first access."""
+        if self._urls is None:
+            self._urls = [CompiledURLResolver(self.patterns)]
+        return self._urls
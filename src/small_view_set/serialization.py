@@ -0,0 +1,125 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+JSON_BACKENDS = ('json', 'orjson', 'msgspec', 'auto')
+
+
+def _stdlib_loads() -> Callable[[bytes], Any]:
+    return json.loads
+
+
+def _orjson_loads() -> Callable[[bytes], Any]:
+    import orjson
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the default
+    # exception handler still answers 400 "Invalid JSON".
+    return orjson.loads
+
+
+def _msgspec_loads() -> Callable[[bytes], Any]:
+    import msgspec
+    decode = msgspec.json.decode
+
+    def loads(body: bytes):
+        try:
+            return decode(body)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), '', 0) from e
+
+    return loads
+
+
+_LOADS_FACTORIES = {
+    'json': _stdlib_loads,
+    'orjson': _orjson_loads,
+    'msgspec': _msgspec_loads,
+}
+
+
+def resolve_json_loads(decoder: str | Callable[[bytes], Any] = 'json') -> Callable[[bytes], Any]:
+    """
+    Returns the function used to decode request bodies.
+
+    Args:
+        decoder (str | Callable[[bytes], Any]): 'json' for the standard library,
+            'orjson' or 'msgspec' to use those packages when installed, 'auto' to
+            pick the fastest one installed, or any callable taking the raw body.
+            Named backends that are not installed fall back to the standard library.
+            Custom callables should raise `json.JSONDecodeError` on invalid input.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend {decoder!r}, expected one of {JSON_BACKENDS}")
+    names = ('orjson', 'msgspec', 'json') if decoder == 'auto' else (decoder, 'json')
+    for name in names:
+        try:
+            return _LOADS_FACTORIES[name]()
+        except ImportError:
+            continue
+
+
+def stdlib_json_dumps(data) -> bytes:
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def _stdlib_dumps_factory() -> Callable[[Any], bytes]:
+    return stdlib_json_dumps
+
+
+def _orjson_dumps_factory() -> Callable[[Any], bytes]:
+    import orjson
+    default = DjangoJSONEncoder().default
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(data) -> bytes:
+        # orjson handles datetime, date, time and UUID natively; Decimal, timedelta
+        # and lazy translation strings go through DjangoJSONEncoder.default.
+        return orjson.dumps(data, default=default, option=option)
+
+    return dumps
+
+
+def _msgspec_dumps_factory() -> Callable[[Any], bytes]:
+    import msgspec
+    encoder = msgspec.json.Encoder(enc_hook=DjangoJSONEncoder().default)
+    return encoder.encode
+
+
+_DUMPS_FACTORIES = {
+    'json': _stdlib_dumps_factory,
+    'orjson': _orjson_dumps_factory,
+    'msgspec': _msgspec_dumps_factory,
+}
+
+
+@lru_cache(maxsize=None)
+def _named_json_dumps(encoder: str) -> Callable[[Any], bytes]:
+    names = ('orjson', 'msgspec', 'json') if encoder == 'auto' else (encoder, 'json')
+    for name in names:
+        try:
+            return _DUMPS_FACTORIES[name]()
+        except ImportError:
+            continue
+
+
+def resolve_json_dumps(encoder: str | Callable[[Any], bytes] = 'json') -> Callable[[Any], bytes]:
+    """
+    Returns the function used to encode `SmallJsonResponse` bodies.
+
+    Args:
+        encoder (str | Callable[[Any], bytes]): 'json' for the standard library with
+            `DjangoJSONEncoder` (the same output as `JsonResponse`), 'orjson' or
+            'msgspec' to use those packages when installed, 'auto' to pick the fastest
+            one installed, or any callable returning the encoded bytes. Named backends
+            that are not installed fall back to the standard library. All named
+            backends support datetime, UUID and Decimal values.
+    """
+    if callable(encoder):
+        return encoder
+    if encoder not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend {encoder!r}, expected one of {JSON_BACKENDS}")
+    return _named_json_dumps(encoder)
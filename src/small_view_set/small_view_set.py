@@ -1,16 +1,169 @@
-import json
+from __future__ import annotations
+
+import asyncio
+import inspect
 import logging
-from urllib.request import Request
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
 
+from .config import get_config
 from .exceptions import BadRequest
 
+if TYPE_CHECKING:
+    from urllib.request import Request
+
 logger = logging.getLogger('app')
 
+_MISSING = object()
+
+
 class SmallViewSet:
+    """
+    Base class for viewsets.
+
+    Attributes:
+        protections (dict[str, list[str]]): Check methods to run for each action,
+            e.g. `{'create': ['require_logged_in', 'require_email_verified']}`. Each
+            check takes the request and raises to reject it; it may be `async`.
+            Declarations are merged across the class hierarchy and duplicates are
+            dropped, and `protect_<action>`/`aprotect_<action>` run them. Each check
+            runs at most once per request, however many protect methods call it.
+    """
+    protections: dict[str, list[str]] = {}
+    _protections: dict[str, tuple[str, ...]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._protections = _merge_protections(cls)
+
     def parse_json_body(self, request: Request):
+        """
+        Decodes the JSON request body with the decoder set on `SmallViewSetConfig`.
+
+        The result is memoized on the request, so helpers can call this repeatedly
+        without decoding the body again. Bodies larger than
+        `SmallViewSetConfig.max_json_body_size` raise `BadRequest` before decoding.
+        """
+        data = getattr(request, '_small_view_set_json_body', _MISSING)
+        if data is not _MISSING:
+            return data
+
         if request.content_type != 'application/json':
             raise BadRequest('Invalid content type')
-        return json.loads(request.body)
+
+        config = get_config()
+        max_size = config.max_json_body_size
+        if max_size is not None:
+            try:
+                content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                content_length = 0
+            if content_length > max_size:
+                raise BadRequest('Request body too large')
+            body = request.body
+            if len(body) > max_size:
+                raise BadRequest('Request body too large')
+        else:
+            body = request.body
+
+        data = config.json_loads(body)
+        request._small_view_set_json_body = data
+        return data
+
+    def check(self, request: Request, name: str):
+        """
+        Runs the check method `name`, e.g. 'require_logged_in', at most once per request.
+
+        The outcome is memoized on the request: later calls return immediately, or
+        re-raise the exception the check raised the first time. Async checks cannot
+        run here and raise `TypeError`; use `acheck` or the `aprotect_*` methods.
+        """
+        outcomes = _request_check_outcomes(request)
+        outcome = outcomes.get(name, _MISSING)
+        if outcome is _MISSING:
+            method = getattr(self, name)
+            if inspect.iscoroutinefunction(method):
+                raise TypeError(f"Check {name!r} is async; run it with acheck() or an aprotect_* method")
+            try:
+                result = method(request)
+            except Exception as e:
+                outcomes[name] = e
+                raise
+            if inspect.isawaitable(result):
+                if inspect.iscoroutine(result):
+                    result.close()
+                raise TypeError(f"Check {name!r} returned an awaitable; run it with acheck() or an aprotect_* method")
+            outcomes[name] = None
+        elif isinstance(outcome, asyncio.Future):
+            # Started by acheck(); only a finished run can be replayed here.
+            if not outcome.done():
+                raise TypeError(f"Check {name!r} is still running in async code")
+            outcome.result()
+        elif outcome is not None:
+            raise outcome
+
+    async def acheck(self, request: Request, name: str):
+        """
+        Async variant of `check`. Works for both sync and async check methods;
+        concurrent callers for the same request share one run of an async check.
+        Sync checks run through `sync_to_async(thread_sensitive=True)`, since they
+        typically read `request.user` or the ORM, which Django forbids on the event loop.
+        """
+        outcomes = _request_check_outcomes(request)
+        outcome = outcomes.get(name, _MISSING)
+        if outcome is _MISSING:
+            method = getattr(self, name)
+            if not inspect.iscoroutinefunction(method):
+                return await sync_to_async(self.check, thread_sensitive=True)(request, name)
+            outcome = outcomes[name] = asyncio.ensure_future(method(request))
+        if isinstance(outcome, asyncio.Future):
+            await outcome
+        elif outcome is not None:
+            raise outcome
+
+    def run_protections(self, action: str, request: Request):
+        """
+        Runs every check declared for `action` in `protections`, in order.
+        """
+        self._run_checks(request, self._protections.get(action, ()))
+
+    def _run_checks(self, request: Request, names):
+        for name in names:
+            self.check(request, name)
+
+    async def arun_protections(self, action: str, request: Request):
+        """
+        Runs every check declared for `action` in `protections`. Sync checks run
+        first, in order, together in one `sync_to_async(thread_sensitive=True)` call
+        unless they have all run for this request already; async checks then run
+        concurrently with `asyncio.gather`. If several fail, the first failing check
+        in declaration order is raised.
+        """
+        names = self._protections.get(action)
+        if not names:
+            return
+        sync_names = []
+        async_names = []
+        for name in names:
+            if inspect.iscoroutinefunction(getattr(self, name)):
+                async_names.append(name)
+            else:
+                sync_names.append(name)
+        if sync_names:
+            outcomes = _request_check_outcomes(request)
+            if all(name in outcomes for name in sync_names):
+                # Only memoized outcomes to replay; no need to leave the loop.
+                self._run_checks(request, sync_names)
+            else:
+                await sync_to_async(self._run_checks, thread_sensitive=True)(request, sync_names)
+        if async_names:
+            results = await asyncio.gather(
+                *(self.acheck(request, name) for name in async_names),
+                return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
 
     def protect_create(self, request: Request):
         """
@@ -20,10 +173,12 @@ class SmallViewSet:
         - Check if the user has validated their email
         - Throttle requests
 
+        Runs the checks declared for 'create' in `protections`.
+
         Recommended to call super().protect_create(request) in the subclass in case
         this library adds logic in the future.
         """
-        pass
+        self.run_protections('create', request)
 
     def protect_list(self, request: Request):
         """
@@ -33,10 +188,12 @@ class SmallViewSet:
         - Check if the user has validated their email
         - Throttle requests
 
-        Recommended to call super().protect_create(request) in the subclass in case
+        Runs the checks declared for 'list' in `protections`.
+
+        Recommended to call super().protect_list(request) in the subclass in case
         this library adds logic in the future.
         """
-        pass
+        self.run_protections('list', request)
 
     def protect_retrieve(self, request: Request):
         """
@@ -46,10 +203,12 @@ class SmallViewSet:
         - Check if the user has validated their email
         - Throttle requests
 
-        Recommended to call super().protect_create(request) in the subclass in case
+        Runs the checks declared for 'retrieve' in `protections`.
+
+        Recommended to call super().protect_retrieve(request) in the subclass in case
         this library adds logic in the future.
         """
-        pass
+        self.run_protections('retrieve', request)
 
     def protect_update(self, request: Request):
         """
@@ -59,10 +218,12 @@ class SmallViewSet:
         - Check if the user has validated their email
         - Throttle requests
 
-        Recommended to call super().protect_create(request) in the subclass in case
+        Runs the checks declared for 'update' in `protections`.
+
+        Recommended to call super().protect_update(request) in the subclass in case
         this library adds logic in the future.
         """
-        pass
+        self.run_protections('update', request)
 
     def protect_delete(self, request: Request):
         """
@@ -72,7 +233,62 @@ class SmallViewSet:
         - Check if the user has validated their email
         - Throttle requests
 
-        Recommended to call super().protect_create(request) in the subclass in case
+        Runs the checks declared for 'delete' in `protections`.
+
+        Recommended to call super().protect_delete(request) in the subclass in case
         this library adds logic in the future.
         """
-        pass
+        self.run_protections('delete', request)
+
+    async def aprotect_create(self, request: Request):
+        """
+        Async variant of `protect_create` for async endpoints. Async checks declared
+        for 'create' run concurrently.
+        """
+        await self.arun_protections('create', request)
+
+    async def aprotect_list(self, request: Request):
+        """
+        Async variant of `protect_list` for async endpoints. Async checks declared
+        for 'list' run concurrently.
+        """
+        await self.arun_protections('list', request)
+
+    async def aprotect_retrieve(self, request: Request):
+        """
+        Async variant of `protect_retrieve` for async endpoints. Async checks declared
+        for 'retrieve' run concurrently.
+        """
+        await self.arun_protections('retrieve', request)
+
+    async def aprotect_update(self, request: Request):
+        """
+        Async variant of `protect_update` for async endpoints. Async checks declared
+        for 'update' run concurrently.
+        """
+        await self.arun_protections('update', request)
+
+    async def aprotect_delete(self, request: Request):
+        """
+        Async variant of `protect_delete` for async endpoints. Async checks declared
+        for 'delete' run concurrently.
+        """
+        await self.arun_protections('delete', request)
+
+
+def _request_check_outcomes(request: Request) -> dict:
+    outcomes = getattr(request, '_small_view_set_checks', None)
+    if outcomes is None:
+        outcomes = request._small_view_set_checks = {}
+    return outcomes
+
+
+def _merge_protections(cls) -> dict[str, tuple[str, ...]]:
+    merged: dict[str, list[str]] = {}
+    for klass in reversed(cls.__mro__):
+        for action, names in vars(klass).get('protections', {}).items():
+            action_names = merged.setdefault(action, [])
+            for name in names:
+                if name not in action_names:
+                    action_names.append(name)
+    return {action: tuple(names) for action, names in merged.items()}
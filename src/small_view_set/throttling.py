@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.utils.functional import empty
+
+from .exceptions import Throttled
+
+if TYPE_CHECKING:
+    from urllib.request import Request
+
+
+TOKEN_BUCKET = 'token_bucket'
+SLIDING_WINDOW = 'sliding_window'
+
+_PERIODS = {
+    's': 1, 'sec': 1, 'second': 1,
+    'm': 60, 'min': 60, 'minute': 60,
+    'h': 3600, 'hour': 3600,
+    'd': 86400, 'day': 86400,
+}
+
+
+def parse_rate(rate: str) -> tuple[int, float]:
+    """
+    Parses a rate such as '100/min', '10/s' or '1000/hour' into
+    `(number_of_requests, period_in_seconds)`.
+    """
+    try:
+        count, period = rate.split('/')
+        return int(count), float(_PERIODS[period.strip().lower()])
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate {rate!r}, expected e.g. '100/min'") from None
+
+
+class LocalThrottleBackend:
+    """
+    In-process throttle state, bounded to `max_keys` keys.
+
+    The least recently used key is evicted once the limit is reached, so memory
+    stays bounded no matter how many distinct clients are seen. It takes no locks:
+    it relies on the interpreter's atomic dict operations, so concurrent requests
+    for the same key may occasionally be admitted slightly over the limit.
+    Each process has its own counters.
+    """
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._state: OrderedDict[str, list] = OrderedDict()
+
+    def _get(self, key: str):
+        state = self._state.get(key)
+        if state is not None:
+            try:
+                self._state.move_to_end(key)
+            except KeyError:
+                pass
+        return state
+
+    def _set(self, key: str, state: list):
+        self._state[key] = state
+        while len(self._state) > self.max_keys:
+            try:
+                self._state.popitem(last=False)
+            except KeyError:
+                break
+
+    def token_bucket(self, key: str, limit: int, period: float) -> float | None:
+        now = time.monotonic()
+        refill_rate = limit / period
+        state = self._get(key)
+        if state is None:
+            self._set(key, [limit - 1.0, now])
+            return None
+        tokens = min(float(limit), state[0] + (now - state[1]) * refill_rate)
+        state[1] = now
+        if tokens >= 1:
+            state[0] = tokens - 1
+            return None
+        state[0] = tokens
+        return (1 - tokens) / refill_rate
+
+    def sliding_window(self, key: str, limit: int, period: float) -> float | None:
+        now = time.monotonic()
+        window = math.floor(now / period)
+        state = self._get(key)
+        if state is None:
+            state = [window, 0, 0]
+            self._set(key, state)
+        elif state[0] != window:
+            previous = state[1] if state[0] == window - 1 else 0
+            state[0], state[1], state[2] = window, 0, previous
+        elapsed = now - window * period
+        retry_after = _sliding_window_retry_after(state[1], state[2], limit, period, elapsed)
+        if retry_after is None:
+            state[1] += 1
+        return retry_after
+
+
+class CacheThrottleBackend:
+    """
+    Throttle state shared between processes and nodes through a Django cache.
+
+    Uses the sliding-window-counter algorithm, which only needs atomic `incr`.
+    A check costs one cache round trip (two for the first request of a window,
+    which creates the counter, and for a rejected request, which is taken back
+    off the counter so it counts like in `LocalThrottleBackend`): counts for the
+    previous window are final once it has ended, so they are remembered locally
+    instead of fetched again.
+    Token buckets are not supported here because they need an atomic read-modify-write.
+
+    Args:
+        alias (str): Name of the cache in `settings.CACHES`.
+        key_prefix (str): Prefix for the cache keys.
+        max_local_keys (int): How many previous-window counts to remember locally.
+    """
+    def __init__(self, alias: str = 'default', key_prefix: str = 'svs-throttle', max_local_keys: int = 10000):
+        self.alias = alias
+        self.key_prefix = key_prefix
+        self._previous_counts = LocalThrottleBackend(max_local_keys)
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def token_bucket(self, key: str, limit: int, period: float) -> float | None:
+        raise ValueError("CacheThrottleBackend only supports the sliding_window algorithm")
+
+    def _incr(self, cache_key: str, period: float) -> int:
+        cache = self.cache
+        # incr() is the one round trip for every request but the first in a window.
+        try:
+            return cache.incr(cache_key)
+        except ValueError:
+            pass
+        if cache.add(cache_key, 1, timeout=math.ceil(period * 2)):
+            return 1
+        # Another request started the window between incr() and add().
+        return cache.incr(cache_key)
+
+    def _previous_count(self, key: str, window: int) -> int:
+        local_key = f'{key}:{window}'
+        cached = self._previous_counts._get(local_key)
+        if cached is not None:
+            return cached[0]
+        count = self.cache.get(f'{self.key_prefix}:{key}:{window}') or 0
+        self._previous_counts._set(local_key, [count])
+        return count
+
+    def sliding_window(self, key: str, limit: int, period: float) -> float | None:
+        now = time.time()
+        window = math.floor(now / period)
+        elapsed = now - window * period
+        cache_key = f'{self.key_prefix}:{key}:{window}'
+        current = self._incr(cache_key, period)
+        previous = self._previous_count(key, window - 1)
+        # `current` already counts this request, so check the state before it.
+        retry_after = _sliding_window_retry_after(current - 1, previous, limit, period, elapsed)
+        if retry_after is not None:
+            # Rejected requests don't use up the window, or a client that keeps
+            # retrying would stay locked out.
+            try:
+                self.cache.decr(cache_key)
+            except ValueError:
+                pass
+        return retry_after
+
+
+def _sliding_window_retry_after(
+        current: int,
+        previous: int,
+        limit: int,
+        period: float,
+        elapsed: float) -> float | None:
+    """
+    Returns None when one more request fits in the window, otherwise the seconds
+    until it would. The previous window's count is weighted by how much of it still
+    overlaps the sliding window.
+    """
+    weight = 1 - elapsed / period
+    if previous * weight + current + 1 <= limit:
+        return None
+    room = limit - 1 - current
+    if room >= 0:
+        # Wait until the previous window's weighted count has decayed enough.
+        return max(period * (1 - room / previous) - elapsed, 0.001)
+    # The current window alone is full: wait until it is the previous window and
+    # has decayed enough.
+    return period - elapsed + period * (1 - (limit - 1) / current)
+
+
+_default_backend = LocalThrottleBackend()
+
+
+def _ip_key(request: Request) -> str:
+    return request.META.get('REMOTE_ADDR') or 'unknown'
+
+
+def _user_key(request: Request) -> str:
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{_ip_key(request)}'
+
+
+async def _auser_key(request: Request) -> str:
+    """
+    Like `_user_key`, for async code: an authentication middleware's lazy
+    `request.user` is not evaluated on the event loop, where Django forbids the
+    query it runs.
+    """
+    user = getattr(request, 'user', None)
+    if user is None:
+        return f'ip:{_ip_key(request)}'
+    if getattr(user, '_wrapped', None) is empty:
+        auser = getattr(request, 'auser', None)
+        if auser is None:
+            return await sync_to_async(_user_key, thread_sensitive=True)(request)
+        user = await auser()
+    if user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{_ip_key(request)}'
+
+
+def _endpoint_key(request: Request) -> str:
+    match = request.resolver_match
+    return match.route if match is not None else request.path_info
+
+
+_KEY_FUNCS = {
+    'ip': _ip_key,
+    'user': _user_key,
+    'endpoint': _endpoint_key,
+}
+
+
+class Throttle:
+    """
+    A rate limit that can be declared as a check in `SmallViewSet.protections`.
+
+    Args:
+        rate (str): Allowed requests per period, e.g. '100/min'.
+        key (str | Callable[[Request], str]): What to count requests by: 'user'
+            (falls back to IP for anonymous users), 'ip', 'endpoint' (one shared
+            limit for everyone), or a callable returning a key for the request.
+        algorithm (str): 'token_bucket' (allows bursts up to `rate`, then refills
+            smoothly) or 'sliding_window' (sliding-window counter).
+        backend: `LocalThrottleBackend` (the default, shared per process) or
+            `CacheThrottleBackend` for limits shared across nodes.
+        scope (str | None): Namespace for the keys. Defaults to the viewset class and
+            attribute name the throttle is declared under.
+
+    Raises `Throttled` (429 with a `Retry-After` header) when the limit is exceeded.
+
+    Usage:
+        ```python
+        class BarViewSet(AppViewSet):
+            create_throttle = Throttle('10/min', key='user')
+            protections = {
+                'create': ['require_logged_in', 'create_throttle'],
+            }
+        ```
+    """
+    def __init__(
+            self,
+            rate: str,
+            key: str | Callable[[Request], str] = 'user',
+            algorithm: str = TOKEN_BUCKET,
+            backend=None,
+            scope: str | None = None):
+        self.rate = rate
+        self.limit, self.period = parse_rate(rate)
+        if callable(key):
+            self.key_func = key
+        elif key in _KEY_FUNCS:
+            self.key_func = _KEY_FUNCS[key]
+        else:
+            raise ValueError(f"Unknown throttle key {key!r}, expected 'user', 'ip', 'endpoint' or a callable")
+        if algorithm not in (TOKEN_BUCKET, SLIDING_WINDOW):
+            raise ValueError(f"Unknown throttle algorithm {algorithm!r}")
+        self.algorithm = algorithm
+        self.backend = backend if backend is not None else _default_backend
+        if isinstance(self.backend, CacheThrottleBackend) and algorithm == TOKEN_BUCKET:
+            raise ValueError("CacheThrottleBackend only supports the sliding_window algorithm")
+        self.scope = scope
+
+    def __set_name__(self, owner, name):
+        if self.scope is None:
+            self.scope = f'{owner.__module__}.{owner.__qualname__}.{name}'
+
+    def __call__(self, request: Request):
+        key = f'{self.scope}:{self.key_func(request)}'
+        if self.algorithm == TOKEN_BUCKET:
+            retry_after = self.backend.token_bucket(key, self.limit, self.period)
+        else:
+            retry_after = self.backend.sliding_window(key, self.limit, self.period)
+        if retry_after is not None:
+            raise Throttled(retry_after)
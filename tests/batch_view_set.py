@@ -0,0 +1,46 @@
+import asyncio
+
+from django.http import Http404
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import BatchResult, SmallViewSet, Unauthorized, batch_endpoint
+
+
+BARS = {1: {'id': 1, 'name': 'one'}, 2: {'id': 2, 'name': 'two'}}
+
+
+class BatchViewSet(SmallViewSet):
+    def urlpatterns(self):
+        return [
+            path('api/batch/retrieve/', self.batch_retrieve, name='batch_retrieve'),
+            path('api/batch/create/',   self.batch_create,   name='batch_create'),
+            path('api/batch/async/',    self.async_batch,    name='batch_async'),
+        ]
+
+    def protect_retrieve(self, request: Request):
+        request.protect_calls = getattr(request, 'protect_calls', 0) + 1
+        if request.headers.get('Authorization') == 'invalid':
+            raise Unauthorized()
+
+    @batch_endpoint(protect='retrieve', max_items=3)
+    def batch_retrieve(self, request: Request, items: list):
+        request.bulk_calls = getattr(request, 'bulk_calls', 0) + 1
+        found = {pk: BARS[pk] for pk in items if pk in BARS}
+        return [found[pk] if pk in found else Http404() for pk in items]
+
+    @batch_endpoint(per_item=True)
+    def batch_create(self, request: Request, item):
+        if not isinstance(item, dict) or 'name' not in item:
+            raise ValueError()
+        return BatchResult(201, {'name': item['name']})
+
+    @batch_endpoint(per_item=True, max_concurrency=2)
+    async def async_batch(self, request: Request, item):
+        request.running = getattr(request, 'running', 0) + 1
+        request.peak = max(getattr(request, 'peak', 0), request.running)
+        await asyncio.sleep(0.01)
+        request.running -= 1
+        if item == 'boom':
+            raise RuntimeError('Item failed')
+        return {'item': item, 'peak': request.peak}
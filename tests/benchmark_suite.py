@@ -0,0 +1,314 @@
+"""
+Benchmarks for the work the library adds around endpoint handlers.
+
+Every case is timed call by call, so results carry percentiles and not just a
+mean. Results can be saved as a baseline and later runs compared against it;
+see `python tests/manage.py benchmark --help`.
+"""
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from time import perf_counter_ns
+from wsgiref.util import setup_testing_defaults
+
+import django
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied, SuspiciousOperation
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory
+from django.urls import path
+from django.urls.resolvers import RegexPattern, URLResolver
+
+from small_view_set import (
+    BadRequest,
+    EndpointDisabledException,
+    MethodNotAllowed,
+    ServiceUnavailable,
+    SmallJsonResponse,
+    SmallViewSet,
+    Throttled,
+    Unauthorized,
+    default_exception_handler,
+    endpoint,
+)
+from small_view_set.router import CompiledURLResolver
+from tests.legacy_exception_handler import legacy_exception_handler
+
+
+class BenchmarkViewSet(SmallViewSet):
+    def raw_detail(self, request, pk):
+        return HttpResponse()
+
+    async def raw_async_detail(self, request, pk):
+        return HttpResponse()
+
+    @endpoint(allowed_methods=['GET', 'PUT'])
+    def detail(self, request, pk):
+        return HttpResponse()
+
+    @endpoint(allowed_methods=['GET', 'PUT'])
+    async def async_detail(self, request, pk):
+        return HttpResponse()
+
+    @endpoint(allowed_methods=['POST'])
+    def create(self, request):
+        return HttpResponse(len(self.parse_json_body(request)))
+
+
+class InvalidJson(json.JSONDecodeError):
+    def __init__(self):
+        super().__init__('Expecting value', '', 0)
+
+
+EXCEPTIONS = {
+    'Http404': Http404,
+    'ObjectDoesNotExist': ObjectDoesNotExist,
+    'PermissionDenied': PermissionDenied,
+    'SuspiciousOperation': SuspiciousOperation,
+    'Unauthorized': Unauthorized,
+    'BadRequest': lambda: BadRequest('Invalid cursor'),
+    'MethodNotAllowed': lambda: MethodNotAllowed('DELETE'),
+    'EndpointDisabledException': EndpointDisabledException,
+    'Throttled': lambda: Throttled(retry_after=3),
+    'ServiceUnavailable': ServiceUnavailable,
+    'JSONDecodeError': InvalidJson,
+    'ValueError': ValueError,
+    'Exception': lambda: RuntimeError('boom'),
+}
+
+
+def _json_body(items: int) -> bytes:
+    return json.dumps([{'id': i, 'name': f'bar {i}', 'tags': ['a', 'b']} for i in range(items)]).encode()
+
+
+def _wsgi_environ(path: str) -> dict:
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET', 'SERVER_NAME': 'testserver'}
+    setup_testing_defaults(environ)
+    return environ
+
+
+def _wsgi_get(handler: WSGIHandler, path: str):
+    response = handler(_wsgi_environ(path), lambda status, headers: None)
+    b''.join(response)
+    response.close()
+
+
+async def _asgi_get(handler: ASGIHandler, path: str):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Django listens for a disconnect until the response is sent, then cancels this.
+        await asyncio.Future()
+
+    async def send(message):
+        pass
+
+    await handler(scope, receive, send)
+
+
+def build_cases() -> dict:
+    """
+    Returns `{name: (is_async, func)}`. Sync funcs are called, async funcs awaited,
+    with no arguments.
+    """
+    viewset = BenchmarkViewSet()
+    factory = RequestFactory()
+    get = factory.get('/benchmark/1/')
+    cases = {
+        'wrapper/sync/raw': (False, lambda: viewset.raw_detail(get, pk=1)),
+        'wrapper/sync': (False, lambda: viewset.detail(get, pk=1)),
+        'wrapper/async/raw': (True, lambda: viewset.raw_async_detail(get, pk=1)),
+        'wrapper/async': (True, lambda: viewset.async_detail(get, pk=1)),
+    }
+
+    for method in ('OPTIONS', 'HEAD'):
+        request = factory.generic(method, '/benchmark/1/')
+        cases[f'preflight/{method.lower()}/sync'] = (False, lambda request=request: viewset.detail(request, pk=1))
+        cases[f'preflight/{method.lower()}/async'] = (True, lambda request=request: viewset.async_detail(request, pk=1))
+    delete = factory.delete('/benchmark/1/')
+    cases['preflight/method_not_allowed'] = (False, lambda: viewset.detail(delete, pk=1))
+
+    for name, make_exception in EXCEPTIONS.items():
+        cases[f'exception/{name}'] = (
+            False,
+            lambda make_exception=make_exception: default_exception_handler(get, 'detail', make_exception()))
+    # The handler as it was before the registry, for a 404 flood from scanners.
+    cases['exception/legacy/Http404'] = (False, lambda: legacy_exception_handler(get, 'detail', Http404()))
+
+    for size, items in (('small', 1), ('large', 1000)):
+        body = _json_body(items)
+        data = json.loads(body)
+
+        def parse(body=body):
+            # A fresh request each call; parse_json_body memoizes per request.
+            return viewset.create(factory.post('/benchmark/', body, content_type='application/json'))
+
+        cases[f'json/parse_json_body/{size}'] = (False, parse)
+        cases[f'json/encode/{size}'] = (False, lambda data=data: SmallJsonResponse(data, safe=False))
+
+    wsgi = WSGIHandler()
+    asgi = ASGIHandler()
+    # test_project's BasicCrudViewSet: detail is a sync endpoint, collection an async one.
+    cases['harness/wsgi/sync'] = (False, lambda: _wsgi_get(wsgi, '/api/basic_crud/3/'))
+    cases['harness/wsgi/async'] = (False, lambda: _wsgi_get(wsgi, '/api/basic_crud/'))
+    cases['harness/asgi/sync'] = (True, lambda: _asgi_get(asgi, '/api/basic_crud/3/'))
+    cases['harness/asgi/async'] = (True, lambda: _asgi_get(asgi, '/api/basic_crud/'))
+
+    stock, compiled = build_resolvers(1000)
+    for path_info in ('/api/resource0/', '/api/resource999/', '/api/resource999/42/'):
+        cases[f'router/django{path_info}'] = (False, lambda path_info=path_info: stock.resolve(path_info))
+        cases[f'router/compiled{path_info}'] = (False, lambda path_info=path_info: compiled.resolve(path_info))
+    return cases
+
+
+def build_resolvers(viewsets: int) -> tuple[URLResolver, URLResolver]:
+    """Django's linear resolver and `SmallViewSetRouter`'s, over a collection and a detail route per viewset."""
+    view = lambda request, **kwargs: HttpResponse()
+    patterns = []
+    for i in range(viewsets):
+        patterns.append(path(f'api/resource{i}/', view, name=f'resource{i}_collection'))
+        patterns.append(path(f'api/resource{i}/<int:pk>/', view, name=f'resource{i}_detail'))
+    return URLResolver(RegexPattern(r'^/'), patterns), URLResolver(RegexPattern(r'^/'), [CompiledURLResolver(patterns)])
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, from `-X importtime` in a fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def _percentile(samples: list[int], fraction: float) -> int:
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def _summarize(samples: list[int]) -> dict:
+    samples.sort()
+    return {
+        'p50_us': _percentile(samples, 0.50) / 1000,
+        'p99_us': _percentile(samples, 0.99) / 1000,
+        'mean_us': sum(samples) / len(samples) / 1000,
+    }
+
+
+def _time_sync(func, number: int) -> list[int]:
+    samples = []
+    for _ in range(number):
+        start = perf_counter_ns()
+        func()
+        samples.append(perf_counter_ns() - start)
+    return samples
+
+
+async def _time_async(func, number: int) -> list[int]:
+    samples = []
+    for _ in range(number):
+        start = perf_counter_ns()
+        await func()
+        samples.append(perf_counter_ns() - start)
+    return samples
+
+
+def run_suite(number: int = 2000, warmup: int = 100, repeat: int = 3, select: str | None = None) -> dict:
+    """
+    Runs every case whose name contains `select` (all when None) and returns the
+    results with the environment they were measured in.
+
+    Each case is timed `repeat` times, `number` calls each, and the best round's
+    percentiles are kept, to keep noise from other processes out. The
+    'import/small_view_set' case instead imports the package, on top of
+    `django.http`, in `max(repeat, 5)` fresh interpreters.
+    """
+    cases = {
+        name: case for name, case in build_cases().items()
+        if select is None or select in name
+    }
+    results = {}
+    logging.disable(logging.CRITICAL)
+    loop = asyncio.new_event_loop()
+    try:
+        for name, (is_async, func) in cases.items():
+            rounds = []
+            for _ in range(repeat):
+                if is_async:
+                    loop.run_until_complete(_time_async(func, warmup))
+                    samples = loop.run_until_complete(_time_async(func, number))
+                else:
+                    _time_sync(func, warmup)
+                    samples = _time_sync(func, number)
+                rounds.append(_summarize(samples))
+            results[name] = {key: min(summary[key] for summary in rounds) for key in rounds[0]}
+    finally:
+        loop.close()
+        logging.disable(logging.NOTSET)
+    if select is None or select in 'import/small_view_set':
+        samples = [
+            import_times('import django.http; import small_view_set')['small_view_set'] * 1000
+            for _ in range(max(repeat, 5))]
+        results['import/small_view_set'] = _summarize(samples)
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+            'implementation': sys.implementation.name,
+        },
+        'number': number,
+        'repeat': repeat,
+        'cases': results,
+    }
+
+
+def compare(
+        results: dict,
+        baseline: dict,
+        tolerance: float = 0.5,
+        p99_tolerance: float = 1.0,
+        floor_us: float = 2.0) -> list[str]:
+    """
+    Returns the names of cases whose p50 is more than `tolerance` (a fraction), or
+    whose p99 is more than `p99_tolerance`, slower than in `baseline`. Tails are
+    noisier than medians, hence the looser default. Differences under `floor_us`
+    are ignored, as they are within timer noise for the fastest cases.
+    """
+    regressions = []
+    for name, current in results['cases'].items():
+        previous = baseline['cases'].get(name)
+        if previous is None:
+            continue
+        for key, allowed in (('p50_us', tolerance), ('p99_us', p99_tolerance)):
+            if current[key] - previous[key] > max(previous[key] * allowed, floor_us):
+                regressions.append(name)
+                break
+    return regressions
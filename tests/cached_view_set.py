@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from django.http import Http404
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import EndpointCache, SmallJsonResponse, SmallViewSet, endpoint
+
+
+calls = []
+
+
+class CachedViewSet(SmallViewSet):
+    def urlpatterns(self):
+        return [
+            path('api/cached/',                self.default,      name='cached_collection'),
+            path('api/cached/<int:pk>/',       self.detail,       name='cached_detail'),
+            path('api/cached/async/<int:pk>/', self.async_detail, name='cached_async_detail'),
+            path('api/cached/me/',             self.me,           name='cached_me'),
+        ]
+
+    @endpoint(allowed_methods=['GET', 'POST'], cache=EndpointCache(ttl=60, query_params=['page'], public=True))
+    def default(self, request: Request):
+        calls.append('list')
+        return SmallJsonResponse({'page': request.GET.get('page'), 'calls': len(calls)})
+
+    @endpoint(allowed_methods=['GET'], cache=EndpointCache(ttl=60, vary=lambda request: request.GET.get('user', '')))
+    def detail(self, request: Request, pk: int):
+        calls.append('detail')
+        time.sleep(float(request.GET.get('sleep', 0)))
+        if pk == 404:
+            raise Http404()
+        return SmallJsonResponse({'id': pk, 'user': request.GET.get('user')})
+
+    @endpoint(allowed_methods=['GET'], cache=EndpointCache(ttl=60, backend='default', public=True))
+    async def async_detail(self, request: Request, pk: int):
+        calls.append('async_detail')
+        await asyncio.sleep(float(request.GET.get('sleep', 0)))
+        return SmallJsonResponse({'id': pk})
+
+    @endpoint(allowed_methods=['GET'], cache=EndpointCache(ttl=60))
+    async def me(self, request: Request):
+        calls.append('me')
+        user = await request.auser()
+        return SmallJsonResponse({'username': user.username})
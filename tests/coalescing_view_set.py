@@ -0,0 +1,34 @@
+import asyncio
+
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import SmallJsonResponse, SmallViewSet, endpoint
+
+
+calls = []
+
+
+class CoalescingViewSet(SmallViewSet):
+    def urlpatterns(self):
+        return [
+            path('api/coalescing/',         self.default,  name='coalescing_collection'),
+            path('api/coalescing/<int:pk>/', self.detail,  name='coalescing_detail'),
+        ]
+
+    @endpoint(allowed_methods=['GET'], coalesce=True)
+    async def default(self, request: Request):
+        calls.append('list')
+        await asyncio.sleep(0.05)
+        if request.GET.get('fail'):
+            raise RuntimeError('Dashboard failed')
+        response = SmallJsonResponse({'calls': len(calls)})
+        if request.GET.get('cookie'):
+            response.set_cookie('seen', '1')
+        return response
+
+    @endpoint(allowed_methods=['GET'], coalesce=lambda request: 'one-key')
+    async def detail(self, request: Request, pk: int):
+        calls.append('detail')
+        await asyncio.sleep(0.05)
+        return SmallJsonResponse({'id': pk})
@@ -0,0 +1,50 @@
+from django.http import Http404
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import (
+    Compression,
+    EndpointCache,
+    SmallJsonResponse,
+    SmallViewSet,
+    StreamingJsonArrayResponse,
+    endpoint,
+)
+from tests.streaming_view_set import async_rows, rows
+
+
+calls = []
+
+
+class CompressionViewSet(SmallViewSet):
+    def urlpatterns(self):
+        return [
+            path('api/compression/',         self.default,      name='compression_collection'),
+            path('api/compression/<int:pk>/', self.detail,      name='compression_detail'),
+            path('api/compression/cached/',  self.cached,       name='compression_cached'),
+            path('api/compression/stream/',  self.stream,       name='compression_stream'),
+            path('api/compression/astream/', self.async_stream, name='compression_astream'),
+        ]
+
+    @endpoint(allowed_methods=['GET'], compress=Compression(algorithms=['gzip', 'deflate'], min_size=100))
+    def default(self, request: Request):
+        return SmallJsonResponse({'results': [{'id': i, 'name': f'bar {i}'} for i in range(int(request.GET.get('count', 50)))]})
+
+    @endpoint(allowed_methods=['GET'], compress=True)
+    async def detail(self, request: Request, pk: int):
+        if pk == 404:
+            raise Http404()
+        return SmallJsonResponse({'id': pk, 'text': 'x' * 1000})
+
+    @endpoint(allowed_methods=['GET'], cache=EndpointCache(ttl=60), compress=Compression(algorithms=['gzip']))
+    def cached(self, request: Request):
+        calls.append('cached')
+        return SmallJsonResponse({'text': 'y' * 1000})
+
+    @endpoint(allowed_methods=['GET'], compress=Compression(algorithms=['gzip']))
+    def stream(self, request: Request):
+        return StreamingJsonArrayResponse(request, rows(100), 'stream', chunk_size=10)
+
+    @endpoint(allowed_methods=['GET'], compress=Compression(algorithms=['deflate']))
+    async def async_stream(self, request: Request):
+        return StreamingJsonArrayResponse(request, async_rows(100), 'async_stream', chunk_size=10)
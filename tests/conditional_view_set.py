@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+
+from django.http import Http404
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import SmallJsonResponse, SmallViewSet, Unauthorized, endpoint
+
+
+ITEMS = {
+    1: {'id': 1, 'name': 'one', 'version': 3, 'updated': datetime(2024, 1, 2, tzinfo=timezone.utc)},
+}
+
+calls = []
+
+
+class ConditionalViewSet(SmallViewSet):
+    protections = {
+        'retrieve': ['require_token'],
+    }
+
+    def require_token(self, request: Request):
+        if not request.META.get('HTTP_AUTHORIZATION'):
+            raise Unauthorized()
+
+    def urlpatterns(self):
+        return [
+            path('api/conditional/',                self.default, name='conditional_collection'),
+            path('api/conditional/<int:pk>/',       self.detail,  name='conditional_detail'),
+            path('api/conditional/async/<int:pk>/', self.async_detail, name='conditional_async_detail'),
+            path('api/conditional/protected/<int:pk>/', self.protected_detail, name='conditional_protected_detail'),
+            path('api/conditional/aprotected/<int:pk>/', self.aprotected_detail, name='conditional_aprotected_detail'),
+        ]
+
+    def item_version(self, request: Request, pk=None):
+        item = ITEMS.get(pk)
+        return item and item['version']
+
+    def item_updated(self, request: Request, pk=None):
+        item = ITEMS.get(pk)
+        return item and item['updated']
+
+    async def async_item_version(self, request: Request, pk=None):
+        return self.item_version(request, pk=pk)
+
+    @endpoint(allowed_methods=['GET'], auto_etag=True)
+    def default(self, request: Request):
+        calls.append('list')
+        return SmallJsonResponse([{'id': item['id']} for item in ITEMS.values()], safe=False)
+
+    @endpoint(allowed_methods=['GET', 'PATCH'], etag=item_version, last_modified=item_updated)
+    def detail(self, request: Request, pk: int):
+        calls.append('detail')
+        item = ITEMS.get(pk)
+        if item is None:
+            raise Http404()
+        return SmallJsonResponse({'id': item['id'], 'name': item['name']})
+
+    @endpoint(allowed_methods=['GET'], etag=async_item_version)
+    async def async_detail(self, request: Request, pk: int):
+        calls.append('async_detail')
+        return SmallJsonResponse({'id': pk})
+
+    @endpoint(allowed_methods=['GET'], etag=item_version, protect='retrieve')
+    def protected_detail(self, request: Request, pk: int):
+        self.protect_retrieve(request)
+        calls.append('protected_detail')
+        return SmallJsonResponse({'id': pk})
+
+    @endpoint(allowed_methods=['GET'], etag=async_item_version, protect='retrieve')
+    async def aprotected_detail(self, request: Request, pk: int):
+        await self.aprotect_retrieve(request)
+        calls.append('aprotected_detail')
+        return SmallJsonResponse({'id': pk})
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import SmallJsonResponse, SmallViewSet, current_deadline, endpoint
+
+
+class DeadlineViewSet(SmallViewSet):
+    def urlpatterns(self):
+        return [
+            path('api/deadline/slow/',      self.slow,      name='deadline_slow'),
+            path('api/deadline/budget/',    self.budget,    name='deadline_budget'),
+            path('api/deadline/default/',   self.default,   name='deadline_default'),
+            path('api/deadline/unlimited/', self.unlimited, name='deadline_unlimited'),
+            path('api/deadline/own/',       self.own,       name='deadline_own'),
+            path('api/deadline/pooled/',    self.pooled,    name='deadline_pooled'),
+        ]
+
+    @endpoint(allowed_methods=['GET'], timeout=0.05)
+    async def slow(self, request: Request):
+        await asyncio.sleep(float(request.GET.get('sleep', 1)))
+        return SmallJsonResponse({'slow': True})
+
+    @endpoint(allowed_methods=['GET'], timeout=5)
+    async def budget(self, request: Request):
+        deadline = current_deadline()
+        return SmallJsonResponse({'timeout': deadline.timeout, 'remaining': deadline.remaining()})
+
+    @endpoint(allowed_methods=['GET'])
+    async def default(self, request: Request):
+        await asyncio.sleep(float(request.GET.get('sleep', 0)))
+        deadline = current_deadline()
+        return SmallJsonResponse({'timeout': deadline.timeout if deadline else None})
+
+    @endpoint(allowed_methods=['GET'], timeout=False)
+    async def unlimited(self, request: Request):
+        return SmallJsonResponse({'deadline': current_deadline() is not None})
+
+    @endpoint(allowed_methods=['GET'], timeout=5)
+    async def own(self, request: Request):
+        # A downstream client's timeout, not the endpoint's.
+        raise asyncio.TimeoutError()
+
+    @endpoint(allowed_methods=['GET'], execution='pool', timeout=5)
+    def pooled(self, request: Request):
+        time.sleep(0.01)
+        return SmallJsonResponse({'remaining': current_deadline().remaining()})
@@ -0,0 +1,41 @@
+import threading
+import time
+
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import SmallJsonResponse, SmallViewSet, endpoint, executor_group, run_sync
+
+
+executor_group('tests-narrow', max_workers=1, max_queue=0)
+
+
+class ExecutionViewSet(SmallViewSet):
+    def urlpatterns(self):
+        return [
+            path('api/execution/pool/',             self.pooled,           name='execution_pool'),
+            path('api/execution/narrow/',           self.narrow,           name='execution_narrow'),
+            path('api/execution/thread_sensitive/', self.thread_sensitive, name='execution_thread_sensitive'),
+            path('api/execution/orchestrator/',     self.orchestrator,     name='execution_orchestrator'),
+        ]
+
+    def current_thread(self, request: Request):
+        return threading.current_thread().name
+
+    @endpoint(allowed_methods=['GET'], execution='pool', executor_group='tests-wide')
+    def pooled(self, request: Request):
+        return SmallJsonResponse({'thread': self.current_thread(request)})
+
+    @endpoint(allowed_methods=['GET'], execution='pool', executor_group='tests-narrow')
+    def narrow(self, request: Request):
+        time.sleep(0.1)
+        return SmallJsonResponse({'thread': self.current_thread(request)})
+
+    @endpoint(allowed_methods=['GET'], execution='thread_sensitive')
+    def thread_sensitive(self, request: Request):
+        return SmallJsonResponse({'thread': self.current_thread(request)})
+
+    @endpoint(allowed_methods=['GET'])
+    async def orchestrator(self, request: Request):
+        thread = await run_sync(self.current_thread, request, executor_group='tests-wide')
+        return SmallJsonResponse({'thread': thread})
@@ -0,0 +1,37 @@
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import SmallJsonResponse, SmallViewSet, endpoint, endpoint_disabled
+
+
+class KillSwitchViewSet(SmallViewSet):
+    def urlpatterns(self):
+        return [
+            path('api/kill_switch/',          self.collection, name='kill_switch_collection'),
+            path('api/kill_switch/report/',   self.report,     name='kill_switch_report'),
+            path('api/kill_switch/areport/',  self.areport,    name='kill_switch_areport'),
+            path('api/kill_switch/archived/', self.archived,   name='kill_switch_archived'),
+        ]
+
+    @endpoint(allowed_methods=['GET', 'POST'])
+    def collection(self, request: Request):
+        if request.method == 'POST':
+            return self.create(request)
+        return SmallJsonResponse({'created': False})
+
+    @endpoint_disabled
+    def create(self, request: Request):
+        return SmallJsonResponse({'created': True}, status=201)
+
+    @endpoint(allowed_methods=['GET'])
+    def report(self, request: Request):
+        return SmallJsonResponse({'report': True})
+
+    @endpoint(allowed_methods=['GET'])
+    async def areport(self, request: Request):
+        return SmallJsonResponse({'report': True})
+
+    @endpoint(allowed_methods=['GET'])
+    @endpoint_disabled
+    def archived(self, request: Request):
+        return SmallJsonResponse({'archived': True})
@@ -0,0 +1,18 @@
+from urllib.request import Request
+
+from small_view_set import SmallJsonResponse, SmallViewSet, endpoint
+
+# Only imported by the lazy routes in test_project.lazy_urls, on first request.
+
+
+class LazyViewSet(SmallViewSet):
+
+    @endpoint(allowed_methods=['GET'])
+    def default(self, request: Request):
+        self.protect_list(request)
+        return SmallJsonResponse({'instance': id(self)})
+
+    @endpoint(allowed_methods=['GET'])
+    async def detail(self, request: Request, pk: int):
+        await self.aprotect_retrieve(request)
+        return SmallJsonResponse({'id': pk, 'instance': id(self)})
@@ -0,0 +1,50 @@
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import KeysetPaginator, SmallJsonResponse, SmallViewSet, endpoint
+from test_project.models import Item
+
+
+def serialize_item(item: Item) -> dict:
+    return {'id': item.id, 'score': item.score}
+
+
+class PaginationViewSet(SmallViewSet):
+    paginator = KeysetPaginator(ordering=['-score', 'created'], page_size=4, max_page_size=10)
+
+    def urlpatterns(self):
+        return [
+            path('api/pagination/',        self.default,       name='pagination_list'),
+            path('api/pagination/values/', self.values_list,   name='pagination_values'),
+            path('api/pagination/stream/', self.stream_list,   name='pagination_stream'),
+            path('api/pagination/async/',  self.async_list,    name='pagination_async'),
+            path('api/pagination/astream/', self.astream_list, name='pagination_astream'),
+        ]
+
+    @endpoint(allowed_methods=['GET'])
+    def default(self, request: Request):
+        self.protect_list(request)
+        page = self.paginator.paginate(request, Item.objects.all())
+        return SmallJsonResponse(page.as_dict(serialize_item))
+
+    @endpoint(allowed_methods=['GET'])
+    def values_list(self, request: Request):
+        self.protect_list(request)
+        page = self.paginator.paginate(request, Item.objects.values('id', 'score', 'created'))
+        return SmallJsonResponse(page.as_dict(lambda row: {'id': row['id'], 'score': row['score']}))
+
+    @endpoint(allowed_methods=['GET'])
+    def stream_list(self, request: Request):
+        self.protect_list(request)
+        return self.paginator.stream(request, Item.objects.all(), 'stream_list', serialize=serialize_item, chunk_size=2)
+
+    @endpoint(allowed_methods=['GET'])
+    async def async_list(self, request: Request):
+        await self.aprotect_list(request)
+        page = await self.paginator.apaginate(request, Item.objects.all())
+        return SmallJsonResponse(page.as_dict(serialize_item))
+
+    @endpoint(allowed_methods=['GET'])
+    async def astream_list(self, request: Request):
+        await self.aprotect_list(request)
+        return await self.paginator.astream(request, Item.objects.all(), 'astream_list', serialize=serialize_item)
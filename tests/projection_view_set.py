@@ -0,0 +1,40 @@
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import FieldSet, SmallJsonResponse, SmallViewSet, endpoint
+from test_project.models import Item
+
+
+class ProjectionViewSet(SmallViewSet):
+    fieldset = FieldSet(
+        fields=['id', 'name', 'score', 'created'],
+        default=['id', 'name'],
+        relations={'owner': FieldSet(fields=['id', 'name', 'email'], default=['id'])})
+
+    def urlpatterns(self):
+        return [
+            path('api/projection/',        self.default,     name='projection_list'),
+            path('api/projection/values/', self.values_list, name='projection_values'),
+            path('api/projection/async/',  self.async_list,  name='projection_async'),
+        ]
+
+    @endpoint(allowed_methods=['GET'])
+    def default(self, request: Request):
+        self.protect_list(request)
+        projection = self.fieldset.parse(request)
+        items = projection.apply(Item.objects.order_by('id'))
+        return SmallJsonResponse({'results': [projection.project(item) for item in items]})
+
+    @endpoint(allowed_methods=['GET'])
+    def values_list(self, request: Request):
+        self.protect_list(request)
+        projection = self.fieldset.parse(request)
+        rows = projection.values(Item.objects.order_by('id'))
+        return SmallJsonResponse({'results': [projection.project(row) for row in rows]})
+
+    @endpoint(allowed_methods=['GET'])
+    async def async_list(self, request: Request):
+        await self.aprotect_list(request)
+        projection = self.fieldset.parse(request)
+        items = [item async for item in projection.apply(Item.objects.order_by('id'))]
+        return SmallJsonResponse({'results': [projection.project(item) for item in items]})
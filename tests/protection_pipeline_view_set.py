@@ -0,0 +1,83 @@
+import asyncio
+
+from django.http import JsonResponse
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import SmallViewSet, Unauthorized, endpoint
+from small_view_set.exceptions import MethodNotAllowed
+
+
+def record_call(request: Request, name: str):
+    if not hasattr(request, 'check_calls'):
+        request.check_calls = []
+    request.check_calls.append(name)
+
+
+class PipelineAppViewSet(SmallViewSet):
+    protections = {
+        'create': ['require_logged_in', 'require_email_verified'],
+        'retrieve': ['require_logged_in'],
+    }
+
+    def require_logged_in(self, request: Request):
+        record_call(request, 'require_logged_in')
+        if not request.META.get('HTTP_AUTHORIZATION'):
+            raise Unauthorized("Authorization header is missing")
+
+    def require_email_verified(self, request: Request):
+        self.check(request, 'require_logged_in')
+        record_call(request, 'require_email_verified')
+        if request.META['HTTP_AUTHORIZATION'] == 'Bearer logged_in_but_not_verified':
+            raise Unauthorized("User is logged in but not verified")
+
+
+class PipelineViewSet(PipelineAppViewSet):
+    protections = {
+        'create': ['require_logged_in', 'require_not_banned'],
+        'retrieve': ['require_active_token', 'require_not_banned'],
+        'list': ['require_session_user'],
+    }
+
+    def require_session_user(self, request: Request):
+        # Evaluates the lazy request.user, which queries the database.
+        if not request.user.is_authenticated:
+            raise Unauthorized()
+
+    async def require_active_token(self, request: Request):
+        record_call(request, 'require_active_token')
+        await asyncio.sleep(0.05)
+
+    async def require_not_banned(self, request: Request):
+        record_call(request, 'require_not_banned')
+        await asyncio.sleep(0.05)
+        if request.META.get('HTTP_AUTHORIZATION') == 'Bearer banned':
+            raise Unauthorized("User is banned")
+
+    def urlpatterns(self):
+        return [
+            path('api/pipeline/',          self.collection, name='pipeline_collection'),
+            path('api/pipeline/<int:pk>/', self.detail,     name='pipeline_detail'),
+            path('api/pipeline/session/',  self.session,    name='pipeline_session'),
+        ]
+
+    @endpoint(allowed_methods=['POST'])
+    async def collection(self, request: Request):
+        if request.method == 'POST':
+            await self.aprotect_create(request)
+            # A second protect call for the same request reuses every outcome.
+            await self.aprotect_create(request)
+            return JsonResponse({'calls': request.check_calls}, status=201)
+        raise MethodNotAllowed(method=request.method)
+
+    @endpoint(allowed_methods=['GET'])
+    async def detail(self, request: Request, pk: int):
+        await self.aprotect_retrieve(request)
+        return JsonResponse({'calls': request.check_calls})
+
+    @endpoint(allowed_methods=['GET'])
+    async def session(self, request: Request):
+        await self.aprotect_list(request)
+        # The memoized outcome is replayed without leaving the event loop.
+        await self.acheck(request, 'require_session_user')
+        return JsonResponse({'username': request.user.username})
@@ -0,0 +1,46 @@
+from django.urls import path
+from urllib.request import Request
+
+from small_view_set import SmallViewSet, StreamingJsonArrayResponse, endpoint
+
+
+def rows(count, fail_at=None):
+    for i in range(count):
+        if i == fail_at:
+            raise RuntimeError('Row failed')
+        yield {'id': i}
+
+
+async def async_rows(count, fail_at=None):
+    for row in rows(count, fail_at):
+        yield row
+
+
+class StreamingViewSet(SmallViewSet):
+    def urlpatterns(self):
+        return [
+            path('api/streaming/sync/',  self.sync_list,  name='streaming_sync'),
+            path('api/streaming/async/', self.async_list, name='streaming_async'),
+        ]
+
+    @endpoint(allowed_methods=['GET'])
+    def sync_list(self, request: Request):
+        self.protect_list(request)
+        fail_at = request.GET.get('fail_at')
+        return StreamingJsonArrayResponse(
+            request,
+            rows(int(request.GET.get('count', 5)), int(fail_at) if fail_at else None),
+            'sync_list',
+            envelope=request.GET.get('envelope'),
+            extra={'count': int(request.GET.get('count', 5))} if request.GET.get('envelope') else None,
+            chunk_size=2)
+
+    @endpoint(allowed_methods=['GET'])
+    async def async_list(self, request: Request):
+        self.protect_list(request)
+        fail_at = request.GET.get('fail_at')
+        return StreamingJsonArrayResponse(
+            request,
+            async_rows(int(request.GET.get('count', 5)), int(fail_at) if fail_at else None),
+            'async_list',
+            chunk_size=2)
@@ -0,0 +1,71 @@
+import json
+
+from django.test import TestCase, Client, AsyncClient, RequestFactory
+
+from tests.batch_view_set import BatchViewSet
+
+
+class TestBatchEndpoint(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+
+    def post(self, name, items, **extra):
+        return self.client.post(f'/api/batch/{name}/', json.dumps(items), content_type='application/json', **extra)
+
+    def test_bulk_handler_with_per_item_statuses(self):
+        response = self.post('retrieve', [1, 3, 2])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'results': [
+            {'status': 200, 'data': {'id': 1, 'name': 'one'}},
+            {'status': 404, 'data': None},
+            {'status': 200, 'data': {'id': 2, 'name': 'two'}},
+        ]})
+
+    def test_protect_and_handler_run_once_per_batch(self):
+        request = RequestFactory().post('/api/batch/retrieve/', '[1, 2, 3]', content_type='application/json')
+        response = BatchViewSet().batch_retrieve(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.protect_calls, 1)
+        self.assertEqual(request.bulk_calls, 1)
+
+    def test_failed_protection_fails_the_batch(self):
+        response = self.post('retrieve', [1], HTTP_AUTHORIZATION='invalid')
+        self.assertEqual(response.status_code, 401)
+
+    def test_protection_runs_before_the_body_is_read(self):
+        response = self.client.post(
+            '/api/batch/retrieve/', 'not json', content_type='application/json', HTTP_AUTHORIZATION='invalid')
+        self.assertEqual(response.status_code, 401)
+        response = self.post('retrieve', [1, 2, 3, 4], HTTP_AUTHORIZATION='invalid')
+        self.assertEqual(response.status_code, 401)
+
+    def test_invalid_bodies(self):
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions', level='ERROR'):
+            self.assertEqual(self.post('retrieve', [1, 2, 3, 4]).status_code, 400)
+            self.assertEqual(self.post('retrieve', {'items': [1]}).status_code, 400)
+        self.assertEqual(self.client.get('/api/batch/retrieve/').status_code, 405)
+
+    def test_per_item_handler(self):
+        response = self.post('create', [{'name': 'a'}, 'bad', {'name': 'b'}])
+        self.assertEqual(response.json(), {'results': [
+            {'status': 201, 'data': {'name': 'a'}},
+            {'status': 400, 'data': None},
+            {'status': 201, 'data': {'name': 'b'}},
+        ]})
+
+
+class TestAsyncBatchEndpoint(TestCase):
+
+    async def test_items_run_concurrently_with_a_limit(self):
+        client = AsyncClient()
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions', level='ERROR'):
+            response = await client.post(
+                '/api/batch/async/',
+                json.dumps(['a', 'boom', 'c', 'd']),
+                content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.content)['results']
+        self.assertEqual([result['status'] for result in results], [200, 500, 200, 200])
+        self.assertEqual(results[1]['data'], {'errors': 'Internal server error'})
+        self.assertEqual(max(result['data']['peak'] for result in results if result['status'] == 200), 2)
@@ -0,0 +1,101 @@
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.test import SimpleTestCase, RequestFactory
+
+from small_view_set import SmallViewSet, endpoint
+from tests.benchmark_suite import EXCEPTIONS, build_resolvers, compare, import_times, run_suite
+
+
+class BenchmarkViewSet(SmallViewSet):
+    def raw_detail(self, request, pk):
+        return HttpResponse(b'detail')
+
+    @endpoint(allowed_methods=['GET', 'PUT'])
+    def detail(self, request, pk):
+        return HttpResponse(b'detail')
+
+
+class TestEndpointOverhead(SimpleTestCase):
+    """
+    What the benchmark suite's 'wrapper/' cases compare: the wrapper adds work
+    around the handler, not to its response.
+    """
+
+    def test_wrapper_returns_the_handlers_response(self):
+        viewset = BenchmarkViewSet()
+        request = RequestFactory().get('/benchmark/1/')
+        raw = viewset.raw_detail(request, pk=1)
+        wrapped = viewset.detail(request, pk=1)
+        self.assertEqual((wrapped.status_code, wrapped.content), (raw.status_code, raw.content))
+
+
+class TestRouter(SimpleTestCase):
+    """The 'router/' cases resolve the same routes through Django's resolver and the router."""
+
+    def test_resolves_like_django(self):
+        stock, compiled = build_resolvers(1000)
+        for path_info in ('/api/resource0/', '/api/resource999/', '/api/resource999/42/'):
+            stock_match = stock.resolve(path_info)
+            compiled_match = compiled.resolve(path_info)
+            self.assertEqual(
+                (compiled_match.url_name, compiled_match.kwargs),
+                (stock_match.url_name, stock_match.kwargs))
+
+
+class TestImport(SimpleTestCase):
+    """
+    The 'import/small_view_set' case times the import; this checks what the
+    import leaves out.
+    """
+
+    def test_optional_modules_are_not_imported(self):
+        times = import_times('import django.http; import small_view_set')
+        self.assertIn('small_view_set', times)
+        for module in ('urllib.request', 'django.core.handlers.asgi', 'django.utils.cache',
+                       'small_view_set.caching', 'small_view_set.compression', 'small_view_set.execution'):
+            self.assertNotIn(module, times)
+
+    def test_lazy_exports(self):
+        import small_view_set
+        for name in small_view_set.__all__:
+            self.assertIsNotNone(getattr(small_view_set, name), name)
+        self.assertIn('EndpointCache', dir(small_view_set))
+        with self.assertRaises(AttributeError):
+            small_view_set.NotExported
+
+
+class TestBenchmarkSuite(SimpleTestCase):
+    """
+    Keeps `python tests/manage.py benchmark` working; the timings themselves are
+    only meaningful from the command, on a quiet machine.
+    """
+
+    def setUp(self):
+        # As in Django's test client, so the in-process handlers leave the test's
+        # database connection alone.
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        self.addCleanup(request_started.connect, close_old_connections)
+        self.addCleanup(request_finished.connect, close_old_connections)
+
+    def test_every_case_runs(self):
+        results = run_suite(number=5, warmup=1, repeat=1)
+        cases = results['cases']
+        for name in ('wrapper/sync', 'wrapper/async', 'preflight/options/async', 'preflight/head/sync',
+                     'json/parse_json_body/large', 'json/encode/small', 'harness/wsgi/async', 'harness/asgi/sync',
+                     'exception/legacy/Http404', 'router/compiled/api/resource999/42/', 'import/small_view_set'):
+            self.assertIn(name, cases)
+        for name in EXCEPTIONS:
+            self.assertIn(f'exception/{name}', cases)
+        self.assertTrue(all(case['p50_us'] <= case['p99_us'] for case in cases.values()))
+
+    def test_compare_flags_regressions(self):
+        baseline = {'cases': {'fast': {'p50_us': 10.0, 'p99_us': 20.0}, 'tail': {'p50_us': 10.0, 'p99_us': 20.0}}}
+        results = {'cases': {
+            'fast': {'p50_us': 20.0, 'p99_us': 20.0},
+            'tail': {'p50_us': 10.0, 'p99_us': 30.0},
+            'new': {'p50_us': 99.0, 'p99_us': 99.0},
+        }}
+        self.assertEqual(compare(results, baseline), ['fast'])
+        self.assertEqual(compare(results, baseline, p99_tolerance=0.25), ['fast', 'tail'])
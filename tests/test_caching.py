@@ -0,0 +1,209 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache as default_cache
+from django.contrib.auth.models import User
+from django.test import TestCase, Client, AsyncClient, RequestFactory, override_settings
+
+from small_view_set import EndpointCache, SmallJsonResponse
+from small_view_set.caching import CachedResponse, build_cache_layer
+from tests.cached_view_set import CachedViewSet, calls
+
+
+class TestEndpointCache(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        calls.clear()
+        for name in ('default', 'detail'):
+            getattr(CachedViewSet, name).endpoint_plan.cache.clear()
+
+    def test_hit_skips_the_endpoint(self):
+        first = self.client.get('/api/cached/', {'page': 1})
+        second = self.client.get('/api/cached/', {'page': 1})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertEqual(calls, ['list'])
+
+    def test_selected_query_params_are_in_the_key(self):
+        self.client.get('/api/cached/', {'page': 1})
+        self.client.get('/api/cached/', {'page': 1, 'ignored': 'x'})
+        self.client.get('/api/cached/', {'page': 2})
+        self.assertEqual(calls, ['list', 'list'])
+
+    def test_other_methods_bypass_the_cache(self):
+        self.client.get('/api/cached/')
+        self.client.post('/api/cached/')
+        self.assertEqual(calls, ['list', 'list'])
+
+    def test_vary(self):
+        self.client.get('/api/cached/1/', {'user': 'a'})
+        response = self.client.get('/api/cached/1/', {'user': 'b'})
+        self.assertEqual(response.json(), {'id': 1, 'user': 'b'})
+        self.client.get('/api/cached/1/', {'user': 'a'})
+        self.assertEqual(calls, ['detail', 'detail'])
+
+    def test_errors_are_not_cached(self):
+        self.client.get('/api/cached/404/')
+        response = self.client.get('/api/cached/404/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(calls, ['detail', 'detail'])
+
+    def test_concurrent_misses_are_coalesced(self):
+        request_factory = RequestFactory()
+        view_set = CachedViewSet()
+
+        def get(_):
+            request = request_factory.get('/api/cached/7/', {'sleep': '0.05'})
+            return view_set.detail(request, pk=7).content
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            bodies = list(pool.map(get, range(5)))
+        self.assertEqual(calls, ['detail'])
+        self.assertEqual(len(set(bodies)), 1)
+        self.assertEqual(CachedViewSet.detail.endpoint_plan.cache._flights, {})
+
+    def test_concurrent_uncacheable_misses_run_concurrently(self):
+        request_factory = RequestFactory()
+        view_set = CachedViewSet()
+
+        def get(_):
+            request = request_factory.get('/api/cached/404/', {'sleep': '0.1'})
+            return view_set.detail(request, pk=404).status_code
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            statuses = list(pool.map(get, range(4)))
+        # The leader's 404, then the three waiters together; not one after another.
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertEqual(statuses, [404] * 4)
+        self.assertEqual(calls, ['detail'] * 4)
+        self.assertEqual(CachedViewSet.detail.endpoint_plan.cache._flights, {})
+
+    def test_waiters_give_up_on_a_stuck_request(self):
+        release = threading.Event()
+        handled = []
+
+        def handler(viewset, request):
+            handled.append(threading.current_thread())
+            if len(handled) == 1:
+                release.wait(5)
+            return SmallJsonResponse({'calls': len(handled)})
+
+        cache = EndpointCache(public=True, wait_timeout=0.01)
+        cached_handler = build_cache_layer(handler, False, cache, 'stuck')
+        request_factory = RequestFactory()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            leader = pool.submit(cached_handler, None, request_factory.get('/stuck/'))
+            while not handled:
+                time.sleep(0.001)
+            response = cached_handler(None, request_factory.get('/stuck/'))
+            self.assertEqual(json.loads(response.content), {'calls': 2})
+            self.assertFalse(leader.done())
+            release.set()
+            leader.result()
+        self.assertEqual(cache._flights, {})
+
+    def test_entries_are_per_user_unless_public(self):
+        request_factory = RequestFactory()
+
+        def request_as(pk):
+            request = request_factory.get('/api/cached/')
+            request.user = type('User', (), {'pk': pk, 'is_authenticated': True})()
+            return request
+
+        private = EndpointCache()
+        self.assertNotEqual(
+            private.make_key('scope', request_as(1)),
+            private.make_key('scope', request_as(2)))
+        public = EndpointCache(public=True)
+        self.assertEqual(
+            public.make_key('scope', request_as(1)),
+            public.make_key('scope', request_as(2)))
+
+
+class TestEndpointCacheStorage(TestCase):
+
+    def entry(self, content: bytes) -> CachedResponse:
+        return CachedResponse(200, (('Content-Type', 'application/json'),), content, time.monotonic() + 60)
+
+    def test_lru_eviction_by_bytes(self):
+        cache = EndpointCache(max_bytes=250)
+        cache.set('a', self.entry(b'a' * 80))
+        cache.set('b', self.entry(b'b' * 80))
+        cache.get('a')
+        cache.set('c', self.entry(b'c' * 80))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertLessEqual(cache._size, 250)
+
+    def test_ttl(self):
+        cache = EndpointCache(ttl=60)
+        entry = self.entry(b'{}')
+        entry.expires = time.monotonic() - 1
+        cache.set('a', entry)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache._size, 0)
+
+    def test_uncacheable_responses(self):
+        cache = EndpointCache()
+        response = SmallJsonResponse({})
+        response.set_cookie('session', 'x')
+        self.assertIsNone(cache.entry_for(response))
+        self.assertIsNone(cache.entry_for(SmallJsonResponse({}, headers={'Cache-Control': 'no-store'})))
+        self.assertIsNotNone(cache.entry_for(SmallJsonResponse({})))
+
+    def test_unknown_vary(self):
+        with self.assertRaises(ValueError):
+            EndpointCache(vary='session')
+
+
+class TestAsyncEndpointCache(TestCase):
+
+    async def test_django_cache_backend_and_coalescing(self):
+        calls.clear()
+        await default_cache.aclear()
+        client = AsyncClient()
+        responses = await asyncio.gather(*[
+            client.get('/api/cached/async/3/', {'sleep': '0.05'}) for _ in range(5)
+        ])
+        self.assertEqual([response.status_code for response in responses], [200] * 5)
+        self.assertEqual({json.loads(response.content)['id'] for response in responses}, {3})
+        self.assertEqual(calls, ['async_detail'])
+        self.assertEqual(len(CachedViewSet.async_detail.endpoint_plan.cache._singleflight), 0)
+
+        response = await client.get('/api/cached/async/3/', {'sleep': '0.05'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(calls, ['async_detail'])
+
+
+@override_settings(MIDDLEWARE=[
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+])
+class TestAsyncEndpointCacheWithSessions(TestCase):
+
+    def setUp(self):
+        calls.clear()
+        CachedViewSet.me.endpoint_plan.cache.clear()
+        self.bar = User.objects.create_user('bar', password='secret')
+        self.baz = User.objects.create_user('baz', password='secret')
+
+    async def test_user_vary_on_async_endpoint(self):
+        bar = AsyncClient()
+        await bar.aforce_login(self.bar)
+        baz = AsyncClient()
+        await baz.aforce_login(self.baz)
+        for client, username in ((bar, 'bar'), (baz, 'baz'), (bar, 'bar')):
+            response = await client.get('/api/cached/me/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {'username': username})
+        response = await AsyncClient().get('/api/cached/me/')
+        self.assertEqual(response.json(), {'username': ''})
+        self.assertEqual(calls, ['me', 'me', 'me'])
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, AsyncClient, override_settings
+
+from small_view_set import SmallViewSet, SmallViewSetConfig, default_exception_handler, endpoint
+from small_view_set.coalescing import Singleflight
+from tests.coalescing_view_set import calls
+
+
+handled = []
+
+
+def recording_exception_handler(request, endpoint_name, exception):
+    handled.append((endpoint_name, type(exception)))
+    return default_exception_handler(request, endpoint_name, exception)
+
+
+class TestCoalescing(TestCase):
+
+    def setUp(self):
+        calls.clear()
+        handled.clear()
+        self.client = AsyncClient()
+
+    async def gather(self, path, count=5, **params):
+        return await asyncio.gather(*[self.client.get(path, params) for _ in range(count)])
+
+    async def test_identical_requests_share_one_run(self):
+        responses = await self.gather('/api/coalescing/')
+        self.assertEqual(calls, ['list'])
+        self.assertEqual([response.status_code for response in responses], [200] * 5)
+        self.assertEqual({json.loads(response.content)['calls'] for response in responses}, {1})
+        self.assertEqual(len({id(response) for response in responses}), 5)
+
+    async def test_different_keys_run_separately(self):
+        await asyncio.gather(
+            self.client.get('/api/coalescing/', {'a': 1}),
+            self.client.get('/api/coalescing/', {'a': 2}))
+        self.assertEqual(calls, ['list', 'list'])
+
+    async def test_credential_headers_are_part_of_the_default_key(self):
+        await asyncio.gather(
+            self.client.get('/api/coalescing/', headers={'Authorization': 'Bearer one'}),
+            self.client.get('/api/coalescing/', headers={'Authorization': 'Bearer one'}),
+            self.client.get('/api/coalescing/', headers={'Authorization': 'Bearer two'}))
+        self.assertEqual(calls, ['list', 'list'])
+
+    async def test_custom_key(self):
+        await asyncio.gather(
+            self.client.get('/api/coalescing/1/'),
+            self.client.get('/api/coalescing/2/'))
+        self.assertEqual(calls, ['detail'])
+
+    @override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(exception_handler=recording_exception_handler))
+    async def test_exceptions_reach_every_caller(self):
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions', level='ERROR'):
+            responses = await self.gather('/api/coalescing/', fail=1)
+        self.assertEqual(calls, ['list'])
+        self.assertEqual([response.status_code for response in responses], [500] * 5)
+        self.assertEqual(handled, [('default', RuntimeError)] * 5)
+
+    async def test_responses_with_cookies_are_not_shared(self):
+        responses = await self.gather('/api/coalescing/', count=3, cookie=1)
+        self.assertEqual(calls, ['list'] * 3)
+        self.assertTrue(all('seen' in response.cookies for response in responses))
+
+    def test_sync_endpoints_are_rejected(self):
+        with self.assertRaises(ValueError):
+            class SyncViewSet(SmallViewSet):
+                @endpoint(allowed_methods=['GET'], coalesce=True)
+                def default(self, request):
+                    pass
+
+
+@override_settings(MIDDLEWARE=[
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+])
+class TestCoalescingWithSessions(TestCase):
+
+    def setUp(self):
+        calls.clear()
+        self.bar = User.objects.create_user('bar', password='secret')
+        self.baz = User.objects.create_user('baz', password='secret')
+
+    async def test_default_key_loads_the_user_off_the_event_loop(self):
+        bar = AsyncClient()
+        await bar.aforce_login(self.bar)
+        baz = AsyncClient()
+        await baz.aforce_login(self.baz)
+        responses = await asyncio.gather(
+            bar.get('/api/coalescing/'),
+            bar.get('/api/coalescing/'),
+            baz.get('/api/coalescing/'))
+        self.assertEqual([response.status_code for response in responses], [200] * 3)
+        self.assertEqual(calls, ['list', 'list'])
+
+
+class TestSingleflight(TestCase):
+
+    async def test_cancelled_caller_does_not_cancel_the_call(self):
+        singleflight = Singleflight()
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        first = asyncio.ensure_future(singleflight.do('key', work))
+        await started.wait()
+        second = asyncio.ensure_future(singleflight.do('key', work))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, ('done', True))
+        self.assertEqual(len(singleflight), 0)
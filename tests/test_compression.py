@@ -0,0 +1,90 @@
+import gzip
+import json
+import zlib
+from unittest import mock
+
+from django.test import TestCase, Client, AsyncClient
+
+from small_view_set import Compression
+from small_view_set.caching import CachedResponse
+from tests.compression_view_set import CompressionViewSet, calls
+
+
+class TestCompression(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        calls.clear()
+        CompressionViewSet.cached.endpoint_plan.cache.clear()
+
+    def test_gzip(self):
+        response = self.client.get('/api/compression/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), 50)
+
+    def test_negotiation(self):
+        compression = Compression(algorithms=['gzip', 'deflate'])
+        self.assertEqual(compression.negotiate('deflate, gzip'), 'gzip')
+        self.assertEqual(compression.negotiate('gzip;q=0.5, deflate'), 'deflate')
+        self.assertEqual(compression.negotiate('gzip;q=0, *'), 'deflate')
+        self.assertIsNone(compression.negotiate('identity'))
+        self.assertIsNone(compression.negotiate(''))
+
+    def test_uncompressed_when_not_accepted_or_too_small(self):
+        response = self.client.get('/api/compression/')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        response = self.client.get('/api/compression/', {'count': 1}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.json(), {'results': [{'id': 0, 'name': 'bar 0'}]})
+
+    def test_error_responses_are_not_compressed(self):
+        response = self.client.get('/api/compression/404/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_cached_body_is_compressed_once(self):
+        with mock.patch('small_view_set.compression.gzip.compress', wraps=gzip.compress) as compress:
+            for _ in range(3):
+                response = self.client.get('/api/compression/cached/', HTTP_ACCEPT_ENCODING='gzip')
+                self.assertEqual(json.loads(gzip.decompress(response.content)), {'text': 'y' * 1000})
+        self.assertEqual(calls, ['cached'])
+        # The first response is compressed before it is cached; every hit after
+        # the first one reuses the entry's compressed body.
+        self.assertEqual(compress.call_count, 2)
+        response = self.client.get('/api/compression/cached/')
+        self.assertEqual(response.json(), {'text': 'y' * 1000})
+
+    def test_streaming_gzip(self):
+        response = self.client.get('/api/compression/stream/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(json.loads(body), [{'id': i} for i in range(100)])
+
+    def test_strong_etag_is_weakened(self):
+        compression = Compression(algorithms=['gzip'], min_size=0)
+        entry = CachedResponse(200, (('Content-Type', 'application/json'), ('ETag', '"abc"')), b'{}' * 100, 0)
+        request = mock.Mock(META={'HTTP_ACCEPT_ENCODING': 'gzip'})
+        response = compression.compress_response(request, entry.to_response())
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertIn('gzip', entry.encodings)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            Compression(algorithms=['lzma'])
+
+
+class TestAsyncCompression(TestCase):
+
+    async def test_async_endpoint(self):
+        response = await AsyncClient().get('/api/compression/1/', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['id'], 1)
+
+    async def test_async_streaming_deflate(self):
+        response = await AsyncClient().get('/api/compression/astream/', headers={'Accept-Encoding': 'deflate'})
+        self.assertEqual(response['Content-Encoding'], 'deflate')
+        body = zlib.decompress(b''.join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual(json.loads(body), [{'id': i} for i in range(100)])
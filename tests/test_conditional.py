@@ -0,0 +1,96 @@
+from django.test import TestCase, Client, AsyncClient
+from django.urls import reverse
+
+from tests.conditional_view_set import calls
+
+
+class TestConditionalGet(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        calls.clear()
+
+    def test_etag_and_last_modified_are_set(self):
+        response = self.client.get(reverse('conditional_detail', args=[1]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"3"')
+        self.assertEqual(response['Last-Modified'], 'Tue, 02 Jan 2024 00:00:00 GMT')
+
+    def test_matching_etag_skips_the_endpoint(self):
+        response = self.client.get(reverse('conditional_detail', args=[1]), HTTP_IF_NONE_MATCH='"3"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], '"3"')
+        self.assertEqual(calls, [])
+
+    def test_stale_etag_runs_the_endpoint(self):
+        response = self.client.get(reverse('conditional_detail', args=[1]), HTTP_IF_NONE_MATCH='"2"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(calls, ['detail'])
+
+    def test_if_modified_since(self):
+        url = reverse('conditional_detail', args=[1])
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Wed, 03 Jan 2024 00:00:00 GMT')
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2024 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_version_falls_through(self):
+        response = self.client.get(reverse('conditional_detail', args=[99]), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(calls, ['detail'])
+
+    def test_other_methods_are_not_conditional(self):
+        response = self.client.patch(reverse('conditional_detail', args=[1]), HTTP_IF_NONE_MATCH='"3"')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+    def test_auto_etag(self):
+        url = reverse('conditional_collection')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_plain_endpoint_has_no_layer(self):
+        from tests.basic_crud_view_set import BasicCrudViewSet
+        plan = BasicCrudViewSet.detail.endpoint_plan
+        self.assertFalse(plan.conditional)
+
+
+    def test_protect_runs_before_validators(self):
+        url = reverse('conditional_protected_detail', args=[1])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"3"')
+        self.assertEqual(response.status_code, 401)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"3"', HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(calls, ['protected_detail'])
+
+
+class TestAsyncConditionalGet(TestCase):
+
+    async def test_async_etag_callable(self):
+        calls.clear()
+        client = AsyncClient()
+        url = reverse('conditional_async_detail', args=[1])
+        response = await client.get(url, headers={'If-None-Match': '"3"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(calls, [])
+        response = await client.get(url, headers={'If-None-Match': '"1"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"3"')
+        self.assertEqual(calls, ['async_detail'])
+
+    async def test_async_protect_runs_before_validators(self):
+        calls.clear()
+        client = AsyncClient()
+        url = reverse('conditional_aprotected_detail', args=[1])
+        response = await client.get(url, headers={'If-None-Match': '"3"'})
+        self.assertEqual(response.status_code, 401)
+        response = await client.get(url, headers={'If-None-Match': '"3"', 'Authorization': 'Bearer token'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(calls, [])
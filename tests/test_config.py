@@ -0,0 +1,37 @@
+from django.http import JsonResponse
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from small_view_set import SmallViewSetConfig, get_config
+
+
+def teapot_exception_handler(request, endpoint_name, exception):
+    return JsonResponse({'endpoint': endpoint_name}, status=418)
+
+
+class TestConfigResolution(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_config_is_cached(self):
+        self.assertIs(get_config(), get_config())
+
+    def test_override_settings_replaces_cached_config(self):
+        before = get_config()
+        config = SmallViewSetConfig(exception_handler=teapot_exception_handler)
+        with override_settings(SMALL_VIEW_SET_CONFIG=config):
+            self.assertIs(get_config(), config)
+            response = self.client.patch(
+                reverse('custom_detail', args=[1]),
+                data={},
+                content_type='application/json')
+            self.assertEqual(response.status_code, 418)
+            self.assertEqual(response.json()['endpoint'], 'detail')
+        self.assertIs(get_config(), before)
+
+    def test_missing_setting_falls_back_to_default(self):
+        with override_settings(SMALL_VIEW_SET_CONFIG=None):
+            config = get_config()
+            self.assertIsInstance(config, SmallViewSetConfig)
+            self.assertIs(get_config(), config)
@@ -1,6 +1,9 @@
-from django.test import TestCase, Client, AsyncClient
+from django.http import JsonResponse
+from django.test import TestCase, Client, AsyncClient, override_settings
 from django.urls import reverse
 
+from small_view_set import SmallViewSetConfig, make_options_and_head_handler
+
 class TestCustomEndpointsViewSet(TestCase):
 
     def setUp(self):
@@ -69,4 +72,41 @@ class TestCustomEndpointsViewSet(TestCase):
     def test_invalid_method_on_custom_detail(self):
         endpoint = reverse('custom_detail_put', args=[1])
         response = self.client.delete(endpoint)
-        self.assertEqual(response.status_code, 405)
\ No newline at end of file
+        self.assertEqual(response.status_code, 405)
+
+class TestOptionsAndHeadTemplates(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_options_response_matches_json_response(self):
+        expected = JsonResponse(data=None, safe=False, status=200, content_type='application/json')
+        response = self.client.options(reverse('custom_detail', args=[2]))
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response['Content-Type'], expected['Content-Type'])
+        self.assertEqual(response['Allow'], 'PUT, PATCH')
+        self.assertNotIn('Access-Control-Max-Age', response)
+
+    def test_each_request_gets_its_own_response(self):
+        endpoint = reverse('custom_collection')
+        first = self.client.options(endpoint)
+        first['X-Mutated'] = 'yes'
+        second = self.client.options(endpoint)
+        self.assertNotIn('X-Mutated', second)
+
+    @override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(
+        options_and_head_handler=make_options_and_head_handler(
+            access_control_max_age=600,
+            cors_headers={'Access-Control-Allow-Origin': '*'})))
+    def test_cors_preflight_headers(self):
+        endpoint = reverse('custom_detail', args=[2])
+        response = self.client.options(endpoint)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Access-Control-Max-Age'], '600')
+        self.assertEqual(response['Access-Control-Allow-Methods'], 'PUT, PATCH')
+        self.assertEqual(response['Access-Control-Allow-Origin'], '*')
+        response = self.client.head(endpoint)
+        self.assertEqual(response['Allow'], 'PUT, PATCH')
+        self.assertNotIn('Access-Control-Max-Age', response)
+        response = self.client.get(endpoint)
+        self.assertEqual(response.status_code, 405)
@@ -0,0 +1,127 @@
+import asyncio
+
+from django.test import TestCase, AsyncClient, override_settings
+
+from small_view_set import SmallViewSetConfig, current_deadline, endpoint
+from small_view_set.deadline import run_with_deadline
+from small_view_set.exceptions import GatewayTimeout
+
+
+class TestDeadline(TestCase):
+
+    def setUp(self):
+        self.client = AsyncClient()
+
+    async def test_timeout(self):
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions', 'WARNING') as logs:
+            response = await self.client.get('/api/deadline/slow/')
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.json(), {'errors': 'Gateway timeout'})
+        self.assertIn('slow exceeded its 0.05s deadline', logs.output[0])
+
+    async def test_within_timeout(self):
+        response = await self.client.get('/api/deadline/slow/', {'sleep': 0})
+        self.assertEqual(response.status_code, 200)
+
+    async def test_remaining_budget(self):
+        response = await self.client.get('/api/deadline/budget/')
+        data = response.json()
+        self.assertEqual(data['timeout'], 5)
+        self.assertTrue(4 < data['remaining'] <= 5)
+
+    async def test_pooled_sync_endpoint_sees_deadline(self):
+        response = await self.client.get('/api/deadline/pooled/')
+        self.assertTrue(4 < response.json()['remaining'] < 5)
+
+    async def test_config_default(self):
+        response = await self.client.get('/api/deadline/default/')
+        self.assertEqual(response.json(), {'timeout': None})
+        with override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(default_timeout=0.05)):
+            response = await self.client.get('/api/deadline/default/')
+            self.assertEqual(response.json(), {'timeout': 0.05})
+            with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions', 'WARNING'):
+                response = await self.client.get('/api/deadline/default/', {'sleep': 1})
+            self.assertEqual(response.status_code, 504)
+            response = await self.client.get('/api/deadline/unlimited/')
+            self.assertEqual(response.json(), {'deadline': False})
+
+    async def test_handler_timeout_error_is_not_a_deadline(self):
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions', 'ERROR'):
+            response = await self.client.get('/api/deadline/own/')
+        self.assertEqual(response.status_code, 500)
+
+    def test_sync_endpoints_rejected(self):
+        with self.assertRaises(ValueError):
+            @endpoint(allowed_methods=['GET'], timeout=1)
+            def detail(self, request):
+                pass
+        with self.assertRaises(ValueError):
+            @endpoint(allowed_methods=['GET'], timeout=0)
+            async def adetail(self, request):
+                pass
+
+
+class TestRunWithDeadline(TestCase):
+
+    async def test_nested_deadlines_never_extend(self):
+        async def inner():
+            return current_deadline().timeout
+
+        async def outer():
+            return await run_with_deadline(inner(), 10, False)
+
+        self.assertLessEqual(await run_with_deadline(outer(), 1, False), 1)
+
+    async def test_cancelled_caller_cancels_handler(self):
+        finished = asyncio.Event()
+
+        async def handler():
+            await asyncio.sleep(0.05)
+            finished.set()
+
+        caller = asyncio.ensure_future(run_with_deadline(handler(), None, False))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0.1)
+        self.assertFalse(finished.is_set())
+
+    async def test_shielded_handler_finishes_after_disconnect(self):
+        finished = asyncio.Event()
+
+        async def handler():
+            await asyncio.sleep(0.05)
+            finished.set()
+
+        # Django cancels the request's task when an ASGI client disconnects.
+        caller = asyncio.ensure_future(run_with_deadline(handler(), None, True))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+        await asyncio.wait_for(finished.wait(), 1)
+
+    async def test_shielded_handler_still_bounded_by_deadline(self):
+        cancelled = asyncio.Event()
+
+        async def handler():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.ensure_future(run_with_deadline(handler(), 0.05, True))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    async def test_shielded_timeout(self):
+        async def handler():
+            await asyncio.sleep(1)
+
+        with self.assertRaises(GatewayTimeout):
+            await run_with_deadline(handler(), 0.01, True)
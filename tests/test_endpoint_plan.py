@@ -0,0 +1,40 @@
+from django.test import TestCase, Client, RequestFactory
+from django.urls import reverse
+
+from small_view_set import default_options_and_head_handler
+from small_view_set.plan import AllowedMethods
+from tests.custom_endpoints_view_set import CustomEndpointsViewSet
+
+
+class TestEndpointPlan(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_plan_is_compiled_at_decoration_time(self):
+        plan = CustomEndpointsViewSet.detail.endpoint_plan
+        self.assertEqual(plan.func_name, 'detail')
+        self.assertFalse(plan.is_async)
+        self.assertEqual(plan.allowed_methods.methods, frozenset({'PUT', 'PATCH'}))
+        self.assertEqual(plan.allowed_methods.header, 'PUT, PATCH')
+        self.assertFalse(plan.strips_none_pk)
+        self.assertTrue(CustomEndpointsViewSet.dog.endpoint_plan.is_async)
+        self.assertTrue(CustomEndpointsViewSet.collection.endpoint_plan.strips_none_pk)
+
+    def test_allowed_methods_behaves_like_the_declared_list(self):
+        allowed_methods = AllowedMethods(['GET', 'POST'])
+        self.assertEqual(list(allowed_methods), ['GET', 'POST'])
+        self.assertEqual(', '.join(allowed_methods), allowed_methods.header)
+        self.assertIn('POST', allowed_methods)
+        self.assertNotIn('PUT', allowed_methods)
+
+    def test_allow_header_keeps_declared_order(self):
+        response = self.client.options(reverse('basic_crud_details', args=[1]))
+        self.assertEqual(response['Allow'], 'GET, PUT, DELETE')
+
+    def test_same_methods_in_another_order_get_their_own_header(self):
+        request = RequestFactory().options('/')
+        get_post = default_options_and_head_handler(request, AllowedMethods(['GET', 'POST']))
+        post_get = default_options_and_head_handler(request, AllowedMethods(['POST', 'GET']))
+        self.assertEqual(get_post['Allow'], 'GET, POST')
+        self.assertEqual(post_get['Allow'], 'POST, GET')
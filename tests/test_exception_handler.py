@@ -0,0 +1,128 @@
+import json
+
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied, SuspiciousOperation
+from django.http import Http404, JsonResponse
+from django.test import SimpleTestCase, RequestFactory, override_settings
+
+from small_view_set import (
+    BadRequest,
+    EndpointDisabledException,
+    MethodNotAllowed,
+    Unauthorized,
+    default_exception_handler,
+    get_config,
+    register_exception_response,
+)
+from small_view_set import helpers
+from tests.legacy_exception_handler import legacy_exception_handler
+
+
+class ValueErrorWithDetail(ValueError):
+    detail = {'field': ['This field is required.']}
+
+
+class ValueErrorWithMessage(ValueError):
+    message = 'Value error message'
+
+
+class StatusCodeException(Exception):
+    def __init__(self, status_code, message=None):
+        self.status_code = status_code
+        if message is not None:
+            self.message = message
+        super().__init__(message)
+
+
+class DetailException(Exception):
+    status_code = 422
+    detail = ['first error', 'second error']
+
+
+class TeapotException(Exception):
+    pass
+
+
+def all_exceptions():
+    return [
+        json.JSONDecodeError('Expecting value', '', 0),
+        TypeError('bad type'),
+        ValueError('bad value'),
+        ValueErrorWithDetail(),
+        ValueErrorWithMessage(),
+        Unauthorized('Authorization header is missing'),
+        PermissionDenied(),
+        SuspiciousOperation(),
+        Http404(),
+        ObjectDoesNotExist(),
+        EndpointDisabledException(),
+        MethodNotAllowed(method='DELETE'),
+        BadRequest('Name is required'),
+        BadRequest({'name': ['required']}),
+        StatusCodeException(400),
+        StatusCodeException(404, 'Missing thing'),
+        StatusCodeException(409, 'Conflict happened'),
+        StatusCodeException(418),
+        StatusCodeException(429),
+        StatusCodeException(503, 'Down for maintenance'),
+        DetailException(),
+        KeyError('secret'),
+        RuntimeError('boom'),
+    ]
+
+
+class TestDefaultExceptionHandler(SimpleTestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+
+    def assert_same_as_legacy(self):
+        for exception in all_exceptions():
+            with self.subTest(exception=repr(exception)):
+                with self.assertLogs(helpers._logger, 'DEBUG') as new_logs:
+                    helpers._logger.debug('marker')
+                    response = default_exception_handler(self.request, 'detail', exception)
+                with self.assertLogs(helpers._logger, 'DEBUG') as legacy_logs:
+                    helpers._logger.debug('marker')
+                    expected = legacy_exception_handler(self.request, 'detail', exception)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response.items(), expected.items())
+                self.assertEqual(new_logs.output, legacy_logs.output)
+
+    @override_settings(DEBUG=True)
+    def test_matches_legacy_handler_with_debug(self):
+        self.assert_same_as_legacy()
+
+    @override_settings(DEBUG=False)
+    def test_matches_legacy_handler_without_debug(self):
+        self.assert_same_as_legacy()
+
+    def test_resolution_is_memoized_per_class(self):
+        default_exception_handler(self.request, 'detail', Http404())
+        self.assertIs(
+            helpers._resolved_exception_responses[Http404],
+            helpers._resolve_exception_response(Http404))
+
+    def test_register_exception_response(self):
+        def teapot_response(request, endpoint_name, exception):
+            return JsonResponse({'errors': 'Teapot'}, status=418)
+
+        with self.assertLogs(helpers._logger, 'ERROR'):
+            default_exception_handler(self.request, 'detail', TeapotException())
+        register_exception_response(TeapotException)(teapot_response)
+        try:
+            response = default_exception_handler(self.request, 'detail', TeapotException())
+            self.assertEqual(response.status_code, 418)
+        finally:
+            del helpers._EXCEPTION_RESPONSES[TeapotException]
+            helpers._resolved_exception_responses.clear()
+
+    def test_static_error_bodies_are_pre_encoded(self):
+        templates = helpers._static_error_responses_for(get_config().json_dumps)
+        template = templates[(404, 'Not found')]
+        self.assertEqual(template.content, b'{"errors": "Not found"}')
+        first = helpers.error_response(404, 'Not found')
+        first['X-Request-Id'] = 'abc'
+        second = helpers.error_response(404, 'Not found')
+        self.assertNotIn('X-Request-Id', second)
+        self.assertEqual(second.content, template.content)
@@ -0,0 +1,118 @@
+import asyncio
+import contextvars
+import json
+import threading
+
+from django.test import TestCase, AsyncClient, Client
+
+from small_view_set import ExecutorGroup, SmallViewSet, endpoint, executor_group, executor_group_stats
+from small_view_set.execution import ServiceUnavailable
+# Sizes the test groups before a test looks one up by name.
+from tests import execution_view_set  # noqa: F401
+
+
+class TestExecutionPolicies(TestCase):
+
+    def setUp(self):
+        self.client = AsyncClient()
+
+    async def get_thread(self, path):
+        response = await self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)['thread']
+
+    async def test_pool_runs_on_its_group(self):
+        thread = await self.get_thread('/api/execution/pool/')
+        self.assertTrue(thread.startswith('small-view-set-tests-wide'))
+        self.assertEqual(executor_group('tests-wide').active, 0)
+
+    async def test_thread_sensitive(self):
+        thread = await self.get_thread('/api/execution/thread_sensitive/')
+        self.assertFalse(thread.startswith('small-view-set-'))
+
+    async def test_run_sync_from_async_endpoint(self):
+        thread = await self.get_thread('/api/execution/orchestrator/')
+        self.assertTrue(thread.startswith('small-view-set-tests-wide'))
+
+    async def test_full_group_answers_503(self):
+        group = executor_group('tests-narrow')
+        rejected = group.rejected
+        responses = await asyncio.gather(
+            self.client.get('/api/execution/narrow/'),
+            self.client.get('/api/execution/narrow/'))
+        self.assertEqual(sorted(response.status_code for response in responses), [200, 503])
+        self.assertEqual(group.rejected, rejected + 1)
+        self.assertEqual(executor_group_stats()['tests-narrow']['rejected'], rejected + 1)
+
+    def test_pool_endpoint_under_wsgi(self):
+        response = Client().get('/api/execution/pool/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['thread'].startswith('small-view-set-tests-wide'))
+
+    def test_invalid_policies(self):
+        with self.assertRaises(ValueError):
+            endpoint(allowed_methods=['GET'], execution='fork')(lambda self, request: None)
+        with self.assertRaises(ValueError):
+            class AsyncViewSet(SmallViewSet):
+                @endpoint(allowed_methods=['GET'], execution='pool')
+                async def default(self, request):
+                    pass
+
+    def test_resizing_a_group_is_rejected(self):
+        with self.assertRaises(ValueError):
+            executor_group('tests-narrow', max_workers=4)
+
+
+class TestExecutorGroup(TestCase):
+
+    def setUp(self):
+        self.group = ExecutorGroup('unit', max_workers=1, max_queue=1)
+        self.addCleanup(self.group.shutdown)
+
+    def test_queue_bound_and_counters(self):
+        release = threading.Event()
+        running = threading.Event()
+
+        def block():
+            running.set()
+            release.wait(5)
+
+        first = self.group.submit(block)
+        running.wait(5)
+        second = self.group.submit(lambda: 'queued')
+        self.assertEqual((self.group.active, self.group.queued), (1, 1))
+        self.assertEqual(self.group.saturation, 2.0)
+        with self.assertRaises(ServiceUnavailable):
+            self.group.submit(lambda: None)
+        release.set()
+        first.result(5)
+        self.assertEqual(second.result(5), 'queued')
+        self.assertEqual(self.group.stats(), {
+            'queued': 0, 'active': 0, 'completed': 2, 'rejected': 1, 'saturation': 0.0})
+
+    async def test_call_cancelled_while_queued_leaves_the_queue(self):
+        release = threading.Event()
+        running = threading.Event()
+
+        def block():
+            running.set()
+            release.wait(5)
+
+        first = self.group.submit(block)
+        await asyncio.to_thread(running.wait, 5)
+        queued = asyncio.ensure_future(self.group.run(lambda: 'never'))
+        await asyncio.sleep(0)
+        self.assertEqual(self.group.queued, 1)
+        queued.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+        self.assertEqual((self.group.active, self.group.queued), (1, 0))
+        release.set()
+        await asyncio.wrap_future(first)
+        self.assertEqual(self.group.stats(), {
+            'queued': 0, 'active': 0, 'completed': 1, 'rejected': 0, 'saturation': 0.0})
+
+    def test_context_is_copied(self):
+        variable = contextvars.ContextVar('variable')
+        variable.set('from caller')
+        self.assertEqual(self.group.submit(variable.get).result(5), 'from caller')
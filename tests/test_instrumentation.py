@@ -0,0 +1,108 @@
+from django.test import TestCase, Client, AsyncClient, override_settings
+from django.urls import reverse
+
+from small_view_set import EndpointTiming, SmallViewSet, SmallViewSetConfig
+from small_view_set.config import get_config
+from small_view_set.instrumentation import instrument_protect_methods, uninstrument_protect_methods
+from tests.basic_crud_view_set import BasicCrudViewSet
+from tests.custom_protections_view_set import AppViewSet
+
+
+timings = []
+
+config = SmallViewSetConfig(instrumentation_hooks=[timings.append])
+
+
+@override_settings(SMALL_VIEW_SET_CONFIG=config)
+class TestInstrumentationHooks(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        timings.clear()
+
+    def test_sync_endpoint(self):
+        response = self.client.get(reverse('basic_crud_details', args=[1]))
+        self.assertEqual(response.status_code, 200)
+        [timing] = timings
+        self.assertIsInstance(timing, EndpointTiming)
+        self.assertEqual(timing.viewset, 'BasicCrudViewSet')
+        self.assertEqual(timing.endpoint, 'detail')
+        self.assertEqual(timing.method, 'GET')
+        self.assertEqual(timing.status, 200)
+        self.assertGreater(timing.total, 0)
+        self.assertGreater(timing.protect, 0)
+        self.assertEqual(timing.exception_handler, 0)
+        self.assertGreaterEqual(
+            timing.total,
+            timing.pre_handler + timing.protect + timing.body + timing.exception_handler)
+
+    async def test_async_endpoint(self):
+        response = await AsyncClient().get(reverse('basic_crud_collection'))
+        self.assertEqual(response.status_code, 200)
+        [timing] = timings
+        self.assertEqual(timing.endpoint, 'collection')
+        self.assertEqual(timing.status, 200)
+        self.assertGreater(timing.protect, 0)
+
+    def test_exception_in_protect(self):
+        response = self.client.post(
+            reverse('custom_protections_collection'),
+            data={},
+            content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+        [timing] = timings
+        self.assertEqual(timing.status, 401)
+        self.assertGreater(timing.protect, 0)
+        self.assertGreater(timing.exception_handler, 0)
+
+    def test_method_not_allowed_in_pre_handler(self):
+        response = self.client.get(reverse('custom_collection'))
+        self.assertEqual(response.status_code, 405)
+        [timing] = timings
+        self.assertEqual(timing.status, 405)
+        self.assertGreater(timing.pre_handler, 0)
+        self.assertEqual(timing.body, 0)
+
+    def test_failing_hook_does_not_break_the_response(self):
+        def broken_hook(timing):
+            raise RuntimeError('metrics backend is down')
+
+        with override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(instrumentation_hooks=[broken_hook])):
+            with self.assertLogs('django-small-view-set.instrumentation', 'ERROR'):
+                response = self.client.get(reverse('basic_crud_details', args=[1]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_protect_methods_are_wrapped_once(self):
+        class Untimed(AppViewSet):
+            def protect_create(self, request):
+                super().protect_create(request)
+
+        self.assertFalse(hasattr(Untimed.__dict__['protect_create'], '_small_view_set_timed'))
+        instrument_protect_methods(Untimed)
+        instrument_protect_methods(Untimed)
+        self.assertTrue(Untimed.protect_create._small_view_set_timed)
+        self.assertFalse(hasattr(Untimed.protect_create.__wrapped__, '__wrapped__'))
+
+    def test_only_the_served_class_is_wrapped(self):
+        class Untimed(AppViewSet):
+            pass
+
+        instrument_protect_methods(Untimed)
+        self.assertTrue(Untimed.__dict__['protect_create']._small_view_set_timed)
+        self.assertFalse(hasattr(AppViewSet.__dict__['protect_create'], '_small_view_set_timed'))
+        self.assertFalse(hasattr(SmallViewSet.protect_create, '_small_view_set_timed'))
+        uninstrument_protect_methods()
+        self.assertNotIn('protect_create', Untimed.__dict__)
+
+    def test_endpoints_follow_the_config(self):
+        detail = BasicCrudViewSet.detail.endpoint_plan
+        self.client.get(reverse('basic_crud_details', args=[1]))
+        self.assertTrue(detail.timed)
+        self.assertTrue(BasicCrudViewSet.protect_retrieve._small_view_set_timed)
+
+        with override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig()):
+            get_config()
+            self.assertFalse(detail.timed)
+            self.assertFalse(hasattr(BasicCrudViewSet.protect_retrieve, '_small_view_set_timed'))
+            self.client.get(reverse('basic_crud_details', args=[1]))
+        self.assertEqual(len(timings), 1)
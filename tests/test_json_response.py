@@ -0,0 +1,63 @@
+import datetime
+import decimal
+import json
+import uuid
+from unittest import skipUnless
+
+from django.http import Http404, JsonResponse
+from django.test import SimpleTestCase, RequestFactory, override_settings
+
+from small_view_set import SmallJsonResponse, SmallViewSetConfig, default_exception_handler
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def sample_row():
+    return {
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'price': decimal.Decimal('9.99'),
+        'created_at': datetime.datetime(2024, 10, 2, 12, 30, tzinfo=datetime.timezone.utc),
+        'name': 'Bar',
+    }
+
+
+class TestSmallJsonResponse(SimpleTestCase):
+
+    def test_default_encoder_matches_json_response(self):
+        data = {'results': [sample_row(), sample_row()]}
+        response = SmallJsonResponse(data, status=201)
+        expected = JsonResponse(data, status=201)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], expected['Content-Type'])
+
+    def test_safe_rejects_non_dict_data(self):
+        with self.assertRaises(TypeError):
+            SmallJsonResponse([1, 2, 3])
+        self.assertEqual(SmallJsonResponse([1, 2, 3], safe=False).content, b'[1, 2, 3]')
+
+    @skipUnless(orjson, 'orjson is not installed')
+    @override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(json_encoder='orjson'))
+    def test_orjson_encoder(self):
+        response = SmallJsonResponse({'results': [sample_row()]})
+        self.assertEqual(json.loads(response.content), {'results': [{
+            'id': '12345678-1234-5678-1234-567812345678',
+            'price': '9.99',
+            'created_at': '2024-10-02T12:30:00+00:00',
+            'name': 'Bar',
+        }]})
+
+    @skipUnless(orjson, 'orjson is not installed')
+    @override_settings(DEBUG=False, SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(json_encoder='orjson'))
+    def test_library_responses_use_configured_encoder(self):
+        request = RequestFactory().get('/')
+        response = default_exception_handler(request, 'detail', Http404())
+        self.assertEqual(response.content, b'null')
+        exception = Exception()
+        exception.status_code = 404
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions'):
+            response = default_exception_handler(request, 'detail', exception)
+        self.assertEqual(response.content, b'{"errors":"Not found"}')
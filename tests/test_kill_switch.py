@@ -0,0 +1,129 @@
+from unittest import mock
+
+from django.core.cache import cache, caches
+from django.test import TestCase, Client, AsyncClient, override_settings
+
+from small_view_set import KillSwitch, SmallJsonResponse, SmallViewSetConfig
+from small_view_set.exceptions import EndpointDisabledException
+from tests.kill_switch_view_set import KillSwitchViewSet
+
+
+REPORT = 'tests.kill_switch_view_set.KillSwitchViewSet.report'
+
+
+class TestEndpointDisabled(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_folded_into_the_endpoint_plan(self):
+        plan = KillSwitchViewSet.archived.endpoint_plan
+        self.assertTrue(plan.disabled)
+        self.assertEqual(plan.func.__name__, 'archived')
+        self.assertFalse(hasattr(plan.func, '_small_view_set_disabled'))
+        self.assertFalse(KillSwitchViewSet.report.endpoint_plan.disabled)
+
+    def test_disabled(self):
+        response = self.client.get('/api/kill_switch/archived/')
+        self.assertEqual(response.status_code, 405)
+        response = self.client.post('/api/kill_switch/')
+        self.assertEqual(response.status_code, 405)
+        response = self.client.get('/api/kill_switch/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_setting_read_per_request(self):
+        with override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(respect_disabled_endpoints=False)):
+            response = self.client.get('/api/kill_switch/archived/')
+            self.assertEqual(response.status_code, 200)
+            response = self.client.post('/api/kill_switch/')
+            self.assertEqual(response.status_code, 201)
+        response = self.client.get('/api/kill_switch/archived/')
+        self.assertEqual(response.status_code, 405)
+
+    def test_exception_handler_gets_the_exception(self):
+        seen = []
+
+        def exception_handler(request, endpoint_name, exception):
+            seen.append((endpoint_name, type(exception)))
+            return SmallJsonResponse({'disabled': endpoint_name}, status=405)
+
+        with override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(exception_handler=exception_handler)):
+            response = self.client.get('/api/kill_switch/archived/')
+        self.assertEqual(response.json(), {'disabled': 'archived'})
+        self.assertEqual(seen, [('archived', EndpointDisabledException)])
+
+    def test_options_still_answered(self):
+        response = self.client.options('/api/kill_switch/archived/')
+        self.assertEqual(response.status_code, 200)
+
+
+class TestKillSwitch(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+    def test_disable_and_enable(self):
+        kill_switch = KillSwitch(ttl=60)
+        with override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(kill_switch=kill_switch)):
+            self.assertEqual(self.client.get('/api/kill_switch/report/').status_code, 200)
+            kill_switch.disable(KillSwitchViewSet.report)
+            self.assertEqual(kill_switch.disabled(), [REPORT])
+            self.assertEqual(self.client.get('/api/kill_switch/report/').status_code, 405)
+            self.assertEqual(self.client.get('/api/kill_switch/').status_code, 200)
+            kill_switch.enable(REPORT)
+            self.assertEqual(self.client.get('/api/kill_switch/report/').status_code, 200)
+
+    async def test_async_endpoint(self):
+        client = AsyncClient()
+        kill_switch = KillSwitch(backend=None)
+        kill_switch.disable('tests.kill_switch_view_set.KillSwitchViewSet.areport')
+        with override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(kill_switch=kill_switch)):
+            response = await client.get('/api/kill_switch/areport/')
+        self.assertEqual(response.status_code, 405)
+
+    async def test_async_endpoints_poll_without_blocking(self):
+        client = AsyncClient()
+        kill_switch = KillSwitch(ttl=60)
+        backend = type(caches['default'])
+        areport = 'tests.kill_switch_view_set.KillSwitchViewSet.areport'
+        with mock.patch.object(backend, 'get', side_effect=AssertionError('blocking get')), \
+                mock.patch.object(backend, 'aget', return_value=[areport]) as aget, \
+                override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(kill_switch=kill_switch)):
+            for _ in range(3):
+                response = await client.get('/api/kill_switch/areport/')
+                self.assertEqual(response.status_code, 405)
+        self.assertEqual(aget.call_count, 1)
+
+    def test_disabled_helper_method(self):
+        kill_switch = KillSwitch(backend=None)
+        kill_switch.disable('tests.kill_switch_view_set.KillSwitchViewSet.create')
+        config = SmallViewSetConfig(respect_disabled_endpoints=False, kill_switch=kill_switch)
+        with override_settings(SMALL_VIEW_SET_CONFIG=config):
+            self.assertEqual(self.client.post('/api/kill_switch/').status_code, 405)
+            kill_switch.enable('tests.kill_switch_view_set.KillSwitchViewSet.create')
+            self.assertEqual(self.client.post('/api/kill_switch/').status_code, 201)
+
+    def test_other_processes_see_toggles_after_ttl(self):
+        kill_switch = KillSwitch(ttl=60)
+        other = KillSwitch(ttl=60)
+        self.assertFalse(other.is_disabled(REPORT))
+        kill_switch.disable(REPORT)
+        # Still within the other process's local TTL.
+        self.assertFalse(other.is_disabled(REPORT))
+        with mock.patch('small_view_set.kill_switch.time.monotonic', return_value=other._expires):
+            self.assertTrue(other.is_disabled(REPORT))
+
+    def test_polls_once_per_ttl(self):
+        kill_switch = KillSwitch(ttl=60)
+        with mock.patch.object(type(caches['default']), 'get', return_value=None) as get:
+            for _ in range(10):
+                kill_switch.is_disabled(REPORT)
+        self.assertEqual(get.call_count, 1)
+
+    def test_cache_errors_keep_the_last_known_flags(self):
+        kill_switch = KillSwitch(ttl=0)
+        kill_switch.disable(REPORT)
+        with mock.patch.object(type(caches['default']), 'get', side_effect=ConnectionError):
+            with self.assertLogs('django-small-view-set.kill_switch', 'ERROR'):
+                self.assertTrue(kill_switch.is_disabled(REPORT))
@@ -0,0 +1,42 @@
+import sys
+
+from django.core.checks import run_checks
+from django.test import SimpleTestCase, Client, AsyncClient, override_settings
+from django.urls import reverse
+
+from small_view_set import lazy
+from small_view_set.lazy import LazyView
+from test_project import lazy_urls
+
+VIEWSET_MODULE = 'tests.lazy_view_set'
+
+
+@override_settings(ROOT_URLCONF='test_project.lazy_urls')
+class TestLazyPath(SimpleTestCase):
+
+    def setUp(self):
+        sys.modules.pop(VIEWSET_MODULE, None)
+        lazy._viewsets.pop(f'{VIEWSET_MODULE}.LazyViewSet', None)
+        for pattern in lazy_urls.urlpatterns:
+            pattern.callback._view = None
+
+    def test_reverse_and_checks_do_not_import(self):
+        self.assertEqual(reverse('lazy_detail', kwargs={'pk': 3}), '/api/lazy/3/')
+        self.assertEqual(run_checks(tags=['urls']), [])
+        self.assertNotIn(VIEWSET_MODULE, sys.modules)
+
+    def test_loaded_on_first_request(self):
+        client = Client()
+        first = client.get('/api/lazy/').json()
+        self.assertIn(VIEWSET_MODULE, sys.modules)
+        self.assertFalse(lazy_urls.urlpatterns[1].callback.loaded)
+        self.assertEqual(client.get('/api/lazy/').json(), first)
+        self.assertEqual(client.get('/api/lazy/3/').json(), {'id': 3, 'instance': first['instance']})
+
+    async def test_async_endpoint(self):
+        response = await AsyncClient().get('/api/lazy/5/')
+        self.assertEqual(response.json()['id'], 5)
+
+    def test_invalid_import_path(self):
+        with self.assertRaises(ValueError):
+            LazyView('LazyViewSet')
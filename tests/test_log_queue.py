@@ -0,0 +1,72 @@
+import logging
+import queue
+import threading
+
+from django.test import SimpleTestCase
+
+from small_view_set import enable_queue_logging
+from small_view_set.log_queue import BoundedQueueHandler, DROP_OLDEST
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread().name)
+
+
+class TestQueueLogging(SimpleTestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger('small_view_set.tests.log_queue')
+        self.logger.propagate = False
+        self.recorder = RecordingHandler()
+        self.logger.addHandler(self.recorder)
+        self.addCleanup(self.logger.removeHandler, self.recorder)
+
+    def test_records_are_emitted_off_the_calling_thread(self):
+        # Compared to what was there before, since test runners may attach their own handlers.
+        handlers = list(self.logger.handlers)
+        queue_logging = enable_queue_logging(logger=self.logger)
+        self.assertIs(enable_queue_logging(logger=self.logger), queue_logging)
+        self.logger.error("Unhandled exception in %s: %s", 'detail', 'boom')
+        queue_logging.stop()
+        self.assertEqual(self.recorder.messages, ['Unhandled exception in detail: boom'])
+        self.assertNotIn(threading.current_thread().name, self.recorder.threads)
+        self.assertCountEqual(self.logger.handlers, handlers)
+
+    def test_ancestor_handlers_are_moved_off_the_calling_thread(self):
+        logger = logging.getLogger('small_view_set.tests.log_queue_propagating')
+        root = logging.getLogger()
+        root_recorder = RecordingHandler()
+        root.addHandler(root_recorder)
+        self.addCleanup(root.removeHandler, root_recorder)
+
+        handlers = list(logger.handlers)
+        queue_logging = enable_queue_logging(logger=logger)
+        self.assertFalse(logger.propagate)
+        logger.error("Unhandled exception in %s: %s", 'detail', 'boom')
+        queue_logging.stop()
+        self.assertEqual(root_recorder.messages, ['Unhandled exception in detail: boom'])
+        self.assertNotIn(threading.current_thread().name, root_recorder.threads)
+        self.assertTrue(logger.propagate)
+        self.assertCountEqual(logger.handlers, handlers)
+        self.assertIn(root_recorder, root.handlers)
+
+    def test_drop_newest_when_full(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1))
+        for message in ['first', 'second', 'third']:
+            handler.handle(logging.makeLogRecord({'msg': message}))
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual(handler.queue.get_nowait().msg, 'first')
+
+    def test_drop_oldest_when_full(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), drop_policy=DROP_OLDEST)
+        for message in ['first', 'second', 'third']:
+            handler.handle(logging.makeLogRecord({'msg': message}))
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual(handler.queue.get_nowait().msg, 'third')
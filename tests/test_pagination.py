@@ -0,0 +1,113 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection
+from django.test import TestCase, Client, AsyncClient, RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from small_view_set import KeysetPaginator
+from test_project.models import Item
+
+
+class PaginationTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        Item.objects.bulk_create([
+            Item(name=f'item {i}', score=i % 3, created=start + timedelta(microseconds=i))
+            for i in range(10)
+        ])
+        cls.expected = [
+            item.id for item in Item.objects.order_by('-score', 'created', 'pk')
+        ]
+
+
+class TestKeysetPaginator(PaginationTestCase):
+
+    def setUp(self):
+        self.client = Client()
+
+    def walk(self, path, **params):
+        ids, cursor, pages = [], None, 0
+        while True:
+            query = dict(params, **({'cursor': cursor} if cursor else {}))
+            response = self.client.get(path, query)
+            self.assertEqual(response.status_code, 200)
+            body = json.loads(b''.join(response.streaming_content) if response.streaming else response.content)
+            ids.extend(row['id'] for row in body['results'])
+            pages += 1
+            cursor = body['next']
+            if cursor is None:
+                return ids, pages
+
+    def test_walks_every_row_once_with_mixed_directions(self):
+        self.assertEqual(self.walk('/api/pagination/'), (self.expected, 3))
+
+    def test_values_rows(self):
+        self.assertEqual(self.walk('/api/pagination/values/'), (self.expected, 3))
+
+    def test_streamed_pages(self):
+        self.assertEqual(self.walk('/api/pagination/stream/', page_size=3), (self.expected, 4))
+
+    def test_streamed_page_ends_at_its_cursor(self):
+        # A row inserted between the keys query and the rows query must not push the
+        # page's last row past the cursor, where no page would return it.
+        paginator = KeysetPaginator(ordering=['-score', 'created'])
+        request_factory = RequestFactory()
+        ids, cursor = [], None
+        inserted = None
+        while True:
+            request = request_factory.get('/', {'page_size': 3, **({'cursor': cursor} if cursor else {})})
+            response = paginator.stream(request, Item.objects.all(), 'stream', serialize=lambda item: item.id)
+            if inserted is None:
+                inserted = Item.objects.create(name='late', score=2, created=datetime(2023, 1, 1, tzinfo=timezone.utc))
+            body = json.loads(b''.join(response.streaming_content))
+            ids.extend(body['results'])
+            cursor = body['next']
+            if cursor is None:
+                break
+        self.assertEqual(ids, [inserted.id] + self.expected)
+
+    def test_page_size_is_capped(self):
+        ids, pages = self.walk('/api/pagination/', page_size=1000)
+        self.assertEqual((ids, pages), (self.expected, 1))
+
+    def test_no_count_query(self):
+        response = self.client.get('/api/pagination/')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/pagination/', {'cursor': response.json()['next']})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT', queries[0]['sql'].upper())
+        self.assertNotIn('OFFSET', queries[0]['sql'].upper())
+
+    def test_invalid_cursor_and_page_size(self):
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions', level='ERROR'):
+            self.assertEqual(self.client.get('/api/pagination/', {'cursor': 'forged'}).status_code, 400)
+            self.assertEqual(self.client.get('/api/pagination/', {'page_size': 'x'}).status_code, 400)
+            self.assertEqual(self.client.get('/api/pagination/', {'page_size': 0}).status_code, 400)
+
+    def test_cursor_from_another_ordering_is_rejected(self):
+        cursor = KeysetPaginator(ordering=['score']).encode_cursor([1, 1])
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions', level='ERROR'):
+            self.assertEqual(self.client.get('/api/pagination/', {'cursor': cursor}).status_code, 400)
+
+    def test_pk_tiebreaker(self):
+        self.assertEqual(KeysetPaginator(ordering=['-created']).ordering, ('-created', '-pk'))
+        self.assertEqual(KeysetPaginator(ordering=['name', 'id']).ordering, ('name', 'id'))
+
+
+class TestAsyncKeysetPaginator(PaginationTestCase):
+
+    async def test_apaginate_and_astream(self):
+        client = AsyncClient()
+        response = await client.get('/api/pagination/async/')
+        first = json.loads(response.content)
+        response = await client.get('/api/pagination/async/', {'cursor': first['next']})
+        second = json.loads(response.content)
+        self.assertEqual([row['id'] for row in first['results'] + second['results']], self.expected[:8])
+
+        response = await client.get('/api/pagination/astream/', {'page_size': 4})
+        body = json.loads(b''.join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual([row['id'] for row in body['results']], self.expected[:4])
+        self.assertEqual(body['next'], first['next'])
@@ -0,0 +1,64 @@
+import json
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, RequestFactory, override_settings
+
+from small_view_set import BadRequest, SmallViewSet, SmallViewSetConfig, default_exception_handler
+from small_view_set.serialization import resolve_json_loads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class TestParseJsonBody(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.viewset = SmallViewSet()
+
+    def post(self, body, content_type='application/json'):
+        return self.factory.post('/', data=body, content_type=content_type)
+
+    def test_parsed_body_is_memoized_on_the_request(self):
+        request = self.post('{"name": "Bar"}')
+        data = self.viewset.parse_json_body(request)
+        self.assertEqual(data, {'name': 'Bar'})
+        self.assertIs(self.viewset.parse_json_body(request), data)
+
+    def test_invalid_content_type(self):
+        request = self.post('name=Bar', content_type='application/x-www-form-urlencoded')
+        with self.assertRaises(BadRequest):
+            self.viewset.parse_json_body(request)
+
+    @override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(max_json_body_size=16))
+    def test_oversized_body_is_rejected_before_decoding(self):
+        request = self.post(json.dumps({'name': 'x' * 32}))
+        with self.assertRaises(BadRequest):
+            self.viewset.parse_json_body(request)
+        request = self.post('{"name": "Bar"}')
+        self.assertEqual(self.viewset.parse_json_body(request), {'name': 'Bar'})
+
+    @skipUnless(orjson, 'orjson is not installed')
+    def test_orjson_decoder(self):
+        config = SmallViewSetConfig(json_decoder='orjson')
+        self.assertIs(config.json_loads, orjson.loads)
+        with override_settings(SMALL_VIEW_SET_CONFIG=config):
+            request = self.post('{"name": "Bar"}')
+            self.assertEqual(self.viewset.parse_json_body(request), {'name': 'Bar'})
+            request = self.post('{"name": ')
+            with self.assertRaises(json.JSONDecodeError) as context:
+                self.viewset.parse_json_body(request)
+            response = default_exception_handler(request, 'create', context.exception)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(json.loads(response.content), {'errors': 'Invalid JSON'})
+
+    def test_custom_decoder_callable(self):
+        def loads(body):
+            return {'raw': body}
+        self.assertIs(resolve_json_loads(loads), loads)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            resolve_json_loads('yaml')
@@ -0,0 +1,6 @@
+from small_view_set import lazy_path
+
+urlpatterns = [
+    lazy_path('api/lazy/',          'tests.lazy_view_set.LazyViewSet.default', name='lazy_collection'),
+    lazy_path('api/lazy/<int:pk>/', 'tests.lazy_view_set.LazyViewSet.detail',  name='lazy_detail'),
+]
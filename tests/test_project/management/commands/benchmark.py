@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tests.benchmark_suite import compare, run_suite
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[3] / 'benchmark_baseline.json'
+
+
+class Command(BaseCommand):
+    help = "Times the endpoint wrapper, exception handler and JSON helpers, and compares them to a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=2000, help="Timed calls per case.")
+        parser.add_argument('--repeat', type=int, default=3, help="Rounds per case; the best round is kept.")
+        parser.add_argument('--select', help="Only run cases whose name contains this text, e.g. 'exception/'.")
+        parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help="Baseline results file.")
+        parser.add_argument('--save', action='store_true', help="Write the results as the new baseline.")
+        parser.add_argument('--tolerance', type=float, default=0.5,
+                            help="Fraction a case's p50 may exceed the baseline by.")
+        parser.add_argument('--p99-tolerance', type=float, default=1.0,
+                            help="Fraction a case's p99 may exceed the baseline by.")
+
+    def handle(self, *args, number, repeat, select, baseline, save, tolerance, p99_tolerance, **options):
+        results = run_suite(number=number, repeat=repeat, select=select)
+        previous = json.loads(baseline.read_text()) if baseline.exists() and not save else None
+
+        self.stdout.write(f"{'case':<40} {'p50 us':>10} {'p99 us':>10} {'baseline p50':>14}")
+        for name, result in results['cases'].items():
+            reference = previous['cases'].get(name, {}).get('p50_us') if previous else None
+            reference = f'{reference:.2f}' if reference is not None else '-'
+            self.stdout.write(f"{name:<40} {result['p50_us']:>10.2f} {result['p99_us']:>10.2f} {reference:>14}")
+
+        if save:
+            baseline.write_text(json.dumps(results, indent=2) + '\n')
+            self.stdout.write(f"Saved baseline to {baseline}")
+            return
+        if previous is None:
+            return
+        if previous['environment'] != results['environment']:
+            self.stdout.write(self.style.WARNING(
+                f"Baseline was recorded on {previous['environment']}, comparing anyway"))
+        regressions = compare(results, previous, tolerance=tolerance, p99_tolerance=p99_tolerance)
+        if regressions:
+            raise CommandError(f"Slower than the baseline: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
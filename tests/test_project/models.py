@@ -0,0 +1,13 @@
+from django.db import models
+
+
+class Owner(models.Model):
+    name = models.CharField(max_length=100)
+    email = models.CharField(max_length=100)
+
+
+class Item(models.Model):
+    name = models.CharField(max_length=100)
+    score = models.IntegerField()
+    created = models.DateTimeField()
+    owner = models.ForeignKey(Owner, null=True, on_delete=models.CASCADE)
@@ -0,0 +1,10 @@
+from small_view_set import SmallViewSetRouter
+from test_project import urls
+
+# The same routes as test_project.urls, resolved through a SmallViewSetRouter.
+router = SmallViewSetRouter()
+router.extend(urls.urlpatterns)
+
+urlpatterns = [
+    *router.urls,
+]
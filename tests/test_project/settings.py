@@ -3,7 +3,12 @@ from small_view_set import SmallViewSetConfig
 
 SECRET_KEY = "test-secret-key"
 DEBUG = True
-INSTALLED_APPS = []
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "test_project",
+]
 ROOT_URLCONF = "test_project.urls"
 DATABASES = {
     "default": {
@@ -12,4 +17,6 @@ DATABASES = {
     }
 }
 
-SMALL_VIEW_SET_CONFIG = SmallViewSetConfig()
\ No newline at end of file
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+SMALL_VIEW_SET_CONFIG = SmallViewSetConfig()
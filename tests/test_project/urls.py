@@ -1,9 +1,33 @@
 from tests.custom_endpoints_view_set import CustomEndpointsViewSet
 from tests.basic_crud_view_set import BasicCrudViewSet
 from tests.custom_protections_view_set import CustomProtectionsViewSet
+from tests.streaming_view_set import StreamingViewSet
+from tests.protection_pipeline_view_set import PipelineViewSet
+from tests.conditional_view_set import ConditionalViewSet
+from tests.cached_view_set import CachedViewSet
+from tests.coalescing_view_set import CoalescingViewSet
+from tests.execution_view_set import ExecutionViewSet
+from tests.batch_view_set import BatchViewSet
+from tests.pagination_view_set import PaginationViewSet
+from tests.projection_view_set import ProjectionViewSet
+from tests.compression_view_set import CompressionViewSet
+from tests.kill_switch_view_set import KillSwitchViewSet
+from tests.deadline_view_set import DeadlineViewSet
 
 urlpatterns = [
     *CustomEndpointsViewSet().urlpatterns(),
     *CustomProtectionsViewSet().urlpatterns(),
     *BasicCrudViewSet().urlpatterns(),
+    *StreamingViewSet().urlpatterns(),
+    *PipelineViewSet().urlpatterns(),
+    *ConditionalViewSet().urlpatterns(),
+    *CachedViewSet().urlpatterns(),
+    *CoalescingViewSet().urlpatterns(),
+    *ExecutionViewSet().urlpatterns(),
+    *BatchViewSet().urlpatterns(),
+    *PaginationViewSet().urlpatterns(),
+    *ProjectionViewSet().urlpatterns(),
+    *CompressionViewSet().urlpatterns(),
+    *KillSwitchViewSet().urlpatterns(),
+    *DeadlineViewSet().urlpatterns(),
 ]
\ No newline at end of file
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+from django.db import connection
+from django.test import TestCase, Client, AsyncClient, RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from small_view_set import FieldSet
+from test_project.models import Item, Owner
+
+
+class TestFieldSet(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = Owner.objects.create(name='Ann', email='ann@example.com')
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        cls.first = Item.objects.create(name='first', score=1, created=created, owner=cls.owner)
+        cls.second = Item.objects.create(name='second', score=2, created=created)
+
+    def setUp(self):
+        self.client = Client()
+
+    def results(self, path, **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_default_fields(self):
+        self.assertEqual(self.results('/api/projection/'), [
+            {'id': self.first.id, 'name': 'first'},
+            {'id': self.second.id, 'name': 'second'},
+        ])
+
+    def test_selected_fields_are_the_only_columns_loaded(self):
+        with CaptureQueriesContext(connection) as queries:
+            results = self.results('/api/projection/', fields='score')
+        self.assertEqual(results, [{'score': 1}, {'score': 2}])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"name"', queries[0]['sql'])
+
+    def test_include_relation(self):
+        with CaptureQueriesContext(connection) as queries:
+            results = self.results('/api/projection/', fields='id,owner.name', include='owner')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(results, [
+            {'id': self.first.id, 'owner': {'name': 'Ann'}},
+            {'id': self.second.id, 'owner': None},
+        ])
+        self.assertEqual(
+            self.results('/api/projection/', include='owner')[0],
+            {'id': self.first.id, 'name': 'first', 'owner': {'id': self.owner.id}})
+
+    def test_values_rows(self):
+        self.assertEqual(self.results('/api/projection/values/', fields='name,owner.email')[0],
+                         {'name': 'first', 'owner': {'email': 'ann@example.com'}})
+
+    def test_unknown_names_are_rejected(self):
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions', level='ERROR'):
+            self.assertEqual(self.client.get('/api/projection/', {'fields': 'password'}).status_code, 400)
+            self.assertEqual(self.client.get('/api/projection/', {'fields': 'owner.password'}).status_code, 400)
+            self.assertEqual(self.client.get('/api/projection/', {'include': 'team'}).status_code, 400)
+
+    def test_parse_is_memoized_per_request(self):
+        fieldset = FieldSet(fields=['id', 'name'])
+        request = RequestFactory().get('/', {'fields': 'name'})
+        projection = fieldset.parse(request)
+        self.assertIs(fieldset.parse(request), projection)
+        self.assertEqual(projection.fields, ('name',))
+
+    def test_invalid_declarations(self):
+        with self.assertRaises(ValueError):
+            FieldSet(fields=['id'], default=['name'])
+        with self.assertRaises(ValueError):
+            FieldSet(fields=['id', 'owner'], relations={'owner': FieldSet(fields=['id'])})
+
+    async def test_async_endpoint(self):
+        response = await AsyncClient().get('/api/projection/async/', {'fields': 'name'})
+        self.assertEqual(response.json()['results'], [{'name': 'first'}, {'name': 'second'}])
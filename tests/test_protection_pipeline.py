@@ -0,0 +1,110 @@
+import time
+
+from django.contrib.auth.models import User
+from django.test import TestCase, AsyncClient, RequestFactory, override_settings
+from django.urls import reverse
+
+from small_view_set import Unauthorized
+from tests.protection_pipeline_view_set import PipelineAppViewSet, PipelineViewSet
+
+
+class TestProtectionPipeline(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_protections_are_merged_across_the_hierarchy(self):
+        self.assertEqual(PipelineViewSet._protections, {
+            'create': ('require_logged_in', 'require_email_verified', 'require_not_banned'),
+            'retrieve': ('require_logged_in', 'require_active_token', 'require_not_banned'),
+            'list': ('require_session_user',),
+        })
+
+    def test_each_check_runs_once_per_request(self):
+        viewset = PipelineAppViewSet()
+        request = self.factory.post('/', headers={'Authorization': 'Bearer verified'})
+        viewset.protect_create(request)
+        viewset.protect_create(request)
+        viewset.protect_retrieve(request)
+        self.assertEqual(request.check_calls, ['require_logged_in', 'require_email_verified'])
+
+    def test_failed_check_is_raised_again(self):
+        viewset = PipelineAppViewSet()
+        request = self.factory.post('/')
+        with self.assertRaises(Unauthorized):
+            viewset.protect_create(request)
+        with self.assertRaises(Unauthorized):
+            viewset.protect_retrieve(request)
+        self.assertEqual(request.check_calls, ['require_logged_in'])
+
+    def test_async_checks_are_refused_by_the_sync_pipeline(self):
+        viewset = PipelineViewSet()
+        request = self.factory.post('/', headers={'Authorization': 'Bearer banned'})
+        with self.assertRaises(TypeError):
+            viewset.protect_create(request)
+        # Refused again, not remembered as passed.
+        with self.assertRaises(TypeError):
+            viewset.check(request, 'require_not_banned')
+        self.assertNotIn('require_not_banned', request.check_calls)
+
+    async def test_sync_check_replays_an_async_outcome(self):
+        viewset = PipelineViewSet()
+        request = self.factory.post('/', headers={'Authorization': 'Bearer banned'})
+        with self.assertRaises(Unauthorized):
+            await viewset.acheck(request, 'require_not_banned')
+        with self.assertRaises(Unauthorized):
+            viewset.check(request, 'require_not_banned')
+
+    def test_undeclared_action_is_unprotected(self):
+        viewset = PipelineAppViewSet()
+        request = self.factory.delete('/')
+        viewset.protect_delete(request)
+        self.assertFalse(hasattr(request, 'check_calls'))
+
+    async def test_async_checks_run_concurrently(self):
+        start = time.perf_counter()
+        response = await AsyncClient().get(
+            reverse('pipeline_detail', args=[1]),
+            headers={'Authorization': 'Bearer verified'})
+        elapsed = time.perf_counter() - start
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(elapsed, 0.095)
+
+    async def test_async_pipeline_memoizes_and_rejects(self):
+        client = AsyncClient()
+        response = await client.post(
+            reverse('pipeline_collection'),
+            headers={'Authorization': 'Bearer banned'},
+            content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+        response = await client.post(
+            reverse('pipeline_collection'),
+            headers={'Authorization': 'Bearer verified'},
+            content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['calls'], [
+            'require_logged_in',
+            'require_email_verified',
+            'require_not_banned',
+        ])
+
+
+@override_settings(MIDDLEWARE=[
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+])
+class TestAsyncProtectionsWithSessions(TestCase):
+
+    def setUp(self):
+        self.client = AsyncClient()
+        self.user = User.objects.create_user('bar', password='secret')
+
+    async def test_sync_check_reading_the_user(self):
+        response = await self.client.get(reverse('pipeline_session'))
+        self.assertEqual(response.status_code, 401)
+
+        await self.client.aforce_login(self.user)
+        response = await self.client.get(reverse('pipeline_session'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'username': 'bar'})
@@ -0,0 +1,66 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase, Client, override_settings
+from django.urls import path, re_path, resolve, reverse, Resolver404
+from django.urls.resolvers import URLResolver, RegexPattern
+
+from small_view_set import SmallViewSetRouter
+from small_view_set.router import CompiledURLResolver, RouteIndex
+from test_project import urls as stock_urls
+from tests.basic_crud_view_set import BasicCrudViewSet
+
+
+def view(request, **kwargs):
+    return HttpResponse()
+
+
+class TestSmallViewSetRouter(SimpleTestCase):
+
+    def test_matches_stock_resolution_and_reverse(self):
+        named = [pattern for pattern in stock_urls.urlpatterns if pattern.name]
+        self.assertGreater(len(named), 20)
+        for pattern in named:
+            kwargs = {name: 1 for name in pattern.pattern.converters}
+            with self.subTest(pattern.name):
+                stock_url = reverse(pattern.name, kwargs=kwargs)
+                with override_settings(ROOT_URLCONF='test_project.router_urls'):
+                    self.assertEqual(reverse(pattern.name, kwargs=kwargs), stock_url)
+                    match = resolve(stock_url)
+                stock_match = resolve(stock_url)
+                self.assertEqual(match.url_name, stock_match.url_name)
+                self.assertEqual(match.kwargs, stock_match.kwargs)
+                self.assertEqual(match.route, stock_match.route)
+
+    @override_settings(ROOT_URLCONF='test_project.router_urls')
+    def test_requests_are_served(self):
+        client = Client()
+        self.assertEqual(client.get('/api/basic_crud/3/').json(), {'value': 3})
+        self.assertEqual(client.get('/api/basic_crud/').json(), {'value': 1})
+        self.assertEqual(client.get('/api/basic_crud/x/').status_code, 404)
+
+    def test_first_declared_match_wins(self):
+        resolver = CompiledURLResolver([
+            path('bars/<str:slug>/', view, name='slug'),
+            path('bars/items/', view, name='items'),
+            re_path(r'^bars/(?P<pk>[0-9]+)/raw/$', view, name='raw'),
+            path('bars/<int:pk>/raw/', view, name='int_raw'),
+        ])
+        self.assertEqual(resolver.resolve('bars/items/').url_name, 'slug')
+        self.assertEqual(resolver.resolve('bars/3/raw/').url_name, 'raw')
+        with self.assertRaises(Resolver404):
+            resolver.resolve('foos/items/')
+
+    def test_index_narrows_candidates(self):
+        patterns = [path(f'api/r{i}/<int:pk>/', view) for i in range(100)]
+        patterns += [path(f'api/r{i}/', view) for i in range(100)]
+        index = RouteIndex(patterns)
+        self.assertEqual(index.candidates('api/r42/7/'), [patterns[42]])
+        self.assertEqual(index.candidates('api/r42/'), [patterns[42], patterns[142]])
+        self.assertEqual(index.candidates('nope/'), [])
+
+    def test_register(self):
+        router = SmallViewSetRouter()
+        self.assertIsInstance(router.register(BasicCrudViewSet), BasicCrudViewSet)
+        self.assertEqual(len(router.patterns), 2)
+        self.assertIsInstance(router.urls[0], URLResolver)
+        with self.assertRaises(RuntimeError):
+            router.register(BasicCrudViewSet())
@@ -0,0 +1,73 @@
+import json
+
+from django.test import TestCase, Client, AsyncClient, override_settings
+from django.urls import reverse
+
+from small_view_set import SmallViewSetConfig, default_exception_handler
+
+
+handled = []
+
+
+def recording_exception_handler(request, endpoint_name, exception):
+    handled.append((endpoint_name, type(exception)))
+    return default_exception_handler(request, endpoint_name, exception)
+
+
+class TestStreamingJsonArrayResponse(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        handled.clear()
+
+    async def read_async(self, response):
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    def test_sync_source_under_wsgi(self):
+        response = self.client.get(reverse('streaming_sync'), {'count': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        chunks = list(response.streaming_content)
+        self.assertEqual(json.loads(b''.join(chunks)), [{'id': i} for i in range(5)])
+        # Opening bracket, three chunks of up to two rows, closing bracket.
+        self.assertEqual(len(chunks), 5)
+
+    def test_envelope(self):
+        response = self.client.get(reverse('streaming_sync'), {'count': 3, 'envelope': 'results'})
+        self.assertEqual(
+            json.loads(b''.join(response.streaming_content)),
+            {'count': 3, 'results': [{'id': 0}, {'id': 1}, {'id': 2}]})
+
+    def test_empty(self):
+        response = self.client.get(reverse('streaming_sync'), {'count': 0})
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), [])
+
+    def test_async_source_under_wsgi(self):
+        response = self.client.get(reverse('streaming_async'), {'count': 5})
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), [{'id': i} for i in range(5)])
+
+    async def test_async_source_under_asgi(self):
+        response = await AsyncClient().get(reverse('streaming_async'), {'count': 5})
+        self.assertTrue(response.is_async)
+        self.assertEqual(json.loads(await self.read_async(response)), [{'id': i} for i in range(5)])
+
+    async def test_sync_source_under_asgi(self):
+        response = await AsyncClient().get(reverse('streaming_sync'), {'count': 5})
+        self.assertTrue(response.is_async)
+        self.assertEqual(json.loads(await self.read_async(response)), [{'id': i} for i in range(5)])
+
+    @override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(exception_handler=recording_exception_handler))
+    def test_mid_stream_error_is_routed_to_exception_handler(self):
+        response = self.client.get(reverse('streaming_sync'), {'count': 5, 'fail_at': 3})
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions'):
+            body = b''.join(response.streaming_content)
+        self.assertEqual(body, b'[{"id": 0},{"id": 1}')
+        self.assertEqual(handled, [('sync_list', RuntimeError)])
+
+    @override_settings(SMALL_VIEW_SET_CONFIG=SmallViewSetConfig(exception_handler=recording_exception_handler))
+    async def test_mid_stream_error_under_asgi(self):
+        response = await AsyncClient().get(reverse('streaming_async'), {'count': 5, 'fail_at': 1})
+        with self.assertLogs('django-small-view-set.default_handle_endpoint_exceptions'):
+            body = await self.read_async(response)
+        self.assertEqual(body, b'[')
+        self.assertEqual(handled, [('async_list', RuntimeError)])
@@ -0,0 +1,178 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
+from django.http import JsonResponse
+from django.test import SimpleTestCase, RequestFactory
+from django.utils.asyncio import async_unsafe
+from django.utils.functional import SimpleLazyObject
+
+from small_view_set import (
+    CacheThrottleBackend,
+    LocalThrottleBackend,
+    SmallViewSet,
+    Throttle,
+    Throttled,
+    endpoint,
+)
+from small_view_set.throttling import parse_rate
+
+
+class ThrottledViewSet(SmallViewSet):
+    create_throttle = Throttle('2/min', key='ip', backend=LocalThrottleBackend())
+    protections = {
+        'create': ['create_throttle'],
+    }
+
+    @endpoint(allowed_methods=['POST'])
+    def collection(self, request):
+        self.protect_create(request)
+        # Protecting twice in one request must not use a second token.
+        self.protect_create(request)
+        return JsonResponse({}, status=201)
+
+
+class UserThrottledViewSet(SmallViewSet):
+    create_throttle = Throttle('1/min', key='user', backend=LocalThrottleBackend())
+    protections = {
+        'create': ['create_throttle'],
+    }
+
+
+class RecordingCacheThrottleBackend(CacheThrottleBackend):
+    calls = []
+
+    @property
+    def cache(self):
+        backend = self
+
+        class RecordingCache:
+            def __getattr__(self, name):
+                backend.calls.append(name)
+                return getattr(caches[backend.alias], name)
+
+        return RecordingCache()
+
+
+class TestThrottling(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        cache.clear()
+
+    def request(self, ip='10.0.0.1'):
+        return self.factory.post('/', REMOTE_ADDR=ip)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('100/min'), (100, 60.0))
+        self.assertEqual(parse_rate('10/s'), (10, 1.0))
+        with self.assertRaises(ValueError):
+            parse_rate('10 per minute')
+
+    def test_endpoint_returns_429_with_retry_after(self):
+        viewset = ThrottledViewSet()
+        self.assertEqual(viewset.collection(self.request()).status_code, 201)
+        self.assertEqual(viewset.collection(self.request()).status_code, 201)
+        response = viewset.collection(self.request())
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(json.loads(response.content), {'errors': 'Too many requests'})
+        self.assertEqual(response['Retry-After'], '30')
+        # Other clients have their own bucket.
+        self.assertEqual(viewset.collection(self.request(ip='10.0.0.2')).status_code, 201)
+
+    def test_token_bucket_refills(self):
+        throttle = Throttle('2/s', key='ip', backend=LocalThrottleBackend(), scope='test')
+        with mock.patch('small_view_set.throttling.time.monotonic', return_value=100.0):
+            throttle(self.request())
+            throttle(self.request())
+            with self.assertRaises(Throttled) as context:
+                throttle(self.request())
+            self.assertAlmostEqual(context.exception.retry_after, 0.5)
+        with mock.patch('small_view_set.throttling.time.monotonic', return_value=100.5):
+            throttle(self.request())
+
+    def test_sliding_window(self):
+        throttle = Throttle('2/min', key='ip', algorithm='sliding_window', backend=LocalThrottleBackend(), scope='test')
+        with mock.patch('small_view_set.throttling.time.monotonic', return_value=600.0):
+            throttle(self.request())
+            throttle(self.request())
+            with self.assertRaises(Throttled):
+                throttle(self.request())
+        # Halfway through the next window the previous window still counts for half.
+        with mock.patch('small_view_set.throttling.time.monotonic', return_value=690.0):
+            throttle(self.request())
+            with self.assertRaises(Throttled) as context:
+                throttle(self.request())
+            self.assertAlmostEqual(context.exception.retry_after, 30.0)
+
+    def test_local_backend_evicts_least_recently_used_keys(self):
+        backend = LocalThrottleBackend(max_keys=2)
+        throttle = Throttle('1/min', key='ip', backend=backend, scope='test')
+        throttle(self.request(ip='a'))
+        throttle(self.request(ip='b'))
+        throttle(self.request(ip='c'))
+        self.assertEqual(list(backend._state), ['test:b', 'test:c'])
+        # 'a' was evicted, so it starts with a fresh bucket.
+        throttle(self.request(ip='a'))
+
+    def test_cache_backend(self):
+        backend = CacheThrottleBackend(key_prefix='test-throttle')
+        first_node = Throttle('2/min', key='ip', algorithm='sliding_window', backend=backend, scope='test')
+        second_node = Throttle(
+            '2/min', key='ip', algorithm='sliding_window',
+            backend=CacheThrottleBackend(key_prefix='test-throttle'), scope='test')
+        with mock.patch('small_view_set.throttling.time.time', return_value=6000.0):
+            first_node(self.request())
+            second_node(self.request())
+            with self.assertRaises(Throttled):
+                first_node(self.request())
+
+    def test_backends_count_rejected_requests_alike(self):
+        for backend in (LocalThrottleBackend(), CacheThrottleBackend(key_prefix='test-throttle')):
+            with self.subTest(backend=type(backend).__name__):
+                cache.clear()
+                throttle = Throttle('2/min', key='ip', algorithm='sliding_window', backend=backend, scope='test')
+                with mock.patch('small_view_set.throttling.time.monotonic', return_value=600.0), \
+                        mock.patch('small_view_set.throttling.time.time', return_value=600.0):
+                    throttle(self.request())
+                    throttle(self.request())
+                    for _ in range(3):
+                        with self.assertRaises(Throttled):
+                            throttle(self.request())
+                # Only the two admitted requests weigh on the next window.
+                with mock.patch('small_view_set.throttling.time.monotonic', return_value=690.0), \
+                        mock.patch('small_view_set.throttling.time.time', return_value=690.0):
+                    throttle(self.request())
+                    with self.assertRaises(Throttled) as context:
+                        throttle(self.request())
+                    self.assertAlmostEqual(context.exception.retry_after, 30.0)
+
+    def test_cache_backend_rejects_token_bucket(self):
+        with self.assertRaises(ValueError):
+            Throttle('2/min', backend=CacheThrottleBackend())
+
+    def test_cache_backend_round_trips(self):
+        backend = RecordingCacheThrottleBackend(key_prefix='test-throttle')
+        throttle = Throttle('10/min', key='ip', algorithm='sliding_window', backend=backend, scope='test')
+        with mock.patch('small_view_set.throttling.time.time', return_value=6000.0):
+            throttle(self.request())
+            backend.calls.clear()
+            throttle(self.request())
+            throttle(self.request())
+        self.assertEqual(backend.calls, ['incr', 'incr'])
+
+    async def test_user_key_from_async_protect(self):
+        # Like AuthenticationMiddleware's lazy user, which queries the database.
+        @async_unsafe
+        def load_user():
+            return AnonymousUser()
+
+        viewset = UserThrottledViewSet()
+        request = self.request()
+        request.user = SimpleLazyObject(load_user)
+        await viewset.aprotect_create(request)
+        request = self.request()
+        request.user = SimpleLazyObject(load_user)
+        with self.assertRaises(Throttled):
+            await viewset.aprotect_create(request)